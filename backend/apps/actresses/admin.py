@@ -4,6 +4,8 @@
 
 from django.contrib import admin
 from django.utils.html import format_html
+
+from apps.core.relation_counters import get_relation_counter
 from .models import Actress, ActressTag
 
 
@@ -147,20 +149,21 @@ class ActressAdmin(admin.ModelAdmin):
     actions = ['update_movie_counts']
     
     def update_movie_counts(self, request, queryset):
-        """批量更新作品数量"""
-        for actress in queryset:
-            actress.update_movie_count()
-        self.message_user(request, f'已更新 {queryset.count()} 位女友的作品数量')
+        """批量更新作品数量（一次分组查询）"""
+        counter = get_relation_counter('actresses.Actress.movie_count')
+        fixed = counter.reconcile(list(queryset.values_list('pk', flat=True)))
+        self.message_user(request, f'已更新 {fixed} 位女友的作品数量')
     update_movie_counts.short_description = '更新作品数量'
 
 
 @admin.register(ActressTag)
 class ActressTagAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'get_color_display', 'get_actress_count', 'created_at']
+    list_display = ['name', 'slug', 'get_color_display', 'actress_count', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'slug', 'description']
     prepopulated_fields = {'slug': ('name',)}
     filter_horizontal = ['actresses']
+    readonly_fields = ['actress_count']
     
     def get_color_display(self, obj):
         """显示颜色"""
@@ -169,8 +172,3 @@ class ActressTagAdmin(admin.ModelAdmin):
             obj.color, obj.color
         )
     get_color_display.short_description = '颜色'
-    
-    def get_actress_count(self, obj):
-        """显示关联女友数量"""
-        return obj.actresses.count()
-    get_actress_count.short_description = '关联女友数'
@@ -5,3 +5,6 @@ class ActressesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.actresses'
     verbose_name = '女友/演员管理'
+
+    def ready(self):
+        from . import signals  # noqa: F401
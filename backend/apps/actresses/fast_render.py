@@ -0,0 +1,33 @@
+"""
+Row builders for the fast actress list path.
+
+输出与 ActressSerializer 完全一致。
+"""
+
+from apps.core.fast_render import RowBuilder, split_lines
+
+from .serializers import ActressSerializer
+
+
+class ActressRowBuilder(RowBuilder):
+    """演员列表"""
+
+    serializer_class = ActressSerializer
+    computed_columns = {
+        'lifestyle_photos_list': ['lifestyle_photos'],
+        'portrait_photos_list': ['portrait_photos'],
+        'lifestyle_photos_local_list': ['lifestyle_photos_local'],
+        'portrait_photos_local_list': ['portrait_photos_local'],
+    }
+
+    def build_lifestyle_photos_list(self, row):
+        return split_lines(row['lifestyle_photos'])
+
+    def build_portrait_photos_list(self, row):
+        return split_lines(row['portrait_photos'])
+
+    def build_lifestyle_photos_local_list(self, row):
+        return split_lines(row['lifestyle_photos_local'])
+
+    def build_portrait_photos_local_list(self, row):
+        return split_lines(row['portrait_photos_local'])
@@ -0,0 +1,105 @@
+"""
+Actress filters for API.
+"""
+
+from datetime import date
+
+import django_filters
+
+from .models import Actress, CupSize, normalize_cup_size
+from .stats import HEIGHT_RANGES, PHOTO_FILTERS
+
+
+def years_before(day, years):
+    """day 之前 years 年的同一天（2 月 29 日对应平年的 2 月 28 日）"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+class ActressFilter(django_filters.FilterSet):
+    """
+    女友筛选：所有条件都转换为索引列上的等值或范围条件。
+
+    年龄换算为出生日期范围，出道年份换算为出道日期范围。
+    """
+
+    # 罩杯（按规范化的 cup 列等值匹配，无法识别的输入退回文本包含匹配）
+    cup_size = django_filters.CharFilter(method='filter_cup_size')
+    cup = django_filters.MultipleChoiceFilter(choices=CupSize.choices[1:])
+
+    # 身高
+    heightRange = django_filters.ChoiceFilter(
+        choices=[(name, name) for name in HEIGHT_RANGES], method='filter_height_range'
+    )
+    height_min = django_filters.NumberFilter(field_name='height', lookup_expr='gte')
+    height_max = django_filters.NumberFilter(field_name='height', lookup_expr='lte')
+
+    # 年龄（周岁）
+    age_min = django_filters.NumberFilter(method='filter_age_min', min_value=0, max_value=150)
+    age_max = django_filters.NumberFilter(method='filter_age_max', min_value=0, max_value=150)
+
+    # 出道年份
+    debut_year_from = django_filters.NumberFilter(
+        method='filter_debut_year_from', min_value=1900, max_value=9999
+    )
+    debut_year_to = django_filters.NumberFilter(
+        method='filter_debut_year_to', min_value=1900, max_value=9999
+    )
+
+    # 照片
+    hasPhotos = django_filters.ChoiceFilter(
+        choices=[(name, name) for name in PHOTO_FILTERS], method='filter_has_photos'
+    )
+
+    is_active = django_filters.BooleanFilter()
+
+    class Meta:
+        model = Actress
+        fields = [
+            'cup_size', 'cup', 'height', 'heightRange', 'height_min', 'height_max',
+            'age_min', 'age_max', 'debut_year_from', 'debut_year_to',
+            'hasPhotos', 'is_active',
+        ]
+
+    def filter_cup_size(self, queryset, name, value):
+        """罩杯过滤"""
+        if not value:
+            return queryset
+        cup = normalize_cup_size(value)
+        if cup:
+            return queryset.filter(cup=cup)
+        return queryset.filter(cup_size__icontains=value.strip())
+
+    def filter_height_range(self, queryset, name, value):
+        """身高区间（与统计的身高分组一致）"""
+        return queryset.filter(HEIGHT_RANGES[value]) if value else queryset
+
+    def filter_age_min(self, queryset, name, value):
+        """年龄不小于 value：出生日期不晚于 value 年前的今天"""
+        if value is None:
+            return queryset
+        return queryset.filter(birth_date__lte=years_before(date.today(), int(value)))
+
+    def filter_age_max(self, queryset, name, value):
+        """年龄不大于 value：出生日期晚于 value + 1 年前的今天"""
+        if value is None:
+            return queryset
+        return queryset.filter(birth_date__gt=years_before(date.today(), int(value) + 1))
+
+    def filter_debut_year_from(self, queryset, name, value):
+        """出道年份起"""
+        if value is None:
+            return queryset
+        return queryset.filter(debut_date__gte=date(int(value), 1, 1))
+
+    def filter_debut_year_to(self, queryset, name, value):
+        """出道年份止"""
+        if value is None:
+            return queryset
+        return queryset.filter(debut_date__lte=date(int(value), 12, 31))
+
+    def filter_has_photos(self, queryset, name, value):
+        """照片类型（读取保存时计算的照片标记）"""
+        return queryset.filter(PHOTO_FILTERS[value]) if value else queryset
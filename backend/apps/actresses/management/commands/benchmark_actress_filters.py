@@ -0,0 +1,134 @@
+"""
+Django management command to benchmark actress list filtering.
+
+按前端女友列表发送的筛选组合（罩杯、身高区间、照片类型、排序）执行与列表接口相同的
+COUNT + 首页查询，并与改造前的文本匹配条件对比耗时。
+合成数据在事务中写入，结束后回滚，不会留在数据库中。
+"""
+
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.http import QueryDict
+
+from apps.actresses.filters import ActressFilter
+from apps.actresses.models import Actress, CupSize
+
+# 前端筛选栏可能发送的组合（page_size=50，默认按姓名排序）
+UI_CASES = [
+    ('default', ''),
+    ('cup', 'cup_size=E'),
+    ('height', 'heightRange=medium'),
+    ('photos', 'hasPhotos=both'),
+    ('cup + height', 'cup_size=E&heightRange=medium'),
+    ('cup + height + photos', 'cup_size=E&heightRange=medium&hasPhotos=lifestyle'),
+    ('order by -movie_count', 'ordering=-movie_count'),
+    ('order by -debut_date', 'ordering=-debut_date'),
+    ('age 20-25', 'age_min=20&age_max=25'),
+    ('debut 2018-2020', 'debut_year_from=2018&debut_year_to=2020'),
+]
+
+# 改造前的等价条件
+LEGACY_CASES = [
+    ('legacy cup', Q(cup_size__icontains='E')),
+    ('legacy photos', (
+        ~(Q(lifestyle_photos__isnull=True) | Q(lifestyle_photos='')) &
+        ~(Q(portrait_photos__isnull=True) | Q(portrait_photos=''))
+    )),
+]
+
+
+class RollbackBenchmark(Exception):
+    """用于回滚合成数据"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the actress list filters sent by the frontend'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[50000],
+            help='Table sizes to benchmark'
+        )
+        parser.add_argument('--page-size', type=int, default=50, help='Items per page')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per case')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Insert batch size')
+        parser.add_argument('--explain', action='store_true', help='Print query plans')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                for rows in sorted(options['rows']):
+                    self.fill_to(rows, options['batch_size'])
+                    self.run(rows, options)
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            self.stdout.write('Synthetic rows rolled back')
+
+    def fill_to(self, rows, batch_size):
+        """补充合成女友直到表中有 rows 行（bulk_create 不调用 save，冗余字段直接赋值）"""
+        rng = random.Random(rows)
+        cups = [cup for cup in CupSize.values if cup]
+        existing = Actress.objects.count()
+        next_id = existing
+        while existing < rows:
+            size = min(batch_size, rows - existing)
+            actresses = []
+            for i in range(size):
+                cup = rng.choice(cups + [''])
+                lifestyle = 'https://example.com/l.jpg' if rng.random() < 0.2 else ''
+                portrait = 'https://example.com/p.jpg' if rng.random() < 0.2 else ''
+                actresses.append(Actress(
+                    name=f'Bench actress {next_id + i}',
+                    cup_size=f'{cup}罩杯' if cup else '',
+                    cup=cup,
+                    height=rng.choice([None, *range(145, 181)]),
+                    birth_date=date(1980, 1, 1) + timedelta(days=rng.randrange(9000)),
+                    debut_date=date(2000, 1, 1) + timedelta(days=rng.randrange(9000)),
+                    movie_count=rng.randrange(300),
+                    lifestyle_photos=lifestyle,
+                    portrait_photos=portrait,
+                    has_lifestyle_photos=bool(lifestyle),
+                    has_portrait_photos=bool(portrait),
+                ))
+            Actress.objects.bulk_create(actresses)
+            existing += size
+            next_id += size
+
+    def build_queryset(self, query):
+        params = QueryDict(query)
+        queryset = ActressFilter(params, queryset=Actress.objects.all()).qs
+        ordering = params.get('ordering', 'name')
+        return queryset.order_by(ordering)
+
+    def run(self, rows, options):
+        page_size = options['page_size']
+        cases = [(name, self.build_queryset(query)) for name, query in UI_CASES]
+        cases += [
+            (name, Actress.objects.filter(condition).order_by('name'))
+            for name, condition in LEGACY_CASES
+        ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{rows} rows, {page_size} per page'))
+        for name, queryset in cases:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                # 与列表分页相同：一次 COUNT + 一次取首页
+                queryset.count()
+                list(queryset.values_list('id', flat=True)[:page_size])
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f'  {name:<24} median {statistics.median(timings):8.2f} ms  '
+                f'max {max(timings):8.2f} ms'
+            )
+            if options['explain']:
+                self.stdout.write(f'    {queryset[:page_size].explain()}')
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actresses", "0005_actress_crawl_count_actress_crawl_depth_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["updated_at"], name="actresses_a_updated_b2e624_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:45
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill(apps, schema_editor):
+    ActressTag = apps.get_model("actresses", "ActressTag")
+    rows = ActressTag.actresses.through.objects.values("actresstag_id").annotate(
+        count=Count("id")
+    )
+    for row in rows:
+        ActressTag.objects.filter(pk=row["actresstag_id"]).update(
+            actress_count=row["count"]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actresses", "0006_actress_actresses_a_updated_b2e624_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="actresstag",
+            name="actress_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="关联女友数"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:48
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def backfill(apps, schema_editor):
+    Actress = apps.get_model("actresses", "Actress")
+    for flag, source in [
+        ("has_profile_image", "profile_image"),
+        ("has_lifestyle_photos", "lifestyle_photos"),
+        ("has_portrait_photos", "portrait_photos"),
+    ]:
+        Actress.objects.exclude(
+            Q(**{f"{source}__isnull": True}) | Q(**{source: ""})
+        ).update(**{flag: True})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actresses", "0007_actresstag_actress_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="actress",
+            name="has_lifestyle_photos",
+            field=models.BooleanField(default=False, verbose_name="有生活照"),
+        ),
+        migrations.AddField(
+            model_name="actress",
+            name="has_portrait_photos",
+            field=models.BooleanField(default=False, verbose_name="有写真照"),
+        ),
+        migrations.AddField(
+            model_name="actress",
+            name="has_profile_image",
+            field=models.BooleanField(default=False, verbose_name="有头像"),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["has_lifestyle_photos", "has_portrait_photos"],
+                name="actresses_a_has_lif_919a54_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["has_portrait_photos"], name="actresses_a_has_por_552550_idx"
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:05
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def recount(apps, schema_editor):
+    Actress = apps.get_model("actresses", "Actress")
+    MovieActress = apps.get_model("movies", "MovieActress")
+    counts = dict(
+        MovieActress.objects.values("actress_id")
+        .annotate(count=Count("id"))
+        .values_list("actress_id", "count")
+    )
+    changed = []
+    for actress in Actress.objects.only("id", "movie_count").iterator():
+        count = counts.get(actress.pk, 0)
+        if actress.movie_count != count:
+            actress.movie_count = count
+            changed.append(actress)
+    Actress.objects.bulk_update(changed, ["movie_count"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actresses", "0008_actress_photo_flags"),
+        ("movies", "0015_movieactress"),
+    ]
+
+    operations = [
+        migrations.RunPython(recount, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:53
+
+import re
+
+from django.db import migrations, models
+
+CUP_SIZE_PATTERN = re.compile(r"^\s*([A-K])(?![A-Z])", re.IGNORECASE)
+
+
+def backfill(apps, schema_editor):
+    Actress = apps.get_model("actresses", "Actress")
+    values = (
+        Actress.objects.exclude(cup_size="")
+        .order_by()
+        .values_list("cup_size", flat=True)
+        .distinct()
+    )
+    for value in values:
+        match = CUP_SIZE_PATTERN.match(value)
+        if match:
+            Actress.objects.filter(cup_size=value).update(cup=match.group(1).upper())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actresses", "0009_actress_movie_count_from_links"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="actress",
+            name="cup",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("", "未知"),
+                    ("A", "A"),
+                    ("B", "B"),
+                    ("C", "C"),
+                    ("D", "D"),
+                    ("E", "E"),
+                    ("F", "F"),
+                    ("G", "G"),
+                    ("H", "H"),
+                    ("I", "I"),
+                    ("J", "J"),
+                    ("K", "K"),
+                ],
+                max_length=1,
+                verbose_name="罩杯（规范化）",
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(fields=["name"], name="actresses_a_name_bf76a4_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["cup", "name"], name="actresses_a_cup_b7777f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(fields=["height"], name="actresses_a_height_dc2675_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["birth_date"], name="actresses_a_birth_d_07af24_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["debut_date"], name="actresses_a_debut_d_e8abb3_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["-movie_count"], name="actresses_a_movie_c_b8a53b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actress",
+            index=models.Index(
+                fields=["-popularity_score", "-created_at"],
+                name="actresses_a_popular_8c9aa5_idx",
+            ),
+        ),
+    ]
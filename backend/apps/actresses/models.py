@@ -2,13 +2,53 @@
 女友/演员模型
 """
 
+import re
+
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
 
+from apps.core.relation_counters import CounterFieldsMixin
+
+
+class CupSize(models.TextChoices):
+    """罩杯（由 cup_size 文本规范化）"""
+    UNKNOWN = '', '未知'
+    A = 'A', 'A'
+    B = 'B', 'B'
+    C = 'C', 'C'
+    D = 'D', 'D'
+    E = 'E', 'E'
+    F = 'F', 'F'
+    G = 'G', 'G'
+    H = 'H', 'H'
+    I = 'I', 'I'
+    J = 'J', 'J'
+    K = 'K', 'K'
+
+
+CUP_SIZE_PATTERN = re.compile(r'^\s*([A-K])(?![A-Z])', re.IGNORECASE)
+
+
+def normalize_cup_size(value):
+    """'E'、'e罩杯'、'Eカップ' -> 'E'，无法识别时返回空字符串"""
+    match = CUP_SIZE_PATTERN.match(value or '')
+    return match.group(1).upper() if match else CupSize.UNKNOWN
+
 
-class Actress(models.Model):
+# 保存时计算的冗余字段 -> (来源字段, 计算函数)
+DERIVED_FIELDS = {
+    'has_profile_image': ('profile_image', bool),
+    'has_lifestyle_photos': ('lifestyle_photos', bool),
+    'has_portrait_photos': ('portrait_photos', bool),
+    'cup': ('cup_size', normalize_cup_size),
+}
+
+
+class Actress(CounterFieldsMixin, models.Model):
     """女友/演员模型"""
+
+    counter_fields = ('movie_count',)
     
     # 基本信息
     name = models.CharField(
@@ -61,6 +101,14 @@ class Actress(models.Model):
         blank=True,
         verbose_name='罩杯'
     )
+
+    # 由 cup_size 在保存时计算，筛选和统计使用
+    cup = models.CharField(
+        max_length=1,
+        blank=True,
+        choices=CupSize.choices,
+        verbose_name='罩杯（规范化）'
+    )
     
     blood_type = models.CharField(
         max_length=5,
@@ -158,6 +206,22 @@ class Actress(models.Model):
         verbose_name='本地写真照路径',
         help_text='本地写真照片路径，用换行分隔'
     )
+
+    # 照片标记（由图片字段在保存时计算，统计和筛选不再扫描大文本列）
+    has_profile_image = models.BooleanField(
+        default=False,
+        verbose_name='有头像'
+    )
+
+    has_lifestyle_photos = models.BooleanField(
+        default=False,
+        verbose_name='有生活照'
+    )
+
+    has_portrait_photos = models.BooleanField(
+        default=False,
+        verbose_name='有写真照'
+    )
     
     # 描述信息
     description = models.TextField(
@@ -203,6 +267,7 @@ class Actress(models.Model):
         verbose_name='收藏次数'
     )
     
+    # 关联影片数，由 m2m_changed 信号增量维护
     movie_count = models.PositiveIntegerField(
         default=0,
         verbose_name='作品数量'
@@ -260,9 +325,46 @@ class Actress(models.Model):
         verbose_name = '女友/演员'
         verbose_name_plural = '女友/演员管理'
         ordering = ['-popularity_score', '-created_at']
+        indexes = [
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['has_lifestyle_photos', 'has_portrait_photos']),
+            models.Index(fields=['has_portrait_photos']),
+            # 属性筛选；列表默认按姓名排序，罩杯筛选时按 (cup, name) 顺序读取
+            models.Index(fields=['name']),
+            models.Index(fields=['cup', 'name']),
+            models.Index(fields=['height']),
+            models.Index(fields=['birth_date']),
+            models.Index(fields=['debut_date']),
+            models.Index(fields=['-movie_count']),
+            # 模型默认排序
+            models.Index(fields=['-popularity_score', '-created_at']),
+        ]
     
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # 未加载的来源字段不会被保存，对应的冗余字段也保持不变
+            deferred = self.get_deferred_fields()
+            sources = [source for source, _ in DERIVED_FIELDS.values() if source not in deferred]
+        else:
+            sources = [source for source, _ in DERIVED_FIELDS.values() if source in update_fields]
+        derived = self.refresh_derived_fields(sources)
+        if update_fields is not None and derived:
+            kwargs['update_fields'] = set(update_fields) | set(derived)
+        super().save(*args, **kwargs)
+
+    def refresh_derived_fields(self, sources=None):
+        """根据来源字段重新计算照片标记和规范化罩杯，返回计算过的字段名"""
+        derived = []
+        for name, (source, compute) in DERIVED_FIELDS.items():
+            if sources is not None and source not in sources:
+                continue
+            setattr(self, name, compute(getattr(self, source)))
+            derived.append(name)
+        return derived
     
     def get_absolute_url(self):
         return reverse('actress-detail', kwargs={'pk': self.pk})
@@ -302,9 +404,10 @@ class Actress(models.Model):
         return []
     
     def increment_view_count(self):
-        """增加浏览次数"""
+        """增加浏览次数（缓冲后批量写回）"""
+        from apps.core.counters import counter_buffer
         self.view_count += 1
-        self.save(update_fields=['view_count'])
+        counter_buffer.incr(Actress, self.pk, 'view_count')
     
     def increment_favorite_count(self):
         """增加收藏次数"""
@@ -312,14 +415,15 @@ class Actress(models.Model):
         self.save(update_fields=['favorite_count'])
     
     def update_movie_count(self):
-        """更新作品数量"""
-        from apps.movies.models import Movie
-        self.movie_count = Movie.objects.filter(jav_idols__icontains=self.name).count()
+        """按关联影片重算作品数量（关联变化时已由 m2m_changed 增量维护）"""
+        self.movie_count = self.movies.count()
         self.save(update_fields=['movie_count'])
 
 
-class ActressTag(models.Model):
+class ActressTag(CounterFieldsMixin, models.Model):
     """女友/演员标签"""
+
+    counter_fields = ('actress_count',)
     
     name = models.CharField(
         max_length=50,
@@ -351,6 +455,12 @@ class ActressTag(models.Model):
         blank=True,
         verbose_name='关联女友'
     )
+
+    # 由 m2m_changed 信号增量维护
+    actress_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='关联女友数'
+    )
     
     created_at = models.DateTimeField(
         auto_now_add=True,
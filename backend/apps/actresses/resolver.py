@@ -0,0 +1,257 @@
+"""
+Actress name resolution.
+
+把影片署名、爬虫抓到的演员名解析为 Actress 主键。一次性读取全部女友的姓名、
+英文名和别名，规范化（全角/半角、大小写、片假名/平假名、空白和间隔号）后放入字典，
+批量关联时全部在内存中完成；字典未命中时通过 BK 树在限定的编辑距离内模糊匹配。
+进程内共享一个实例，超过 ACTRESS_NAME_RESOLVER_TTL 秒后重新加载，
+本进程内新建、改名或删除的女友由 post_save/post_delete 信号即时更新。
+
+模糊匹配只用于人工核对和候选提示，写入关联的路径必须精确匹配，
+否则相差一个字的不同女友（如 相沢みなと / 相沢みなみ）会被错误关联。
+"""
+
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+
+from .models import Actress
+
+# 别名分隔符
+ALIAS_SEPARATOR = re.compile(r'[,，、;；|/\n]')
+
+# 规范化时去掉的字符：空白、间隔号、连字符、句点
+IGNORED_CHARACTERS = re.compile(r'[\s・·.\-_]')
+
+# 片假名与平假名的码位差
+KANA_OFFSET = ord('ァ') - ord('ぁ')
+
+# 来源优先级：同一规范化名称对应多位女友时，姓名优先于英文名，英文名优先于别名
+PRIORITY_NAME, PRIORITY_NAME_EN, PRIORITY_ALIAS = 0, 1, 2
+
+# 模糊匹配只用于足够长的名称，避免两三个字的名字互相匹配
+FUZZY_MIN_LENGTH = 4
+
+
+def katakana_to_hiragana(text):
+    return ''.join(
+        chr(ord(char) - KANA_OFFSET) if 'ァ' <= char <= 'ヶ' else char
+        for char in text
+    )
+
+
+def normalize_name(name):
+    """'ＡＢＣ　みく'、'abc ミク' -> 'abcみく'"""
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKC', name).casefold()
+    return katakana_to_hiragana(IGNORED_CHARACTERS.sub('', text))
+
+
+def split_aliases(alias):
+    return [part.strip() for part in ALIAS_SEPARATOR.split(alias or '') if part.strip()]
+
+
+def edit_distance(a, b):
+    """Levenshtein 距离"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """按编辑距离组织的 BK 树，节点为 [名称, {距离: 子节点}]"""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, key):
+        if self.root is None:
+            self.root = [key, {}]
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(key, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [key, {}]
+                return
+            node = child
+
+    def search(self, key, max_distance):
+        """返回 [(距离, 名称)]，按距离升序"""
+        if self.root is None:
+            return []
+        matches = []
+        stack = [self.root]
+        while stack:
+            name, children = stack.pop()
+            distance = edit_distance(key, name)
+            if distance <= max_distance:
+                matches.append((distance, name))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(matches)
+
+
+class NameResolver:
+    """规范化名称 -> 女友主键"""
+
+    def __init__(self, max_distance=1):
+        self.max_distance = max_distance
+        self.ids = {}
+        # 规范化名称 -> {女友主键: 优先级}，女友主键 -> 规范化名称集合
+        self.owners = {}
+        self.keys = {}
+        self.tree = None
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def load(cls, max_distance=1):
+        resolver = cls(max_distance)
+        rows = Actress.objects.order_by('id').values_list('id', 'name', 'name_en', 'alias')
+        for actress_id, name, name_en, alias in rows.iterator(chunk_size=5000):
+            resolver.add(actress_id, name, name_en, alias)
+        return resolver
+
+    def choose_owner(self, key):
+        # 优先级高者优先，同一优先级保留主键较小的女友
+        owners = self.owners[key]
+        self.ids[key] = min(owners, key=lambda actress_id: (owners[actress_id], actress_id))
+
+    def add_key(self, name, actress_id, priority):
+        key = normalize_name(name)
+        if not key:
+            return
+        owners = self.owners.get(key)
+        if owners is None:
+            owners = self.owners[key] = {}
+            if self.tree is not None:
+                self.tree.add(key)
+        owners[actress_id] = min(priority, owners.get(actress_id, priority))
+        self.keys.setdefault(actress_id, set()).add(key)
+        self.choose_owner(key)
+
+    def add(self, actress_id, name, name_en='', alias=''):
+        """登记一位女友的姓名、英文名和别名"""
+        self.add_key(name, actress_id, PRIORITY_NAME)
+        self.add_key(name_en, actress_id, PRIORITY_NAME_EN)
+        for part in split_aliases(alias):
+            self.add_key(part, actress_id, PRIORITY_ALIAS)
+
+    def remove(self, actress_id):
+        """移除一位女友登记过的全部名称，同名的其他女友随之接替"""
+        for key in self.keys.pop(actress_id, ()):
+            owners = self.owners[key]
+            owners.pop(actress_id, None)
+            if owners:
+                self.choose_owner(key)
+            else:
+                del self.owners[key]
+                del self.ids[key]
+                # BK 树不支持删除，下次模糊匹配时重建
+                self.tree = None
+
+    def register(self, actress):
+        """登记新建或改名的女友（先移除旧名称）"""
+        self.remove(actress.pk)
+        self.add(actress.pk, actress.name, actress.name_en, actress.alias)
+
+    def build_tree(self):
+        tree = BKTree()
+        for key in self.ids:
+            tree.add(key)
+        self.tree = tree
+
+    def resolve(self, name, fuzzy=False):
+        """解析一个名称，未找到或模糊匹配有歧义时返回 None（fuzzy 仅用于候选提示）"""
+        key = normalize_name(name)
+        if not key:
+            return None
+        actress_id = self.ids.get(key)
+        if actress_id is not None or not fuzzy:
+            return actress_id
+        if len(key) < FUZZY_MIN_LENGTH or self.max_distance <= 0:
+            return None
+
+        if self.tree is None:
+            self.build_tree()
+        matches = self.tree.search(key, self.max_distance)
+        if not matches:
+            return None
+        best = matches[0][0]
+        candidates = {self.ids[name] for distance, name in matches if distance == best}
+        return candidates.pop() if len(candidates) == 1 else None
+
+    def resolve_many(self, names, fuzzy=False):
+        """批量解析，返回 {名称: 主键或 None}"""
+        return {name: self.resolve(name, fuzzy=fuzzy) for name in names}
+
+
+_resolver = None
+_lock = threading.Lock()
+
+
+def get_name_resolver():
+    """进程内共享的解析器，超过 ACTRESS_NAME_RESOLVER_TTL 秒后重新加载"""
+    global _resolver
+    ttl = getattr(settings, 'ACTRESS_NAME_RESOLVER_TTL', 300)
+    with _lock:
+        if _resolver is None or time.monotonic() - _resolver.loaded_at > ttl:
+            _resolver = NameResolver.load(
+                max_distance=getattr(settings, 'ACTRESS_NAME_MAX_DISTANCE', 1)
+            )
+        return _resolver
+
+
+def register_actress(actress):
+    """已加载的解析器登记新建或改名的女友"""
+    if _resolver is not None:
+        with _lock:
+            _resolver.register(actress)
+
+
+def unregister_actress(actress_id):
+    """已加载的解析器移除已删除的女友"""
+    if _resolver is not None:
+        with _lock:
+            _resolver.remove(actress_id)
+
+
+def resolve_actress_id(name):
+    """
+    精确解析一个名称并确认女友仍然存在，用于写入关联。
+
+    其他进程删除或改名的女友在本进程解析器重新加载前仍可能被解析到，
+    确认不存在时重新加载解析器再解析一次。
+    """
+    actress_id = get_name_resolver().resolve(name, fuzzy=False)
+    if actress_id is None or Actress.objects.filter(pk=actress_id).exists():
+        return actress_id
+    reset_name_resolver()
+    actress_id = get_name_resolver().resolve(name, fuzzy=False)
+    if actress_id is None or Actress.objects.filter(pk=actress_id).exists():
+        return actress_id
+    return None
+
+
+def reset_name_resolver():
+    global _resolver
+    with _lock:
+        _resolver = None
@@ -3,10 +3,29 @@ Actress serializers for AVBook API.
 """
 
 from rest_framework import serializers
+
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
 from .models import Actress
 
 
-class ActressSerializer(serializers.ModelSerializer):
+# 卡片（网格列表）只需要的字段
+ACTRESS_CARD_FIELDS = [
+    'id', 'name', 'name_en', 'profile_image', 'profile_image_local',
+    'height', 'cup_size', 'measurements', 'birth_date', 'movie_count',
+]
+
+# 计算字段依赖的模型列，用于 defer 不需要的 TextField
+ACTRESS_FIELD_SOURCES = {
+    'lifestyle_photos_list': ['lifestyle_photos'],
+    'portrait_photos_list': ['portrait_photos'],
+    'lifestyle_photos_local_list': ['lifestyle_photos_local'],
+    'portrait_photos_local_list': ['portrait_photos_local'],
+    'gallery_images_list': ['gallery_images'],
+    'recent_movies': [],
+}
+
+
+class ActressSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """演员基本序列化器"""
     lifestyle_photos_list = serializers.SerializerMethodField()
     portrait_photos_list = serializers.SerializerMethodField()
@@ -23,6 +42,8 @@ class ActressSerializer(serializers.ModelSerializer):
             'lifestyle_photos_list', 'portrait_photos_list',
             'lifestyle_photos_local_list', 'portrait_photos_local_list'
         ]
+        field_presets = {'card': ACTRESS_CARD_FIELDS}
+        field_sources = ACTRESS_FIELD_SOURCES
     
     def get_lifestyle_photos_list(self, obj):
         """获取生活照列表"""
@@ -0,0 +1,31 @@
+"""
+Signal handlers for actresses app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Actress
+from .resolver import register_actress, unregister_actress
+
+NAME_FIELDS = {'name', 'name_en', 'alias'}
+
+
+@receiver(post_save, sender=Actress)
+def actress_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """新建或改名的女友登记到本进程的姓名解析器"""
+    if raw:
+        return
+    if update_fields is not None and not NAME_FIELDS & set(update_fields):
+        return
+    if NAME_FIELDS & instance.get_deferred_fields():
+        return
+    transaction.on_commit(lambda: register_actress(instance))
+
+
+@receiver(post_delete, sender=Actress)
+def actress_deleted(sender, instance, **kwargs):
+    """已删除的女友从本进程的姓名解析器中移除"""
+    actress_id = instance.pk
+    transaction.on_commit(lambda: unregister_actress(actress_id))
@@ -0,0 +1,76 @@
+"""
+Actress statistics.
+
+所有统计项都是 Actress 上的条件计数，合并为一次条件聚合查询：
+新增一个分组统计只需在 STATS_BREAKDOWNS 中加一组 {桶名: 条件}，不增加查询次数。
+照片和罩杯条件读取保存时计算的 has_* 标记列和规范化的 cup 列，不扫描文本列。
+"""
+
+from django.db.models import Count, Q
+
+from .models import Actress, CupSize
+
+# 与列表的 heightRange 参数一致（边界值同时计入相邻两档）
+HEIGHT_RANGES = {
+    'short': Q(height__gte=150, height__lte=160),
+    'medium': Q(height__gte=160, height__lte=170),
+    'tall': Q(height__gte=170),
+}
+
+# 与列表的 hasPhotos 参数一致
+PHOTO_FILTERS = {
+    'lifestyle': Q(has_lifestyle_photos=True),
+    'portrait': Q(has_portrait_photos=True),
+    'both': Q(has_lifestyle_photos=True, has_portrait_photos=True),
+}
+
+STATS_TOTALS = {
+    'total_count': Q(),
+    'with_photos': Q(has_profile_image=True),
+    'with_lifestyle_photos': Q(has_lifestyle_photos=True),
+    'with_portrait_photos': Q(has_portrait_photos=True),
+}
+
+STATS_BREAKDOWNS = {
+    'cup_size': {
+        **{cup: Q(cup=cup) for cup in CupSize.values if cup},
+        'unknown': Q(cup=CupSize.UNKNOWN),
+    },
+    'height': {
+        **HEIGHT_RANGES,
+        'unknown': Q(height__isnull=True),
+    },
+    'status': {
+        'active': Q(retirement_date__isnull=True, is_active=True),
+        'inactive': Q(retirement_date__isnull=True, is_active=False),
+        'retired': Q(retirement_date__isnull=False),
+    },
+}
+
+
+def count_expression(condition):
+    return Count('id', filter=condition) if condition else Count('id')
+
+
+def get_actress_stats():
+    """一次查询计算全部统计项"""
+    expressions = {name: count_expression(condition) for name, condition in STATS_TOTALS.items()}
+    for breakdown, buckets in STATS_BREAKDOWNS.items():
+        for bucket, condition in buckets.items():
+            expressions[f'{breakdown}_{bucket}'] = count_expression(condition)
+
+    row = Actress.objects.order_by().aggregate(**expressions)
+
+    stats = {name: row[name] for name in STATS_TOTALS}
+    total_count = stats['total_count']
+    stats['photo_coverage'] = (
+        (stats['with_photos'] / total_count * 100) if total_count > 0 else 0
+    )
+    stats['breakdowns'] = {
+        breakdown: [
+            {'value': bucket, 'count': row[f'{breakdown}_{bucket}']}
+            for bucket in buckets
+        ]
+        for breakdown, buckets in STATS_BREAKDOWNS.items()
+    }
+    return stats
@@ -4,12 +4,23 @@ Actress views for AVBook API.
 
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
+from django.db.models import Count, Prefetch
+from apps.core.bulk import BulkLookupMixin
+from apps.core.conditional import ConditionalResponseMixin
+from apps.core.fast_render import FastListMixin
+from apps.core.fieldsets import defer_unused_columns, get_requested_fields
+from apps.core.response_cache import CachedResponseMixin
+from apps.movies.pagination import MovieCursorPagination
+
+from .fast_render import ActressRowBuilder
+from .filters import ActressFilter
 from .models import Actress
 from .serializers import ActressSerializer, ActressDetailSerializer
+from .stats import get_actress_stats
 
 
 class ActressPagination(PageNumberPagination):
@@ -19,19 +30,44 @@ class ActressPagination(PageNumberPagination):
     max_page_size = 200
 
 
-class ActressViewSet(viewsets.ModelViewSet):
+class ActressMoviePagination(MovieCursorPagination):
+    """女友作品分页：在关联表上按 (发行日期, 影片) 键集分页，由复合索引支撑"""
+    ordering_fields = ('release_date',)
+    default_ordering = '-release_date'
+    tiebreaker = 'movie_id'
+    page_size = 10
+
+
+class ActressViewSet(
+    ConditionalResponseMixin, CachedResponseMixin, FastListMixin, BulkLookupMixin,
+    viewsets.ModelViewSet
+):
     """
     演员视图集
     """
+    # 详情包含最近作品
+    cache_dependencies = ('actresses.Actress', 'movies.Movie')
+    cached_actions = ('list', 'retrieve', 'stats')
+    fast_row_builder_class = ActressRowBuilder
+    # 姓名不唯一，同名的演员都会返回
+    bulk_lookup_fields = {'ids': 'id', 'names': 'name'}
+    bulk_key_normalizers = {'name': lambda value: str(value).strip()}
+    bulk_includes = ('movies',)
     queryset = Actress.objects.all().order_by('id')
     serializer_class = ActressSerializer
     pagination_class = ActressPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['cup_size', 'height']
+    filterset_class = ActressFilter
     search_fields = ['name', 'name_en']
-    ordering_fields = ['id', 'name', 'height', 'debut_date']
+    ordering_fields = ['id', 'name', 'height', 'debut_date', 'movie_count']
     ordering = ['id']
 
+    def get_cache_dependencies(self):
+        # 统计只读取演员表
+        if self.action == 'stats':
+            return ('actresses.Actress',)
+        return self.cache_dependencies
+
     def get_serializer_class(self):
         """根据action选择序列化器"""
         if self.action == 'retrieve':
@@ -39,95 +75,65 @@ class ActressViewSet(viewsets.ModelViewSet):
         return ActressSerializer
 
     def get_queryset(self):
-        """获取查询集，支持自定义筛选，优先显示有照片的女友"""
+        """获取查询集（筛选由 ActressFilter 处理），只加载所选输出字段用到的列"""
         queryset = Actress.objects.all()
 
-        # 按照片类型筛选
-        has_photos = self.request.query_params.get('hasPhotos', None)
-        if has_photos == 'lifestyle':
-            queryset = queryset.exclude(
-                Q(lifestyle_photos__isnull=True) | Q(lifestyle_photos='')
-            )
-        elif has_photos == 'portrait':
-            queryset = queryset.exclude(
-                Q(portrait_photos__isnull=True) | Q(portrait_photos='')
-            )
-        elif has_photos == 'both':
-            queryset = queryset.exclude(
-                Q(lifestyle_photos__isnull=True) | Q(lifestyle_photos='')
-            ).exclude(
-                Q(portrait_photos__isnull=True) | Q(portrait_photos='')
-            )
-        # 不再按照片排序，因为大部分女友没有真实照片
-
-        # 按身高范围筛选
-        height_range = self.request.query_params.get('heightRange', None)
-        if height_range == 'short':  # 150-160cm
-            queryset = queryset.filter(height__gte=150, height__lte=160)
-        elif height_range == 'medium':  # 160-170cm
-            queryset = queryset.filter(height__gte=160, height__lte=170)
-        elif height_range == 'tall':  # 170cm+
-            queryset = queryset.filter(height__gte=170)
-
-        # 按罩杯筛选
-        cup_size = self.request.query_params.get('cup_size', None)
-        if cup_size:
-            queryset = queryset.filter(cup_size__icontains=cup_size)
+        # 只读取所选输出字段用到的大文本列
+        serializer_class = self.get_serializer_class()
+        fields = get_requested_fields(serializer_class, self.request.query_params)
+        queryset = defer_unused_columns(queryset, serializer_class, fields)
 
         # 默认按ID排序
         return queryset.order_by('id')
 
+    def get_bulk_queryset(self, includes):
+        """批量查询不应用列表的筛选参数，include=movies 时预加载作品卡片字段"""
+        from apps.movies.models import Movie
+        from apps.movies.serializers import MOVIE_CARD_FIELDS
+
+        fields = get_requested_fields(ActressSerializer, self.request.query_params)
+        queryset = defer_unused_columns(Actress.objects.all(), ActressSerializer, fields)
+        if 'movies' in includes:
+            queryset = queryset.prefetch_related(Prefetch(
+                'movies',
+                queryset=Movie.objects.only(*MOVIE_CARD_FIELDS).order_by('-release_date', '-id'),
+                to_attr='movie_cards'
+            ))
+        return queryset
+
+    def get_bulk_data(self, objects, includes):
+        from apps.movies.serializers import MOVIE_CARD_FIELDS
+
+        data = ActressSerializer(objects, many=True, context=self.get_serializer_context()).data
+        if 'movies' in includes:
+            for actress, item in zip(objects, data):
+                item['movies'] = [
+                    {name: getattr(movie, name) for name in MOVIE_CARD_FIELDS}
+                    for movie in actress.movie_cards
+                ]
+        return data
+
     @action(detail=True, methods=['get'])
     def movies(self, request, pk=None):
-        """获取演员的作品列表"""
-        actress = self.get_object()
-        movies = actress.movies.all().order_by('-release_date')
-        
-        # 简单的分页
-        page_size = int(request.query_params.get('page_size', 10))
-        page = int(request.query_params.get('page', 1))
-        start = (page - 1) * page_size
-        end = start + page_size
-        
-        movies_data = []
-        for movie in movies[start:end]:
-            movies_data.append({
-                'id': movie.id,
-                'censored_id': movie.censored_id,
-                'movie_title': movie.movie_title,
-                'release_date': movie.release_date,
-                'studio': movie.studio,
-                'cover_image': movie.cover_image,
-                'duration_minutes': movie.duration_minutes,
-                'movie_tags': movie.movie_tags,
-                'sample_images': movie.sample_images.split('\n') if movie.sample_images else [],
-            })
-        
-        return Response({
-            'count': movies.count(),
-            'results': movies_data,
-            'page': page,
-            'page_size': page_size,
-        })
+        """获取演员的作品列表（按发行日期键集分页，分页参数与 /api/movies/?pagination=cursor 一致）"""
+        from apps.movies.models import Movie, MovieActress
+        from apps.movies.serializers import MOVIE_CARD_FIELDS
+
+        actress = get_object_or_404(Actress.objects.only('id'), pk=pk)
+        paginator = ActressMoviePagination()
+        links = paginator.paginate_queryset(
+            MovieActress.objects.filter(actress=actress).values('movie_id', 'release_date'),
+            request, view=self
+        )
+
+        ids = [link['movie_id'] for link in links]
+        fields = MOVIE_CARD_FIELDS + ['movie_tags']
+        movies = {row['id']: row for row in Movie.objects.filter(pk__in=ids).values(*fields)}
+        return paginator.get_paginated_response([movies[pk] for pk in ids if pk in movies])
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """获取演员统计信息"""
-        total_count = Actress.objects.count()
-        with_photos = Actress.objects.exclude(
-            Q(profile_image__isnull=True) | Q(profile_image='')
-        ).count()
-        with_lifestyle_photos = Actress.objects.exclude(
-            Q(lifestyle_photos__isnull=True) | Q(lifestyle_photos='')
-        ).count()
-        with_portrait_photos = Actress.objects.exclude(
-            Q(portrait_photos__isnull=True) | Q(portrait_photos='')
-        ).count()
-        
-        return Response({
-            'total_count': total_count,
-            'with_photos': with_photos,
-            'with_lifestyle_photos': with_lifestyle_photos,
-            'with_portrait_photos': with_portrait_photos,
-            'photo_coverage': (with_photos / total_count * 100) if total_count > 0 else 0,
-        })
+        """获取演员统计信息（一次聚合查询，结果随演员数据写入失效）"""
+        return self.get_cached_response(
+            request, lambda request: Response(get_actress_stats())
+        )
@@ -0,0 +1,13 @@
+"""
+Core API URLs for AVBook.
+"""
+
+from django.urls import path
+
+from .views import cache_metrics, changes, suggest
+
+urlpatterns = [
+    path('suggest/', suggest, name='suggest'),
+    path('cache-metrics/', cache_metrics, name='cache-metrics'),
+    path('changes/', changes, name='changes'),
+]
@@ -5,3 +5,11 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = '核心功能'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
+
+        # 进程启动时从快照加载输入联想索引（只读文件，不访问数据库）
+        from .suggest import suggest_service
+        suggest_service.load()
@@ -0,0 +1,131 @@
+"""
+Bulk lookup for DRF viewsets.
+
+POST {"ids": [...]} 等按主键或业务键一次取回多条记录：键按批次用 IN 查询，
+include 参数选择的关联数据通过预加载读取，未找到的键在 missing 中逐个列出。
+"""
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from .fieldsets import split_param
+
+INCLUDE_PARAM = 'include'
+
+# 每条 IN 查询的键数量，避免超出数据库的参数个数限制
+BULK_QUERY_BATCH_SIZE = 500
+
+
+def normalize_keys(model_field, values, normalize=None):
+    """
+    把请求中的键转换为字段类型并去重（保持顺序）。
+
+    返回 (有效键, 无效键)，无效键原样报告为 missing。
+    """
+    keys, invalid = [], []
+    seen = set()
+    for value in values:
+        try:
+            if normalize is not None:
+                value = normalize(value)
+            key = model_field.to_python(value)
+        except (TypeError, ValueError, ValidationError):
+            invalid.append(value)
+            continue
+        if key is None or key == '':
+            invalid.append(value)
+            continue
+        if key not in seen:
+            seen.add(key)
+            keys.append(key)
+    return keys, invalid
+
+
+class BulkLookupMixin:
+    """
+    为视图集增加 POST <prefix>/bulk/ 批量查询动作。
+
+    bulk_lookup_fields: 请求体中的键名 -> 模型字段名，如 {'ids': 'id'}
+    bulk_key_normalizers: 模型字段名 -> 键的规范化函数（如转大写）
+    bulk_includes: 允许的 include 名称
+    子类可重写 get_bulk_queryset() 和 get_bulk_data() 处理 include。
+    """
+
+    bulk_lookup_fields = {'ids': 'id'}
+    bulk_key_normalizers = {}
+    bulk_includes = ()
+
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    def bulk(self, request):
+        """按主键或业务键批量获取"""
+        lookups = {
+            param: request.data.get(param)
+            for param in self.bulk_lookup_fields
+            if request.data.get(param) is not None
+        }
+        if not lookups:
+            return Response(
+                {'error': f'请提供 {" 或 ".join(self.bulk_lookup_fields)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if any(not isinstance(values, list) for values in lookups.values()):
+            return Response({'error': '键必须以数组形式提供'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_keys = getattr(settings, 'BULK_LOOKUP_MAX_KEYS', 5000)
+        if sum(len(values) for values in lookups.values()) > max_keys:
+            return Response(
+                {'error': f'单次最多查询 {max_keys} 个键'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        includes = self.get_bulk_includes(request)
+        if includes is None:
+            return Response(
+                {'error': f'include 只能是 {", ".join(self.bulk_includes)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.get_bulk_queryset(includes)
+        found = {}
+        missing = {}
+        for param, values in lookups.items():
+            field_name = self.bulk_lookup_fields[param]
+            model_field = queryset.model._meta.get_field(field_name)
+            keys, invalid = normalize_keys(
+                model_field, values, self.bulk_key_normalizers.get(field_name)
+            )
+            matched = {}
+            for start in range(0, len(keys), BULK_QUERY_BATCH_SIZE):
+                batch = keys[start:start + BULK_QUERY_BATCH_SIZE]
+                for obj in queryset.filter(**{f'{field_name}__in': batch}):
+                    matched.setdefault(getattr(obj, field_name), []).append(obj)
+            # 结果按请求中键的顺序输出
+            for key in keys:
+                for obj in matched.get(key, []):
+                    found.setdefault(obj.pk, obj)
+            missing[param] = invalid + [key for key in keys if key not in matched]
+
+        objects = list(found.values())
+        return Response({
+            'count': len(objects),
+            'results': self.get_bulk_data(objects, includes),
+            'missing': missing,
+        })
+
+    def get_bulk_includes(self, request):
+        """解析 include 参数（查询参数或请求体），包含未知名称时返回 None"""
+        value = request.data.get(INCLUDE_PARAM, request.query_params.get(INCLUDE_PARAM))
+        names = value if isinstance(value, list) else split_param(str(value or ''))
+        if any(name not in self.bulk_includes for name in names):
+            return None
+        return set(names)
+
+    def get_bulk_queryset(self, includes):
+        return self.get_queryset()
+
+    def get_bulk_data(self, objects, includes):
+        return self.get_serializer(objects, many=True).data
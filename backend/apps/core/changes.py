@@ -0,0 +1,167 @@
+"""
+Change feed for incremental client synchronization.
+
+影片、演员、磁力链接的创建/更新/删除在写入方的事务中追加 ChangeLogEntry，
+与数据一起提交或回滚。/api/changes/?since=<游标> 按主键顺序返回游标之后的变更：
+未删除的对象附带当前数据，删除的对象只返回墓碑。查询集 update()/bulk_create()
+不触发信号，不进入变更流（如浏览量等计数的写回）。
+
+自增主键按分配顺序而不是提交顺序可见：较小的主键可能晚于较大的主键提交。
+读取方只返回到已提交高水位（见 get_committed_high_water_mark）为止的记录，
+不会越过尚未提交的记录。主键空洞也可能来自回滚的事务，永远不会被填上，
+因此空洞之后的记录写入超过 CHANGE_FEED_GAP_TIMEOUT 秒后，该空洞视为回滚而被跳过：
+持有日志记录超过该时长才提交的事务，其变更会被客户端错过（需大于最长的写事务耗时）。
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import ChangeAction, ChangeLogEntry
+
+# 进入变更流的模型 -> 对外名称
+FEED_MODELS = {
+    'movies.Movie': 'movie',
+    'actresses.Actress': 'actress',
+    'magnets.MagnetLink': 'magnet',
+}
+
+# 影片输出包含演员列表，演员关系变化时影片记为更新
+FEED_M2M_FIELDS = [
+    ('movies.Movie', 'actresses'),
+]
+
+
+class CursorExpired(Exception):
+    """游标之后的部分日志已被清理，客户端需要重新全量同步"""
+
+
+def record_change(label, object_id, action):
+    """在写入方的事务中追加变更记录，回滚的写入不会出现在变更流中"""
+    ChangeLogEntry.objects.create(model_label=label, object_id=object_id, action=action)
+
+
+def get_gap_timeout():
+    return timedelta(seconds=getattr(settings, 'CHANGE_FEED_GAP_TIMEOUT', 300))
+
+
+def get_committed_high_water_mark():
+    """
+    返回 (已提交高水位, 最大可见主键)。
+
+    高水位以下的主键要么可见，要么是超过 CHANGE_FEED_GAP_TIMEOUT 仍未出现的空洞（视为回滚）；
+    只需检查最近 CHANGE_FEED_GAP_TIMEOUT 内写入的记录中的第一个空洞。
+    """
+    window_start = timezone.now() - get_gap_timeout()
+    base = ChangeLogEntry.objects.filter(
+        changed_at__lt=window_start
+    ).aggregate(base=Max('id'))['base'] or 0
+    recent = ChangeLogEntry.objects.filter(id__gt=base).order_by('id').values_list('id', flat=True)
+
+    high_water_mark = base
+    for entry_id in recent.iterator(chunk_size=5000):
+        if entry_id != high_water_mark + 1:
+            # 更小的主键尚未提交（或刚刚回滚），高水位停在空洞之前
+            break
+        high_water_mark = entry_id
+    latest = ChangeLogEntry.objects.aggregate(latest=Max('id'))['latest'] or 0
+    return high_water_mark, latest
+
+
+def get_latest_cursor():
+    """客户端全量导出前取得的起始游标：已提交高水位，而不是最大主键"""
+    return get_committed_high_water_mark()[0]
+
+
+def read_changes(since, limit):
+    """
+    读取游标之后、已提交高水位之内的变更，返回 (记录列表, 下一游标, 是否还有更多)。
+    """
+    oldest = ChangeLogEntry.objects.aggregate(oldest=Min('id'))['oldest']
+    if oldest is not None and since < oldest - 1:
+        raise CursorExpired(since)
+
+    high_water_mark, latest = get_committed_high_water_mark()
+    rows = list(
+        ChangeLogEntry.objects.filter(id__gt=since, id__lte=high_water_mark)
+        .order_by('id')[:limit + 1]
+    )
+    entries = rows[:limit]
+    has_more = len(rows) > limit or latest > max(high_water_mark, since)
+
+    next_cursor = entries[-1].id if entries else since
+    return entries, next_cursor, has_more
+
+
+def prune_changes(days=None):
+    """删除超过保留期限的变更记录，返回删除的数量"""
+    if days is None:
+        days = getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    expired = ChangeLogEntry.objects.filter(changed_at__lt=cutoff)
+    # 保留最新的一条过期记录，作为计算已提交高水位的起点
+    keep = expired.aggregate(keep=Max('id'))['keep']
+    deleted, _ = expired.exclude(id=keep).delete()
+    return deleted
+
+
+def load_objects(label, ids):
+    """按模型批量读取对象，返回 (对象字典, 序列化器类)"""
+    if label == 'movies.Movie':
+        from apps.movies.models import Movie
+        from apps.movies.serializers import MovieSerializer
+        queryset = MovieSerializer.setup_eager_loading(Movie.objects.all())
+        serializer_class = MovieSerializer
+    elif label == 'actresses.Actress':
+        from apps.actresses.models import Actress
+        from apps.actresses.serializers import ActressSerializer
+        queryset = Actress.objects.all()
+        serializer_class = ActressSerializer
+    else:
+        from apps.magnets.models import MagnetLink
+        from apps.magnets.serializers import MagnetLinkSerializer
+        queryset = MagnetLink.objects.select_related('movie').prefetch_related('categories')
+        serializer_class = MagnetLinkSerializer
+    return queryset.in_bulk(ids), serializer_class
+
+
+def build_changes(entries, context=None):
+    """
+    把变更记录转换为输出。
+
+    同一对象在本页多次变更时只输出最后一次（数据取当前值）；
+    最后一次不是删除但对象已不存在时跳过，删除记录会出现在后续页中。
+    """
+    latest = {}
+    for entry in entries:
+        key = (entry.model_label, entry.object_id)
+        latest.pop(key, None)
+        latest[key] = entry
+
+    ids_by_label = {}
+    for (label, object_id), entry in latest.items():
+        if entry.action != ChangeAction.DELETE:
+            ids_by_label.setdefault(label, []).append(object_id)
+
+    data = {}
+    for label, ids in ids_by_label.items():
+        objects, serializer_class = load_objects(label, ids)
+        ordered = list(objects.values())
+        serialized = serializer_class(ordered, many=True, context=context or {}).data
+        data.update({(label, obj.pk): item for obj, item in zip(ordered, serialized)})
+
+    changes = []
+    for (label, object_id), entry in latest.items():
+        if entry.action != ChangeAction.DELETE and (label, object_id) not in data:
+            continue
+        changes.append({
+            'cursor': entry.id,
+            'type': FEED_MODELS[label],
+            'id': object_id,
+            'action': entry.action,
+            'changed_at': entry.changed_at,
+            'data': data.get((label, object_id)),
+        })
+    return changes
@@ -0,0 +1,99 @@
+"""
+HTTP conditional GET support for DRF viewsets.
+
+校验值由完整 URL、所依赖模型的代数（与响应缓存共用，见 apps.core.response_cache）
+和行级校验值组成：详情接口为行的主键和 updated_at，列表接口为过滤后结果集的
+max(updated_at) 和行数。代数反映关联模型经过信号的写入，行级校验值覆盖
+queryset update()/bulk_create() 等不触发信号、但更新了 updated_at 的写入；
+浏览量等计数的写回两者都不改变，不会使校验值失效。
+客户端的 If-None-Match 与校验值一致时直接返回 304，不执行序列化。
+校验值同时作为响应缓存 key 的一部分，校验值变化后不会命中旧的缓存条目。
+"""
+
+import hashlib
+import logging
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .response_cache import get_generations
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(*parts):
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    # 只反映数据的版本，不是逐字节一致的校验值，使用弱 ETag
+    return 'W/' + quote_etag(digest)
+
+
+class ConditionalResponseMixin:
+    """
+    为视图集的 list/retrieve 提供 ETag 与 304 响应。
+
+    需要放在 CachedResponseMixin 之前，校验值一致时连缓存也不必读取；
+    依赖的模型由 get_cache_dependencies() 声明。
+    """
+
+    last_modified_field = 'updated_at'
+    conditional_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def get_conditional_response(self, request, handler, *args, **kwargs):
+        if self.action not in self.conditional_actions or request.method not in ('GET', 'HEAD'):
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        # 响应缓存以校验值区分条目
+        self.response_etag = etag
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+        return response
+
+    def get_etag(self, request):
+        """返回 ETag；无法计算时返回 None"""
+        try:
+            generations = get_generations(self.get_cache_dependencies())
+        except Exception as e:
+            logger.warning('Model generations unavailable, skipping ETag: %s', e)
+            return None
+        # 同一路径的不同查询参数、不同输出格式对应不同的资源；分页链接随 Host 变化
+        parts = [
+            request.get_host(), request.get_full_path(), request.accepted_renderer.format,
+            *generations,
+        ]
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        field = self.last_modified_field
+
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            try:
+                rows = list(queryset.filter(**lookup).values_list('pk', field)[:2])
+            except (TypeError, ValueError):
+                return None
+            if len(rows) != 1:
+                # 不存在时交给视图返回 404
+                return None
+            parts.extend(rows[0])
+        else:
+            result = queryset.aggregate(last_modified=Max(field), total=Count('pk'))
+            parts.extend([result['last_modified'], result['total']])
+
+        return make_etag(*parts)
@@ -0,0 +1,190 @@
+"""
+Write-behind counters.
+
+浏览、下载、点击等计数先累加到缓冲区（Redis 哈希，Redis 不可用时为进程内字典），
+再定期合并为批量的 UPDATE ... SET field = field + n 语句写回数据库。
+读取到的计数是最终一致的。
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .redis_client import get_redis_client, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'counters:pending'
+FLUSHING_KEY = 'counters:flushing'
+FLUSH_LOCK_KEY = 'counters:flush-lock'
+
+# 只删除自己持有的锁（锁过期后可能已被其他进程取得）
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def make_member(model, pk, field):
+    return f'{model._meta.label}:{pk}:{field}'
+
+
+def parse_member(member):
+    if isinstance(member, bytes):
+        member = member.decode('utf-8')
+    label, pk, field = member.rsplit(':', 2)
+    return label, int(pk), field
+
+
+def apply_increments(increments):
+    """
+    把 {(label, pk, field): n} 写回数据库。
+
+    相同模型、字段、增量的行合并为一条 UPDATE，全部在一个事务中执行。
+    返回执行的 UPDATE 语句数量。
+    """
+    groups = defaultdict(list)
+    for (label, pk, field), amount in increments.items():
+        if amount:
+            groups[(label, field, amount)].append(pk)
+
+    statements = 0
+    with transaction.atomic():
+        for (label, field, amount), pks in groups.items():
+            model = apps.get_model(label)
+            model.objects.filter(pk__in=pks).update(**{field: F(field) + amount})
+            statements += 1
+    return statements
+
+
+class CounterBuffer:
+    """计数缓冲区"""
+
+    def __init__(self):
+        self._local = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'COUNTER_FLUSH_INTERVAL', 10)
+
+    @property
+    def flush_lock_timeout(self):
+        """写回锁的过期时间（秒），需大于一次写回的耗时"""
+        return getattr(settings, 'COUNTER_FLUSH_LOCK_TIMEOUT', 60)
+
+    def incr(self, model, pk, field, amount=1):
+        """累加计数，不访问数据库"""
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.hincrby(PENDING_KEY, make_member(model, pk, field), amount)
+                return
+            except Exception as e:
+                logger.warning('Failed to buffer counter in Redis: %s', e)
+                mark_redis_failed()
+
+        with self._lock:
+            self._local[(model._meta.label, pk, field)] += amount
+        # 进程内缓冲没有定时任务负责，由写入方按间隔顺带写回
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush_local()
+
+    def flush(self):
+        """写回全部缓冲的计数，返回写回的计数条目数"""
+        return self.flush_redis() + self.flush_local()
+
+    def flush_local(self):
+        with self._lock:
+            self._flushed_at = time.monotonic()
+            if not self._local:
+                return 0
+            increments, self._local = self._local, defaultdict(int)
+
+        try:
+            apply_increments(increments)
+        except Exception:
+            logger.exception('Failed to flush counters')
+            # 写回失败时放回缓冲区，下次重试
+            with self._lock:
+                for key, amount in increments.items():
+                    self._local[key] += amount
+            return 0
+        return len(increments)
+
+    def flush_redis(self):
+        """
+        写回 Redis 中缓冲的计数。
+
+        先把待写回的哈希 RENAME 为 FLUSHING_KEY，之后的累加写入新的哈希；
+        写回失败时 FLUSHING_KEY 保留，下次先处理它。
+        读取、写回、删除在 FLUSH_LOCK_KEY 锁内完成，并发的写回直接跳过，
+        否则两个进程可能把同一个 FLUSHING_KEY 各写回一次。
+        """
+        client = get_redis_client()
+        if client is None:
+            return 0
+
+        token = uuid.uuid4().hex
+        try:
+            acquired = client.set(
+                FLUSH_LOCK_KEY, token, nx=True, px=int(self.flush_lock_timeout * 1000)
+            )
+        except Exception as e:
+            logger.warning('Failed to acquire counter flush lock: %s', e)
+            mark_redis_failed()
+            return 0
+        if not acquired:
+            return 0
+
+        try:
+            return self._flush_redis_locked(client)
+        finally:
+            try:
+                client.eval(RELEASE_LOCK_SCRIPT, 1, FLUSH_LOCK_KEY, token)
+            except Exception as e:
+                # 锁到期后自动释放
+                logger.warning('Failed to release counter flush lock: %s', e)
+
+    def _flush_redis_locked(self, client):
+        try:
+            if not client.exists(FLUSHING_KEY):
+                if not client.exists(PENDING_KEY):
+                    return 0
+                client.rename(PENDING_KEY, FLUSHING_KEY)
+            raw = client.hgetall(FLUSHING_KEY)
+        except Exception as e:
+            logger.warning('Failed to read buffered counters: %s', e)
+            mark_redis_failed()
+            return 0
+
+        increments = {}
+        for member, amount in raw.items():
+            increments[parse_member(member)] = int(amount)
+
+        try:
+            apply_increments(increments)
+        except Exception:
+            logger.exception('Failed to flush counters')
+            return 0
+
+        try:
+            client.delete(FLUSHING_KEY)
+        except Exception as e:
+            # 极端情况下会重复写回一次，优于丢失
+            logger.warning('Failed to clear flushed counters: %s', e)
+            mark_redis_failed()
+        return len(increments)
+
+
+counter_buffer = CounterBuffer()
@@ -0,0 +1,165 @@
+"""
+Fast list rendering from values() rows.
+
+列表接口可以跳过 ModelSerializer：直接用 values() 读取需要的列，按序列化器的
+字段预先编译好转换函数，逐行构造与序列化器输出完全一致的字典。
+计算字段由行构造器的 build_<字段名> 方法生成。
+"""
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class UnsupportedField(Exception):
+    """行构造器无法生成该字段，调用方应退回到序列化器"""
+
+
+def split_lines(value):
+    """按换行拆分并去除空白项"""
+    if value:
+        return [item.strip() for item in value.split('\n') if item.strip()]
+    return []
+
+
+def split_commas(value):
+    """按逗号拆分并去除空白项"""
+    if value:
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return []
+
+
+def _iso_datetime(value):
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _iso_date(value):
+    return value.isoformat()
+
+
+def compile_transform(field):
+    """
+    为序列化器字段生成转换函数（值为 None 时由调用方直接输出 None）。
+
+    常见字段用等价的快速实现，其余字段使用字段自身的 to_representation。
+    """
+    if isinstance(field, serializers.ChoiceField):
+        return field.to_representation
+    if isinstance(field, serializers.CharField):
+        return str
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.BooleanField):
+        return field.to_representation
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        # 启用时区时需要 enforce_timezone，交给字段处理
+        if not settings.USE_TZ and output_format and output_format.lower() == 'iso-8601':
+            return _iso_datetime
+        return field.to_representation
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format and output_format.lower() == 'iso-8601':
+            return _iso_date
+        return field.to_representation
+    return field.to_representation
+
+
+class RowBuilder:
+    """
+    由 values() 行构造序列化器输出的基类。
+
+    serializer_class: 对照的序列化器，输出字段及顺序与之一致
+    computed_columns: 计算字段 -> 依赖的列（或注解）
+    always_columns: 总是读取的列（如分页游标需要的排序字段）
+    """
+
+    serializer_class = None
+    computed_columns = {}
+    always_columns = ('id',)
+
+    def __init__(self, context=None):
+        serializer = self.serializer_class(context=context or {})
+        model = serializer.Meta.model
+        column_names = {field.name for field in model._meta.concrete_fields}
+        column_names.update(field.attname for field in model._meta.concrete_fields)
+
+        self.steps = []
+        columns = list(self.always_columns)
+        for name, field in serializer.fields.items():
+            build = getattr(self, f'build_{name}', None)
+            if build is not None:
+                self.steps.append((name, build, None))
+                columns.extend(self.computed_columns.get(name, []))
+                continue
+            if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+                raise UnsupportedField(name)
+            if field.source not in column_names:
+                raise UnsupportedField(name)
+            self.steps.append((name, field.source, compile_transform(field)))
+            columns.append(field.source)
+
+        self.field_names = [name for name, _, _ in self.steps]
+        self.columns = list(dict.fromkeys(columns))
+
+    def wants(self, name):
+        return name in self.field_names
+
+    def prepare(self, rows):
+        """批量加载关联数据，由子类实现"""
+
+    def build(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        steps = self.steps
+        results = []
+        for row in rows:
+            item = {}
+            for name, source, transform in steps:
+                if transform is None:
+                    item[name] = source(row)
+                else:
+                    value = row[source]
+                    item[name] = None if value is None else transform(value)
+            results.append(item)
+        return results
+
+
+class FastListMixin:
+    """
+    视图集 list 动作的快速渲染路径。
+
+    JSON 请求且行构造器支持所选字段时，用 values() + 行构造器代替序列化器；
+    否则走原来的序列化器。
+    """
+
+    fast_row_builder_class = None
+
+    def list(self, request, *args, **kwargs):
+        builder = self.get_fast_row_builder(request)
+        if builder is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        rows = queryset.values(*builder.columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(builder.build(page))
+        return Response(builder.build(rows))
+
+    def get_fast_row_builder(self, request):
+        if not getattr(settings, 'FAST_LIST_RENDERING', True) or self.fast_row_builder_class is None:
+            return None
+        if getattr(request.accepted_renderer, 'format', None) != 'json':
+            return None
+        if self.get_serializer_class() is not self.fast_row_builder_class.serializer_class:
+            return None
+        try:
+            return self.fast_row_builder_class(context=self.get_serializer_context())
+        except UnsupportedField:
+            return None
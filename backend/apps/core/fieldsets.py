@@ -0,0 +1,85 @@
+"""
+Sparse fieldsets for DRF serializers.
+
+支持 ?fields=a,b,c 和 ?omit=x,y 选择输出字段，fields 中可以使用
+Meta.field_presets 定义的预设名称（如 card）。所选字段同时用于裁剪查询：
+没有被任何输出字段用到的 TextField 通过 defer() 不再读取。
+"""
+
+from django.db import models
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_param(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def get_requested_fields(serializer_class, query_params):
+    """
+    解析请求选择的输出字段。
+
+    未指定 fields/omit 时返回 None（输出全部字段）；未知字段名被忽略，
+    id 始终保留。
+    """
+    requested = split_param(query_params.get(FIELDS_PARAM))
+    omitted = split_param(query_params.get(OMIT_PARAM))
+    if not requested and not omitted:
+        return None
+
+    meta = serializer_class.Meta
+    available = list(meta.fields)
+    presets = getattr(meta, 'field_presets', {})
+
+    if requested:
+        selected = set()
+        for name in requested:
+            selected.update(presets.get(name, [name]))
+        selected &= set(available)
+    else:
+        selected = set(available)
+    selected -= set(omitted)
+    selected.add('id')
+    return selected
+
+
+def get_required_columns(serializer_class, fields):
+    """所选输出字段需要读取的模型列"""
+    sources = getattr(serializer_class.Meta, 'field_sources', {})
+    columns = set()
+    for name in fields:
+        columns.update(sources.get(name, [name]))
+    return columns
+
+
+def defer_unused_columns(queryset, serializer_class, fields):
+    """defer 所选输出字段用不到的 TextField"""
+    if fields is None:
+        return queryset
+    required = get_required_columns(serializer_class, fields)
+    deferred = [
+        field.name for field in queryset.model._meta.concrete_fields
+        if isinstance(field, models.TextField) and field.name not in required
+    ]
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    根据请求的 fields/omit 参数裁剪输出字段。
+
+    Meta.field_presets: 预设名称 -> 字段列表
+    Meta.field_sources: 计算字段 -> 依赖的模型列（默认与字段同名）
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        query_params = getattr(self.context.get('request'), 'query_params', None)
+        if query_params is None:
+            return
+        selected = get_requested_fields(type(self), query_params)
+        if selected is None:
+            return
+        for name in set(self.fields) - selected:
+            self.fields.pop(name)
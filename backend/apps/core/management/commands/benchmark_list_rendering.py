@@ -0,0 +1,89 @@
+"""
+Django management command to benchmark the fast list rendering path.
+
+对比序列化器 + JSONRenderer 与 values() 行构造器 + orjson 渲染同一页数据的耗时，
+并校验两者输出的字节完全一致。
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.actresses.views import ActressViewSet
+from apps.movies.views import MovieViewSet
+
+ENDPOINTS = {
+    'movies': ('/api/movies/', MovieViewSet),
+    'actresses': ('/api/actresses/', ActressViewSet),
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark serializer rendering against the fast values() + orjson path'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint',
+            choices=sorted(ENDPOINTS),
+            nargs='+',
+            default=sorted(ENDPOINTS),
+            help='Endpoints to benchmark'
+        )
+        parser.add_argument('--page-size', type=int, default=100, help='Items per page')
+        parser.add_argument('--repeat', type=int, default=20, help='Requests per path')
+        parser.add_argument(
+            '--query',
+            type=str,
+            default='',
+            help='Extra query string, e.g. "fields=card"'
+        )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        failed = False
+
+        for name in options['endpoint']:
+            path, viewset = ENDPOINTS[name]
+            url = f'{path}?page_size={options["page_size"]}'
+            if options['query']:
+                url = f'{url}&{options["query"]}'
+            view = viewset.as_view({'get': 'list'})
+
+            serializer_ms, serializer_body = self.run(
+                factory, view, url, options['repeat'], fast=False
+            )
+            fast_ms, fast_body = self.run(factory, view, url, options['repeat'], fast=True)
+
+            identical = serializer_body == fast_body
+            failed = failed or not identical
+            self.stdout.write(self.style.MIGRATE_HEADING(url))
+            self.stdout.write(f'  serializer + json    median {serializer_ms:8.2f} ms')
+            self.stdout.write(f'  values() + orjson    median {fast_ms:8.2f} ms')
+            self.stdout.write(
+                f'  speedup {serializer_ms / fast_ms:.2f}x, '
+                f'{len(fast_body)} bytes, identical output: {identical}'
+            )
+
+        if failed:
+            raise CommandError('Fast path output differs from the serializer output')
+
+    def run(self, factory, view, url, repeat, fast):
+        """返回 (耗时中位数, 响应体)，计时包含查询、序列化和渲染"""
+        timings = []
+        body = None
+        with override_settings(FAST_LIST_RENDERING=fast, RESPONSE_CACHE_ENABLED=False):
+            for _ in range(repeat):
+                request = factory.get(url, HTTP_ACCEPT='application/json')
+                started = time.perf_counter()
+                response = view(request)
+                if not fast:
+                    # 原来的渲染方式：标准库 json
+                    response.accepted_renderer = JSONRenderer()
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+                body = response.content
+        return statistics.median(timings), body
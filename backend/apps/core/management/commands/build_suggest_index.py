@@ -0,0 +1,33 @@
+"""
+Django management command to build the typeahead index snapshot.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.suggest import build_index, get_snapshot_path, save_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Build the typeahead (suggest) index and write its snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=str,
+            default=None,
+            help='Snapshot file path (defaults to SUGGEST_SNAPSHOT_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or get_snapshot_path()
+
+        started = time.perf_counter()
+        index = build_index()
+        save_snapshot(index, path)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Wrote {len(index)} entries to {path} in {elapsed:.2f}s')
+        )
@@ -0,0 +1,32 @@
+"""
+Django management command to rebuild the denormalized relation counters.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.relation_counters import RELATION_COUNTERS
+
+
+class Command(BaseCommand):
+    help = 'Recount tag, category and actress movie counters with one grouped query per counter'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--counter',
+            nargs='+',
+            help=f'Only these counters: {", ".join(c.name for c in RELATION_COUNTERS)}'
+        )
+
+    def handle(self, *args, **options):
+        counters = RELATION_COUNTERS
+        if options['counter']:
+            counters = [c for c in RELATION_COUNTERS if c.name in options['counter']]
+            unknown = set(options['counter']) - {c.name for c in counters}
+            if unknown:
+                raise CommandError(f'Unknown counters: {", ".join(sorted(unknown))}')
+
+        for counter in counters:
+            fixed = counter.reconcile()
+            self.stdout.write(f'{counter.name}: fixed {fixed} rows')
+
+        self.stdout.write(self.style.SUCCESS('Successfully reconciled relation counters'))
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_label", models.CharField(max_length=50, verbose_name="模型")),
+                ("object_id", models.BigIntegerField(verbose_name="对象ID")),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("create", "创建"), ("update", "更新"), ("delete", "删除")],
+                        max_length=10,
+                        verbose_name="变更类型",
+                    ),
+                ),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        verbose_name="变更时间",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "变更日志",
+                "verbose_name_plural": "变更日志",
+                "db_table": "change_log",
+                "ordering": ["id"],
+            },
+        ),
+    ]
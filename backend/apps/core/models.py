@@ -0,0 +1,39 @@
+"""
+Core models for AVBook application.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeAction(models.TextChoices):
+    """变更类型"""
+    CREATE = 'create', '创建'
+    UPDATE = 'update', '更新'
+    DELETE = 'delete', '删除'
+
+
+class ChangeLogEntry(models.Model):
+    """
+    变更日志（只追加）
+
+    模型写入的事务提交后追加一条记录，自增主键即变更流的游标。
+    删除以 delete 记录（墓碑）表示，旧记录按保留期限定时清理。
+    """
+
+    model_label = models.CharField(max_length=50, verbose_name='模型')
+    object_id = models.BigIntegerField(verbose_name='对象ID')
+    action = models.CharField(
+        max_length=10,
+        choices=ChangeAction.choices,
+        verbose_name='变更类型'
+    )
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='变更时间')
+
+    class Meta:
+        db_table = 'change_log'
+        verbose_name = '变更日志'
+        verbose_name_plural = '变更日志'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.model_label}:{self.object_id}"
@@ -0,0 +1,85 @@
+"""
+Per-request time budget for database queries.
+
+一个请求内的多条查询共享一个时间预算：每条查询执行前把剩余时间设置为数据库的
+语句超时（MySQL max_execution_time / SQLite 进度回调），超时的查询被数据库中断，
+调用方据此返回部分结果而不是一直等待。
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.db import OperationalError, connection, transaction
+
+# MySQL: Query execution was interrupted, maximum statement execution time exceeded
+MYSQL_TIMEOUT_ERROR = 3024
+
+# SQLite 每执行多少条虚拟机指令检查一次是否超时
+SQLITE_PROGRESS_STEPS = 10000
+
+
+class QueryBudgetExceeded(Exception):
+    """时间预算已用完，或查询因超时被数据库中断"""
+
+
+def is_timeout_error(error):
+    if connection.vendor == 'mysql':
+        return bool(error.args) and error.args[0] == MYSQL_TIMEOUT_ERROR
+    if connection.vendor == 'sqlite':
+        return 'interrupted' in str(error)
+    return False
+
+
+class QueryBudget:
+    """
+    用法：
+
+        budget = QueryBudget(500)
+        with budget.limit():
+            rows = list(queryset)
+    """
+
+    def __init__(self, milliseconds):
+        self.deadline = time.monotonic() + milliseconds / 1000
+
+    def remaining_ms(self):
+        return max(int((self.deadline - time.monotonic()) * 1000), 0)
+
+    @contextmanager
+    def limit(self):
+        """在剩余时间内执行块中的查询，超时抛出 QueryBudgetExceeded"""
+        remaining = self.remaining_ms()
+        if remaining <= 0:
+            raise QueryBudgetExceeded()
+        try:
+            # 放在保存点中，超时错误不会破坏外层事务
+            with transaction.atomic(), self.statement_timeout(remaining):
+                yield
+        except OperationalError as e:
+            if is_timeout_error(e):
+                raise QueryBudgetExceeded() from e
+            raise
+
+    @contextmanager
+    def statement_timeout(self, milliseconds):
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                # 只对只读 SELECT 生效
+                cursor.execute('SET SESSION max_execution_time = %s', [milliseconds])
+            try:
+                yield
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET SESSION max_execution_time = DEFAULT')
+        elif connection.vendor == 'sqlite':
+            connection.ensure_connection()
+            deadline = self.deadline
+            connection.connection.set_progress_handler(
+                lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS
+            )
+            try:
+                yield
+            finally:
+                connection.connection.set_progress_handler(None, 0)
+        else:
+            yield
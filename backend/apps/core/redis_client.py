@@ -0,0 +1,53 @@
+"""
+Shared Redis client.
+
+Redis 不可用时返回 None，调用方需要自行降级；连接失败后在一段时间内
+不再重试，避免每个请求都等待连接超时。
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_INTERVAL = 30
+
+_client = None
+_failed_at = None
+
+
+def get_redis_client():
+    """获取 Redis 客户端，不可用时返回 None"""
+    global _client, _failed_at
+
+    if _client is not None:
+        return _client
+    if _failed_at is not None and time.monotonic() - _failed_at < RETRY_INTERVAL:
+        return None
+
+    try:
+        import redis
+
+        client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        client.ping()
+    except Exception as e:
+        logger.warning('Redis unavailable: %s', e)
+        _failed_at = time.monotonic()
+        return None
+
+    _client = client
+    _failed_at = None
+    return _client
+
+
+def mark_redis_failed():
+    """调用方遇到连接错误时调用，进入重试冷却期"""
+    global _client, _failed_at
+    _client = None
+    _failed_at = time.monotonic()
@@ -0,0 +1,227 @@
+"""
+Denormalized counters for many-to-many relations.
+
+标签、分类、女友作品数等用计数列保存关联对象的数量，列表和后台直接读取该列。
+关联表的增删（m2m_changed）和关联对象的删除在同一事务中增量更新计数；
+条件计数（如只统计有效的磁力链接）在条件字段变化时同样增减。
+信号覆盖不到的批量写入由 reconcile_relation_counters 命令用分组查询修正。
+计数列只通过 F() 表达式更新，模型混入 CounterFieldsMixin 后完整保存不会把实例上的旧值写回。
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.signals import m2m_changed, post_init, post_save, pre_delete
+
+from .response_cache import bump_generation
+
+
+class CounterFieldsMixin:
+    """
+    counter_fields 中的计数列由 RelationCounter 在数据库中增减，实例上的值可能已经过期；
+    完整保存已存在的对象时不写这些列，需要写入时在 update_fields 中显式列出。
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert')
+            and not self._state.adding and self.pk is not None
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class RelationCounter:
+    """
+    owner_label: 保存计数的模型，如 'movies.MovieTag'
+    relation: owner 上的多对多字段或反向关系名，如 'movies'
+    counter_field: 计数列
+    condition: 只统计满足条件的关联对象，如 {'is_active': True}
+    """
+
+    def __init__(self, owner_label, relation, counter_field, condition=None):
+        self.owner_label = owner_label
+        self.relation = relation
+        self.counter_field = counter_field
+        self.condition = condition or {}
+
+    @property
+    def name(self):
+        return f'{self.owner_label}.{self.counter_field}'
+
+    def resolve(self):
+        """解析关联表及其两侧的列名（在 apps 加载完成后调用）"""
+        self.owner = apps.get_model(self.owner_label)
+        field = self.owner._meta.get_field(self.relation)
+        if field.many_to_many and not field.auto_created:
+            # owner 上定义的多对多字段
+            self.through = field.remote_field.through
+            self.owner_column = field.m2m_column_name()
+            self.other_field = field.m2m_reverse_field_name()
+            self.other_column = field.m2m_reverse_name()
+        else:
+            # 反向关系，多对多字段定义在另一侧
+            self.through = field.through
+            self.owner_column = field.field.m2m_reverse_name()
+            self.other_field = field.field.m2m_field_name()
+            self.other_column = field.field.m2m_column_name()
+        self.other = field.related_model
+
+    def matches(self, obj):
+        return all(getattr(obj, name) == value for name, value in self.condition.items())
+
+    def adjust(self, owner_ids, delta):
+        """计数增减 delta，减少时不低于 0"""
+        if not owner_ids or not delta:
+            return
+        counter = self.counter_field
+        if delta > 0:
+            value = F(counter) + delta
+        else:
+            value = Case(
+                When(**{f'{counter}__gte': -delta}, then=F(counter) + delta),
+                default=Value(0)
+            )
+        self.owner.objects.filter(pk__in=owner_ids).update(**{counter: value})
+        self.bump_owner_generation()
+
+    def bump_owner_generation(self):
+        """queryset update() 不触发信号，提交后提升 owner 的响应缓存代数"""
+        label = self.owner_label
+        transaction.on_commit(lambda: bump_generation(label))
+
+    def links(self, **filters):
+        links = self.through.objects.filter(**filters)
+        if self.condition:
+            links = links.filter(**{
+                f'{self.other_field}__{name}': value for name, value in self.condition.items()
+            })
+        return links
+
+    def owner_ids_for(self, other_pk):
+        return list(
+            self.through.objects.filter(**{self.other_column: other_pk})
+            .values_list(self.owner_column, flat=True)
+        )
+
+    def relation_changed(self, sender, instance, action, reverse, model, pk_set, **kwargs):
+        if isinstance(instance, self.owner):
+            self.owner_side_changed(instance, action, pk_set)
+        elif self.matches(instance):
+            self.other_side_changed(instance, action, pk_set)
+
+    def owner_side_changed(self, instance, action, pk_set):
+        if action == 'post_add':
+            if self.condition:
+                count = self.other.objects.filter(pk__in=pk_set, **self.condition).count()
+            else:
+                count = len(pk_set)
+            self.adjust([instance.pk], count)
+        elif action == 'pre_remove':
+            # pk_set 可能包含并不存在的关联，按关联表实际的行数减少
+            count = self.links(**{
+                self.owner_column: instance.pk, f'{self.other_column}__in': pk_set
+            }).count()
+            self.adjust([instance.pk], -count)
+        elif action == 'post_clear':
+            self.owner.objects.filter(pk=instance.pk).update(**{self.counter_field: 0})
+            self.bump_owner_generation()
+        else:
+            return
+        # 手中的实例读回数据库中的计数，之后的保存和序列化都不会用到旧值
+        instance.refresh_from_db(fields=[self.counter_field])
+
+    def other_side_changed(self, instance, action, pk_set):
+        if action == 'post_add':
+            self.adjust(list(pk_set), 1)
+        elif action == 'pre_remove':
+            owner_ids = list(
+                self.through.objects.filter(**{
+                    self.other_column: instance.pk, f'{self.owner_column}__in': pk_set
+                }).values_list(self.owner_column, flat=True)
+            )
+            self.adjust(owner_ids, -1)
+        elif action == 'pre_clear':
+            self.adjust(self.owner_ids_for(instance.pk), -1)
+
+    def other_deleted(self, sender, instance, **kwargs):
+        """关联对象删除时关联表的行被级联删除，不会触发 m2m_changed"""
+        if self.matches(instance):
+            self.adjust(self.owner_ids_for(instance.pk), -1)
+
+    def other_loaded(self, sender, instance, **kwargs):
+        instance.__dict__[self.snapshot_attr] = self.matches_loaded(instance)
+
+    def matches_loaded(self, instance):
+        """加载时是否满足条件；条件字段被 defer 时无法判断，返回 None"""
+        if any(name not in instance.__dict__ for name in self.condition):
+            return None
+        return all(instance.__dict__[name] == value for name, value in self.condition.items())
+
+    @property
+    def snapshot_attr(self):
+        return f'_relation_counter_{self.owner._meta.model_name}_{self.counter_field}'
+
+    def other_saved(self, sender, instance, created, raw=False, **kwargs):
+        """条件字段变化时增减计数"""
+        matched = self.matches(instance)
+        previous = instance.__dict__.get(self.snapshot_attr)
+        instance.__dict__[self.snapshot_attr] = matched
+        if raw or created or previous is None or previous == matched:
+            return
+        self.adjust(self.owner_ids_for(instance.pk), 1 if matched else -1)
+
+    def connect(self):
+        self.resolve()
+        uid = f'relation_counter_{self.name}'
+        m2m_changed.connect(self.relation_changed, sender=self.through, dispatch_uid=uid)
+        pre_delete.connect(self.other_deleted, sender=self.other, dispatch_uid=uid)
+        if self.condition:
+            post_init.connect(self.other_loaded, sender=self.other, dispatch_uid=uid)
+            post_save.connect(self.other_saved, sender=self.other, dispatch_uid=uid)
+
+    def reconcile(self, owner_ids=None):
+        """用一次分组查询重算计数（owner_ids 为空时处理全部），返回修正的行数"""
+        links = self.links()
+        owners = self.owner.objects.only('id', self.counter_field)
+        if owner_ids is not None:
+            links = links.filter(**{f'{self.owner_column}__in': owner_ids})
+            owners = owners.filter(pk__in=owner_ids)
+        counts = dict(
+            links.values(self.owner_column)
+            .annotate(count=Count('pk'))
+            .values_list(self.owner_column, 'count')
+        )
+        changed = []
+        for owner in owners.iterator():
+            count = counts.get(owner.pk, 0)
+            if getattr(owner, self.counter_field) != count:
+                setattr(owner, self.counter_field, count)
+                changed.append(owner)
+        self.owner.objects.bulk_update(changed, [self.counter_field], batch_size=1000)
+        if changed:
+            self.bump_owner_generation()
+        return len(changed)
+
+
+RELATION_COUNTERS = [
+    RelationCounter('movies.MovieTag', 'movies', 'movie_count'),
+    RelationCounter('actresses.ActressTag', 'actresses', 'actress_count'),
+    RelationCounter('magnets.MagnetCategory', 'magnets', 'magnet_count', {'is_active': True}),
+    RelationCounter('actresses.Actress', 'movies', 'movie_count'),
+]
+
+
+def get_relation_counter(name):
+    """按名称（如 'actresses.Actress.movie_count'）查找计数器"""
+    for counter in RELATION_COUNTERS:
+        if counter.name == name:
+            return counter
+    raise KeyError(name)
@@ -0,0 +1,44 @@
+"""
+Custom renderers for AVBook API.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 是可选依赖
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    使用 orjson 编码的 JSON 渲染器。
+
+    输出与 JSONRenderer 的紧凑格式一致；需要缩进、ASCII 转义，或 orjson
+    不可用/无法编码时退回到 JSONRenderer。
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # 与 JSONRenderer 一致，转义 U+2028 / U+2029
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,223 @@
+"""
+Versioned response cache for DRF viewsets.
+
+缓存 key 由视图、动作、协议和 Host、路径、规范化后的查询参数和所依赖模型的代数（generation）组成。
+只缓存匿名请求的 JSON 响应：可浏览 API 页面包含当前用户，登录用户的响应可能因人而异。
+模型写入时信号只需把该模型的代数加一，旧的缓存条目不再被命中，随 TTL 自然过期。
+缓存内容是渲染后的响应体，较大的响应体以 gzip 压缩存储。
+"""
+
+import gzip
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'respcache'
+METRIC_EVENTS = ('hit', 'miss')
+
+# 使用响应缓存的视图名称（定义视图类时注册），用于汇总命中率
+_registered_views = set()
+
+
+def get_cache_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def is_enabled():
+    return getattr(settings, 'RESPONSE_CACHE_ENABLED', True)
+
+
+def get_gzip_min_bytes():
+    """超过该大小的响应体压缩存储，0 表示不压缩"""
+    return getattr(settings, 'RESPONSE_CACHE_GZIP_MIN_BYTES', 1024)
+
+
+def generation_key(label):
+    return f'{KEY_PREFIX}:gen:{label}'
+
+
+def get_generations(labels):
+    """读取一组模型的代数，缺失的代数以当前时间初始化"""
+    keys = {generation_key(label): label for label in labels}
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            # 代数被淘汰后不能从 1 重新计数，否则可能命中淘汰前的旧条目
+            cache.add(key, int(time.time() * 1000), None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+def bump_generation(label):
+    """模型数据变化时调用，使依赖该模型的缓存全部失效"""
+    key = generation_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+    except Exception as e:
+        logger.warning('Failed to bump response cache generation for %s: %s', label, e)
+
+
+def normalize_query(query_params):
+    """规范化查询参数：按参数名排序，丢弃空值"""
+    items = []
+    for name in sorted(query_params.keys()):
+        for value in query_params.getlist(name):
+            if value != '':
+                items.append((name, value))
+    return urlencode(items)
+
+
+def record_metric(view_name, event):
+    key = f'{KEY_PREFIX}:metrics:{view_name}:{event}'
+    try:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+    except Exception as e:
+        logger.warning('Failed to record response cache metric: %s', e)
+
+
+def get_metrics():
+    """各视图的命中/未命中次数与命中率"""
+    keys = {
+        f'{KEY_PREFIX}:metrics:{view_name}:{event}': (view_name, event)
+        for view_name in sorted(_registered_views)
+        for event in METRIC_EVENTS
+    }
+    values = cache.get_many(keys)
+    metrics = {}
+    for key, (view_name, event) in keys.items():
+        metrics.setdefault(view_name, {})[event] = values.get(key, 0)
+    for data in metrics.values():
+        total = data['hit'] + data['miss']
+        data['hit_rate'] = round(data['hit'] / total, 4) if total else None
+    return metrics
+
+
+def reset_metrics():
+    cache.delete_many([
+        f'{KEY_PREFIX}:metrics:{view_name}:{event}'
+        for view_name in _registered_views
+        for event in METRIC_EVENTS
+    ])
+
+
+class CachedResponseMixin:
+    """
+    为视图集的 list/retrieve 提供响应缓存。
+
+    子类通过 cache_dependencies 声明响应依赖的模型（app_label.ModelName），
+    这些模型的代数由 apps.core.signals 中的信号维护。
+    """
+
+    cache_dependencies = ()
+    cached_actions = ('list', 'retrieve')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _registered_views.add(f'{cls.__module__}.{cls.__name__}')
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().retrieve, *args, **kwargs)
+
+    def get_cache_dependencies(self):
+        return self.cache_dependencies
+
+    def get_cache_view_name(self):
+        return f'{self.__class__.__module__}.{self.__class__.__name__}'
+
+    def is_cacheable_request(self, request):
+        """只缓存匿名请求的 JSON 响应"""
+        if getattr(request.accepted_renderer, 'format', None) != 'json':
+            return False
+        return not request.user.is_authenticated
+
+    def get_response_cache_key(self, request):
+        generations = get_generations(self.get_cache_dependencies())
+        raw = '|'.join([
+            # 分页链接是绝对 URL，随协议和 Host 变化
+            request.scheme,
+            request.get_host(),
+            request.path,
+            normalize_query(request.query_params),
+            request.accepted_renderer.format,
+            ','.join(str(generation) for generation in generations),
+            # ConditionalResponseMixin 计算的校验值（含行级校验值）
+            getattr(self, 'response_etag', None) or '',
+        ])
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return f'{KEY_PREFIX}:{self.get_cache_view_name()}:{self.action}:{digest}'
+
+    def get_cached_response(self, request, handler, *args, **kwargs):
+        if (
+            not is_enabled() or self.action not in self.cached_actions
+            or request.method != 'GET' or not self.is_cacheable_request(request)
+        ):
+            return handler(request, *args, **kwargs)
+
+        view_name = self.get_cache_view_name()
+        try:
+            key = self.get_response_cache_key(request)
+            entry = cache.get(key)
+        except Exception as e:
+            logger.warning('Response cache unavailable: %s', e)
+            return handler(request, *args, **kwargs)
+
+        if entry is not None:
+            record_metric(view_name, 'hit')
+            return self.build_cached_response(request, entry)
+
+        record_metric(view_name, 'miss')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(lambda rendered: self.store_response(key, rendered))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def store_response(self, key, response):
+        """渲染完成后写入缓存"""
+        body = response.content
+        compressed = False
+        min_bytes = get_gzip_min_bytes()
+        if min_bytes and len(body) >= min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            compressed = True
+        entry = {
+            'body': body,
+            'compressed': compressed,
+            'content_type': response['Content-Type'],
+        }
+        try:
+            cache.set(key, entry, get_cache_timeout())
+        except Exception as e:
+            logger.warning('Failed to store cached response: %s', e)
+
+    def build_cached_response(self, request, entry):
+        """
+        由缓存条目构造响应。
+
+        客户端接受 gzip 时直接返回压缩后的内容，省去解压。
+        """
+        body = entry['body']
+        response = HttpResponse(content_type=entry['content_type'])
+        if entry['compressed']:
+            patch_vary_headers(response, ('Accept-Encoding',))
+            if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+                response['Content-Encoding'] = 'gzip'
+            else:
+                body = gzip.decompress(body)
+        response.content = body
+        response['X-Cache'] = 'HIT'
+        return response
@@ -0,0 +1,107 @@
+"""
+Signal handlers for core app.
+
+模型写入时提升响应缓存的代数，使依赖该模型的缓存条目失效；
+影片、演员、磁力链接的写入同时追加到变更日志；多对多关系的计数列增量维护。
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .changes import FEED_M2M_FIELDS, FEED_MODELS, record_change
+from .models import ChangeAction
+from .relation_counters import RELATION_COUNTERS
+from .response_cache import bump_generation
+
+# 参与响应缓存失效的模型
+CACHED_MODELS = [
+    'movies.Movie',
+    'movies.MovieTag',
+    'movies.MovieRating',
+    'actresses.Actress',
+    'actresses.ActressTag',
+    'magnets.MagnetLink',
+    'magnets.MagnetCategory',
+    'magnets.DownloadHistory',
+]
+
+# 多对多关系：(模型, 字段)
+CACHED_M2M_FIELDS = [
+    ('movies.Movie', 'actresses'),
+    ('movies.MovieTag', 'movies'),
+    ('actresses.ActressTag', 'actresses'),
+    ('magnets.MagnetCategory', 'magnets'),
+]
+
+
+def bump_on_commit(*labels):
+    """事务提交后再提升代数，避免提交前读到旧数据的请求写入新代数的缓存"""
+    transaction.on_commit(lambda: [bump_generation(label) for label in labels])
+
+
+def model_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    bump_on_commit(sender._meta.label)
+
+
+def relation_changed(sender, instance, action, model, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    bump_on_commit(instance._meta.label, model._meta.label)
+
+
+def log_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    action = ChangeAction.CREATE if created else ChangeAction.UPDATE
+    record_change(sender._meta.label, instance.pk, action)
+
+
+def log_deleted(sender, instance, **kwargs):
+    record_change(sender._meta.label, instance.pk, ChangeAction.DELETE)
+
+
+def log_relation_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """关系变化时记录正向一侧的对象更新"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        record_change(instance._meta.label, instance.pk, ChangeAction.UPDATE)
+        return
+    if action == 'pre_clear':
+        # 反向清空时 pk_set 为空，先从关联表读取受影响的对象
+        pk_set = sender.objects.filter(
+            **{f'{instance._meta.model_name}_id': instance.pk}
+        ).values_list(f'{model._meta.model_name}_id', flat=True)
+    for pk in pk_set or ():
+        record_change(model._meta.label, pk, ChangeAction.UPDATE)
+
+
+def connect_signals():
+    for label in CACHED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(model_changed, sender=model, dispatch_uid=f'respcache_save_{label}')
+        post_delete.connect(model_changed, sender=model, dispatch_uid=f'respcache_delete_{label}')
+
+    for label, field_name in CACHED_M2M_FIELDS:
+        through = apps.get_model(label)._meta.get_field(field_name).remote_field.through
+        m2m_changed.connect(
+            relation_changed, sender=through, dispatch_uid=f'respcache_m2m_{label}_{field_name}'
+        )
+
+    for label in FEED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(log_saved, sender=model, dispatch_uid=f'changelog_save_{label}')
+        post_delete.connect(log_deleted, sender=model, dispatch_uid=f'changelog_delete_{label}')
+
+    for label, field_name in FEED_M2M_FIELDS:
+        through = apps.get_model(label)._meta.get_field(field_name).remote_field.through
+        m2m_changed.connect(
+            log_relation_changed, sender=through,
+            dispatch_uid=f'changelog_m2m_{label}_{field_name}'
+        )
+
+    for counter in RELATION_COUNTERS:
+        counter.connect()
@@ -0,0 +1,385 @@
+"""
+In-memory typeahead index for movies, actresses and studios.
+
+每种类型一个排序数组，用 bisect 做前缀查找。进程启动时从快照文件加载
+（没有快照时在后台构建，构建完成前返回空结果），之后按 updated_at 增量刷新；删除的数据由定期全量重建的快照清理，
+运行中的进程在刷新时发现更新的快照会重新加载。
+"""
+
+import bisect
+import heapq
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+KIND_MOVIE = 'movie'
+KIND_ACTRESS = 'actress'
+KIND_STUDIO = 'studio'
+KINDS = (KIND_MOVIE, KIND_ACTRESS, KIND_STUDIO)
+
+ALIAS_SEPARATORS = re.compile(r'[,，、/;；|]')
+SNAPSHOT_VERSION = 2
+
+
+def normalize_key(text):
+    """归一化：全角转半角、大小写折叠、片假名转平假名，只保留字母数字"""
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    chars = []
+    for ch in text:
+        if 'ァ' <= ch <= 'ヶ':
+            ch = chr(ord(ch) - 0x60)
+        if ch.isalnum():
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def actress_labels(name, name_en, alias):
+    """演员可被检索的名称：姓名、英文名、别名"""
+    labels = [name, name_en]
+    labels.extend(ALIAS_SEPARATORS.split(alias or ''))
+    return [label.strip() for label in labels if label and label.strip()]
+
+
+class PrefixIndex:
+    """
+    排序数组前缀索引，条目为 (key, kind, id, label) 元组。
+
+    每种类型各有一个排序数组，按类型过滤时只扫描对应的数组。
+    """
+
+    def __init__(self, entries=(), watermarks=None, lists=None):
+        if lists is None:
+            lists = {kind: [] for kind in KINDS}
+            for entry in set(entries):
+                lists[entry[1]].append(entry)
+            for kind_entries in lists.values():
+                kind_entries.sort()
+        self.lists = {kind: lists.get(kind, []) for kind in KINDS}
+        self.watermarks = dict(watermarks or {})
+        self.built_at = time.time()
+        self.refreshed_at = self.built_at
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.lists.values())
+
+    def lookup(self, query, limit=10, kinds=None):
+        """前缀查找，返回去重后的条目，较短的 key 优先"""
+        prefix = normalize_key(query)
+        if not prefix:
+            return []
+
+        candidates = []
+        seen = set()
+        # 每种类型多取一些候选再按长度排序，保证短词优先；
+        # 数组中只有该类型的条目，跳过的只是同一对象的重复名称，扫描量有界
+        budget = limit * 5
+        for kind in kinds or KINDS:
+            entries = self.lists.get(kind, ())
+            accepted = 0
+            for i in range(bisect.bisect_left(entries, (prefix,)), len(entries)):
+                entry = entries[i]
+                if not entry[0].startswith(prefix) or accepted >= budget:
+                    break
+                ident = (kind, entry[2] if entry[2] is not None else entry[3])
+                if ident in seen:
+                    continue
+                seen.add(ident)
+                candidates.append(entry)
+                accepted += 1
+
+        candidates.sort(key=lambda entry: (len(entry[0]), entry))
+        return [
+            {'type': kind, 'id': pk, 'label': label}
+            for key, kind, pk, label in candidates[:limit]
+        ]
+
+    def replace(self, kind, ids, new_entries):
+        """
+        替换指定 kind/id 的条目，返回新的索引。
+
+        写时复制，读取方无需加锁；保留的条目与排序后的新条目一次归并。
+        """
+        ids = set(ids)
+        kept = [entry for entry in self.lists[kind] if entry[2] not in ids]
+        return self._derive(kind, list(heapq.merge(kept, sorted(set(new_entries)))))
+
+    def add_missing(self, new_entries):
+        """添加尚不存在的条目（用于制作商），没有新增时返回自身"""
+        new_entries = set(new_entries)
+        index = self
+        for kind in KINDS:
+            entries = index.lists[kind]
+            missing = []
+            for entry in sorted(entry for entry in new_entries if entry[1] == kind):
+                i = bisect.bisect_left(entries, entry)
+                if i == len(entries) or entries[i] != entry:
+                    missing.append(entry)
+            if missing:
+                index = index._derive(kind, list(heapq.merge(entries, missing)))
+        return index
+
+    def _derive(self, kind, entries):
+        lists = dict(self.lists)
+        lists[kind] = entries
+        index = PrefixIndex(watermarks=self.watermarks, lists=lists)
+        index.built_at = self.built_at
+        return index
+
+
+def movie_entries(rows):
+    for pk, censored_id in rows:
+        key = normalize_key(censored_id)
+        if key:
+            yield (key, KIND_MOVIE, pk, censored_id)
+
+
+def actress_entries(rows):
+    for pk, name, name_en, alias in rows:
+        for label in actress_labels(name, name_en, alias):
+            key = normalize_key(label)
+            if key:
+                yield (key, KIND_ACTRESS, pk, label)
+
+
+def studio_entries(names):
+    for name in names:
+        key = normalize_key(name)
+        if key:
+            yield (key, KIND_STUDIO, None, name)
+
+
+def build_index():
+    """从数据库全量构建索引"""
+    from apps.actresses.models import Actress
+    from apps.movies.models import Movie
+
+    started = timezone.now()
+    entries = []
+    entries.extend(movie_entries(
+        Movie.objects.order_by().values_list('id', 'censored_id').iterator(chunk_size=5000)
+    ))
+    entries.extend(actress_entries(
+        Actress.objects.order_by().values_list('id', 'name', 'name_en', 'alias').iterator(chunk_size=5000)
+    ))
+    entries.extend(studio_entries(
+        Movie.objects.exclude(studio='').order_by().values_list('studio', flat=True).distinct()
+    ))
+    # 水位取构建开始时间，构建期间的修改会在下次增量刷新时补上
+    return PrefixIndex(entries, {KIND_MOVIE: started, KIND_ACTRESS: started})
+
+
+def refresh_index(index):
+    """按 updated_at 增量刷新，返回新的索引"""
+    from apps.actresses.models import Actress
+    from apps.movies.models import Movie
+
+    started = timezone.now()
+
+    movie_rows = list(
+        Movie.objects.filter(updated_at__gte=index.watermarks.get(KIND_MOVIE, started))
+        .order_by().values_list('id', 'censored_id', 'studio')
+    )
+    if movie_rows:
+        index = index.replace(
+            KIND_MOVIE,
+            [row[0] for row in movie_rows],
+            movie_entries((pk, censored_id) for pk, censored_id, _ in movie_rows),
+        )
+        index = index.add_missing(studio_entries({row[2] for row in movie_rows if row[2]}))
+
+    actress_rows = list(
+        Actress.objects.filter(updated_at__gte=index.watermarks.get(KIND_ACTRESS, started))
+        .order_by().values_list('id', 'name', 'name_en', 'alias')
+    )
+    if actress_rows:
+        index = index.replace(
+            KIND_ACTRESS, [row[0] for row in actress_rows], actress_entries(actress_rows)
+        )
+
+    index.watermarks = {KIND_MOVIE: started, KIND_ACTRESS: started}
+    index.refreshed_at = time.time()
+    return index
+
+
+def get_snapshot_path():
+    return getattr(
+        settings, 'SUGGEST_SNAPSHOT_PATH', os.path.join(settings.BASE_DIR, 'var', 'suggest_index.pickle')
+    )
+
+
+def save_snapshot(index, path=None):
+    """保存快照（先写临时文件再原子替换）"""
+    path = path or get_snapshot_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        'version': SNAPSHOT_VERSION,
+        'lists': index.lists,
+        'watermarks': index.watermarks,
+    }
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=None):
+    """加载快照，文件不存在或版本不符时返回 None"""
+    path = path or get_snapshot_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except Exception:
+        logger.exception('Failed to load suggest snapshot %s', path)
+        return None
+    if payload.get('version') != SNAPSHOT_VERSION:
+        return None
+    # 快照中的条目已排序，直接使用
+    index = PrefixIndex(watermarks=payload['watermarks'], lists=payload['lists'])
+    index.built_at = index.refreshed_at = os.path.getmtime(path)
+    return index
+
+
+# 索引尚未构建完成时使用的空索引
+EMPTY_INDEX = PrefixIndex()
+
+# 全量构建的进程间锁
+BUILD_LOCK_KEY = 'suggest:build-lock'
+
+
+class SuggestService:
+    """进程内的索引持有者，负责加载与定期增量刷新"""
+
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._snapshot_mtime = None
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'SUGGEST_REFRESH_INTERVAL', 60)
+
+    @property
+    def build_lock_timeout(self):
+        """构建锁的过期时间（秒），需大于一次全量构建的耗时"""
+        return getattr(settings, 'SUGGEST_BUILD_LOCK_TIMEOUT', 600)
+
+    def get_snapshot_mtime(self):
+        try:
+            return os.path.getmtime(get_snapshot_path())
+        except OSError:
+            return None
+
+    def load(self):
+        """进程启动时从快照加载"""
+        mtime = self.get_snapshot_mtime()
+        index = load_snapshot()
+        if index is not None:
+            self._index = index
+            self._snapshot_mtime = mtime
+        return index
+
+    def load_newer_snapshot(self):
+        """快照在加载后被重建过（如 rebuild_suggest_snapshot 任务）时重新加载，否则返回 None"""
+        mtime = self.get_snapshot_mtime()
+        if mtime is None or (self._snapshot_mtime is not None and mtime <= self._snapshot_mtime):
+            return None
+        index = load_snapshot()
+        if index is not None:
+            self._snapshot_mtime = mtime
+        return index
+
+    def get_index(self):
+        """
+        返回当前索引。
+
+        没有快照时不在请求中全量构建：先返回空索引，由后台线程构建并写入快照；
+        进程内和进程间（缓存锁）都只有一个构建者，其他进程在快照写入后直接加载。
+        """
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self.load()
+                index = self._index
+            if index is None:
+                if self._build_lock.acquire(blocking=False):
+                    threading.Thread(target=self._background_build, daemon=True).start()
+                return EMPTY_INDEX
+        if time.time() - index.refreshed_at > self.refresh_interval and not self._lock.locked():
+            # 后台线程刷新，不占用当前请求的时间
+            threading.Thread(target=self._background_refresh, daemon=True).start()
+        return index
+
+    def _background_build(self):
+        try:
+            if not cache.add(BUILD_LOCK_KEY, 1, self.build_lock_timeout):
+                # 其他进程正在构建，之后的请求会加载它写入的快照
+                return
+            try:
+                index = build_index()
+                save_snapshot(index)
+                with self._lock:
+                    self._index = index
+                    self._snapshot_mtime = self.get_snapshot_mtime()
+            finally:
+                cache.delete(BUILD_LOCK_KEY)
+        except Exception:
+            logger.exception('Failed to build suggest index')
+        finally:
+            self._build_lock.release()
+            connections.close_all()
+
+    def _background_refresh(self):
+        try:
+            self.refresh(blocking=False)
+        finally:
+            connections.close_all()
+
+    def refresh(self, blocking=True):
+        """增量刷新；非阻塞模式下已有线程在刷新则直接跳过"""
+        if not self._lock.acquire(blocking=blocking):
+            return
+        try:
+            index = self._index
+            if index is None or (
+                not blocking and time.time() - index.refreshed_at <= self.refresh_interval
+            ):
+                return
+            # 新快照清理了已删除的数据，在它的水位之上增量刷新
+            index = self.load_newer_snapshot() or index
+            self._index = refresh_index(index)
+        except Exception:
+            logger.exception('Failed to refresh suggest index')
+        finally:
+            self._lock.release()
+
+    def _build(self):
+        # 从数据库构建的索引比此前写入的快照新
+        self._snapshot_mtime = time.time()
+        return build_index()
+
+    def rebuild(self):
+        index = self._build()
+        with self._lock:
+            self._index = index
+        return index
+
+    def lookup(self, query, limit=10, kinds=None):
+        return self.get_index().lookup(query, limit=limit, kinds=kinds)
+
+
+suggest_service = SuggestService()
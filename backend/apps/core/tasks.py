@@ -0,0 +1,42 @@
+from celery import shared_task
+
+from .changes import prune_changes
+from .counters import counter_buffer
+from .suggest import build_index, save_snapshot
+
+
+@shared_task
+def rebuild_suggest_snapshot():
+    """
+    全量重建输入联想索引并写入快照；新启动的进程直接加载，运行中的进程在下次增量刷新时加载
+    """
+    index = build_index()
+    save_snapshot(index)
+    return {
+        'status': 'success',
+        'entries': len(index),
+    }
+
+
+@shared_task
+def flush_counters():
+    """
+    把缓冲的浏览、下载、点击计数批量写回数据库
+    """
+    flushed = counter_buffer.flush()
+    return {
+        'status': 'success',
+        'flushed': flushed,
+    }
+
+
+@shared_task
+def prune_change_log():
+    """
+    清理超过保留期限的变更日志
+    """
+    deleted = prune_changes()
+    return {
+        'status': 'success',
+        'deleted': deleted,
+    }
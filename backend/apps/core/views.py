@@ -0,0 +1,85 @@
+"""
+Core views for AVBook API.
+"""
+
+import time
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .changes import CursorExpired, build_changes, get_latest_cursor, read_changes
+from .response_cache import get_metrics, reset_metrics
+from .suggest import KINDS, suggest_service
+
+
+@api_view(['GET'])
+def suggest(request):
+    """输入联想：按前缀匹配影片编号、演员姓名/别名和制作商"""
+    query = request.query_params.get('q', '').strip()
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+    kinds = [
+        kind for kind in request.query_params.get('types', '').split(',') if kind in KINDS
+    ]
+
+    started = time.perf_counter()
+    results = suggest_service.lookup(query, limit=limit, kinds=kinds or None) if query else []
+    took_ms = (time.perf_counter() - started) * 1000
+
+    return Response({
+        'query': query,
+        'results': results,
+        'took_ms': round(took_ms, 3),
+    })
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def cache_metrics(request):
+    """响应缓存命中/未命中统计，DELETE 清零"""
+    if request.method == 'DELETE':
+        reset_metrics()
+    return Response({'views': get_metrics()})
+
+
+@api_view(['GET'])
+def changes(request):
+    """
+    增量同步的变更流
+
+    since 为上次返回的 next_cursor；不带 since 时只返回当前游标，
+    客户端应先全量导出，再从该游标开始同步。
+    只返回已提交高水位之内的变更，较早分配主键、较晚提交的变更不会被越过；
+    例外：写入变更日志后超过 CHANGE_FEED_GAP_TIMEOUT 秒才提交的事务会被视为回滚，
+    其变更不会出现在变更流中（此时变更流是有损的）。
+    """
+    try:
+        limit = min(max(int(request.query_params.get('limit', 500)), 1), 1000)
+    except ValueError:
+        limit = 500
+
+    since = request.query_params.get('since')
+    if since is None:
+        return Response({'changes': [], 'next_cursor': str(get_latest_cursor()), 'has_more': False})
+    try:
+        since = int(since)
+    except ValueError:
+        return Response({'error': '无效的游标'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        entries, next_cursor, has_more = read_changes(since, limit)
+    except CursorExpired:
+        return Response(
+            {'error': '游标已过期，请重新全量同步', 'next_cursor': str(get_latest_cursor())},
+            status=status.HTTP_410_GONE
+        )
+
+    return Response({
+        'changes': build_changes(entries, context={'request': request}),
+        'next_cursor': str(next_cursor),
+        'has_more': has_more,
+    })
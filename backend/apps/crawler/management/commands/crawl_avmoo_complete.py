@@ -716,7 +716,8 @@ class AVMooCompleteCrawler:
             if actress.movie_count != movie_count:
                 actress.movie_count = movie_count
                 actress.popularity_score = min(movie_count * 3, 100)
-                actress.save()
+                # 完整保存不写计数列，需要显式列出
+                actress.save(update_fields=['movie_count', 'popularity_score'])
 
                 # 根据作品数添加标签
                 if movie_count > 20:
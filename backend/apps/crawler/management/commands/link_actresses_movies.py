@@ -6,6 +6,7 @@ import re
 from django.core.management.base import BaseCommand
 from apps.movies.models import Movie
 from apps.actresses.models import Actress, ActressTag
+from apps.actresses.resolver import get_name_resolver, resolve_actress_id
 
 
 class Command(BaseCommand):
@@ -32,6 +33,8 @@ class Command(BaseCommand):
         
         linked_count = 0
         created_actresses = 0
+        # 姓名、英文名、别名一次性载入内存（发现过期主键时会重新加载，每次都取共享实例）
+        get_name_resolver()
         
         for movie in movies:
             self.stdout.write(f'Processing movie: {movie.censored_id}')
@@ -40,30 +43,37 @@ class Command(BaseCommand):
             actress_names = self.parse_actress_names(movie.jav_idols)
             self.stdout.write(f'  Found actresses: {actress_names}')
             
+            linked_ids = set(movie.actresses.values_list('id', flat=True))
             for actress_name in actress_names:
                 # 查找现有女友
-                actress = Actress.objects.filter(name=actress_name).first()
+                actress_id = resolve_actress_id(actress_name)
                 
-                if not actress and create_missing:
+                if actress_id is None and create_missing:
                     if not dry_run:
                         # 创建新女友
                         actress = self.create_actress(actress_name, movie)
+                        get_name_resolver().register(actress)
+                        actress_id = actress.pk
                         created_actresses += 1
                     self.stdout.write(f'  Would create actress: {actress_name}')
                 
-                if actress:
+                if actress_id is not None:
                     # 检查是否已经关联
-                    if not movie.actresses.filter(id=actress.id).exists():
+                    if actress_id not in linked_ids:
                         if not dry_run:
-                            movie.actresses.add(actress)
-                            # 更新女友作品数
-                            actress.update_movie_count()
+                            # 女友作品数由 m2m_changed 信号更新
+                            movie.actresses.add(actress_id)
+                            linked_ids.add(actress_id)
                         linked_count += 1
                         self.stdout.write(f'  Linked: {actress_name}')
                     else:
                         self.stdout.write(f'  Already linked: {actress_name}')
                 else:
                     self.stdout.write(f'  Actress not found: {actress_name}')
+                    # 模糊匹配的结果只作为人工核对的提示，不自动关联
+                    candidate_id = get_name_resolver().resolve(actress_name, fuzzy=True)
+                    if candidate_id is not None:
+                        self.stdout.write(f'    Similar actress: #{candidate_id}')
         
         self.stdout.write(self.style.SUCCESS(f'Linking process completed!'))
         self.stdout.write(f'Movies processed: {movies.count()}')
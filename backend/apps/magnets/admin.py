@@ -82,10 +82,10 @@ class MagnetLinkAdmin(admin.ModelAdmin):
 class MagnetCategoryAdmin(admin.ModelAdmin):
     """Magnet category admin configuration"""
     
-    list_display = ['name', 'color_display', 'get_magnet_count', 'created_at']
+    list_display = ['name', 'color_display', 'magnet_count', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'description']
-    readonly_fields = ['created_at']
+    readonly_fields = ['magnet_count', 'created_at']
     
     def color_display(self, obj):
         """颜色显示"""
@@ -94,10 +94,6 @@ class MagnetCategoryAdmin(admin.ModelAdmin):
             obj.color, obj.color
         )
     color_display.short_description = '颜色'
-    
-    def get_magnet_count(self, obj):
-        return obj.magnets.filter(is_active=True).count()
-    get_magnet_count.short_description = '磁力数量'
 
 
 @admin.register(DownloadHistory)
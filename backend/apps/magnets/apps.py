@@ -5,3 +5,6 @@ class MagnetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.magnets'
     verbose_name = '磁力链接管理'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,31 @@
+"""
+Django management command to rebuild the magnet summary columns on movies.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.magnets.summary import rebuild_movie_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recalculate active magnet count, best quality, subtitle flag and max seeders per movie'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of movies per batch'
+        )
+        parser.add_argument(
+            '--movie-id',
+            type=int,
+            nargs='+',
+            help='Only repair these movies'
+        )
+
+    def handle(self, *args, **options):
+        fixed = rebuild_movie_summaries(
+            movie_ids=options['movie_id'], batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Successfully repaired {fixed} movies'))
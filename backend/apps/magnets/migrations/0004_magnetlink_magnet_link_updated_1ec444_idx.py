@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("magnets", "0003_magnetlink_source"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="magnetlink",
+            index=models.Index(
+                fields=["updated_at"], name="magnet_link_updated_1ec444_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:45
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill(apps, schema_editor):
+    MagnetCategory = apps.get_model("magnets", "MagnetCategory")
+    rows = (
+        MagnetCategory.magnets.through.objects.filter(magnetlink__is_active=True)
+        .values("magnetcategory_id")
+        .annotate(count=Count("id"))
+    )
+    for row in rows:
+        MagnetCategory.objects.filter(pk=row["magnetcategory_id"]).update(
+            magnet_count=row["count"]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("magnets", "0004_magnetlink_magnet_link_updated_1ec444_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="magnetcategory",
+            name="magnet_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="有效磁力链接的数量", verbose_name="磁力数量"
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
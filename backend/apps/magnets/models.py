@@ -4,6 +4,7 @@ Magnet models for AVBook application.
 from django.db import models
 from django.utils import timezone
 from django.core.validators import RegexValidator
+from apps.core.relation_counters import CounterFieldsMixin
 from apps.movies.models import Movie
 
 
@@ -167,6 +168,7 @@ class MagnetLink(models.Model):
             models.Index(fields=['is_active']),
             models.Index(fields=['seeders']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
         ]
         # unique_together = ['movie', 'magnet_link']  # 暂时注释掉，因为MySQL不支持TEXT字段的唯一约束
     
@@ -232,15 +234,17 @@ class MagnetLink(models.Model):
         return f"{s} {size_names[i]}"
     
     def increment_download_count(self):
-        """增加下载次数"""
+        """增加下载次数（缓冲后批量写回）"""
+        from apps.core.counters import counter_buffer
         self.download_count += 1
+        counter_buffer.incr(MagnetLink, self.pk, 'download_count')
         self.movie.increment_download_count()
-        self.save(update_fields=['download_count'])
     
     def increment_click_count(self):
-        """增加点击次数"""
+        """增加点击次数（缓冲后批量写回）"""
+        from apps.core.counters import counter_buffer
         self.click_count += 1
-        self.save(update_fields=['click_count'])
+        counter_buffer.incr(MagnetLink, self.pk, 'click_count')
     
     @property
     def health_score(self):
@@ -275,8 +279,10 @@ class MagnetLink(models.Model):
         return min(score, 100)
 
 
-class MagnetCategory(models.Model):
+class MagnetCategory(CounterFieldsMixin, models.Model):
     """磁力链接分类"""
+
+    counter_fields = ('magnet_count',)
     
     name = models.CharField(
         max_length=50,
@@ -301,6 +307,13 @@ class MagnetCategory(models.Model):
         blank=True,
         verbose_name='关联磁力链接'
     )
+
+    # 由 m2m_changed 信号增量维护
+    magnet_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='磁力数量',
+        help_text='有效磁力链接的数量'
+    )
     
     created_at = models.DateTimeField(
         default=timezone.now,
@@ -9,15 +9,10 @@ from .models import MagnetLink, MagnetCategory, DownloadHistory
 class MagnetCategorySerializer(serializers.ModelSerializer):
     """磁力分类序列化器"""
     
-    magnet_count = serializers.SerializerMethodField()
-    
     class Meta:
         model = MagnetCategory
         fields = ['id', 'name', 'description', 'color', 'magnet_count', 'created_at']
-    
-    def get_magnet_count(self, obj):
-        """获取分类下的磁力链接数量"""
-        return obj.magnets.filter(is_active=True).count()
+        read_only_fields = ['magnet_count']
 
 
 class MagnetLinkSerializer(serializers.ModelSerializer):
@@ -0,0 +1,38 @@
+"""
+Signal handlers for magnets app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.movies.models import CatalogStats
+from .models import MagnetLink
+from .summary import refresh_movie_summary
+
+
+@receiver(post_save, sender=MagnetLink)
+def magnet_saved(sender, instance, created, raw=False, **kwargs):
+    """新增磁力链接时增量更新统计"""
+    if raw or not created:
+        return
+    CatalogStats.record_delta(magnets=1)
+
+
+@receiver(post_save, sender=MagnetLink)
+def magnet_summary_saved(sender, instance, raw=False, **kwargs):
+    """在同一事务中更新影片的磁力汇总"""
+    if raw:
+        return
+    refresh_movie_summary(instance.movie_id)
+
+
+@receiver(post_delete, sender=MagnetLink)
+def magnet_deleted(sender, instance, **kwargs):
+    """删除磁力链接时增量更新统计"""
+    CatalogStats.record_delta(magnets=-1)
+
+
+@receiver(post_delete, sender=MagnetLink)
+def magnet_summary_deleted(sender, instance, **kwargs):
+    """在同一事务中更新影片的磁力汇总"""
+    refresh_movie_summary(instance.movie_id)
@@ -0,0 +1,114 @@
+"""
+Magnet summary columns on Movie.
+
+影片表冗余保存有效磁力链接的数量、最佳质量、出现过的质量（位掩码）、是否有字幕和最大做种数，
+过滤和列表输出只读影片表，不再关联 magnet_links。磁力链接保存/删除时在同一事务中
+重新计算所属影片的汇总；queryset 批量写入后用 repair_magnet_summary 命令修正。
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.response_cache import bump_generation
+from apps.movies.models import Movie, magnet_quality_mask
+from .models import MagnetLink, MagnetQuality
+
+# 质量从低到高
+QUALITY_RANK = {
+    MagnetQuality.UNKNOWN: 0,
+    MagnetQuality.SD: 1,
+    MagnetQuality.HD: 2,
+    MagnetQuality.FHD: 3,
+    MagnetQuality.UHD: 4,
+}
+
+SUMMARY_FIELDS = [
+    'active_magnet_count', 'best_magnet_quality', 'magnet_quality_mask',
+    'has_subtitled_magnet', 'max_magnet_seeders',
+]
+
+SUMMARY_SOURCE_COLUMNS = ['is_active', 'quality', 'has_subtitle', 'seeders']
+
+
+def summarize(rows):
+    """由 (is_active, quality, has_subtitle, seeders) 行计算汇总，只统计有效的磁力链接"""
+    summary = {
+        'active_magnet_count': 0,
+        'best_magnet_quality': '',
+        'magnet_quality_mask': 0,
+        'has_subtitled_magnet': False,
+        'max_magnet_seeders': 0,
+    }
+    best_rank = -1
+    for is_active, quality, has_subtitle, seeders in rows:
+        if not is_active:
+            continue
+        summary['active_magnet_count'] += 1
+        summary['magnet_quality_mask'] |= magnet_quality_mask([quality])
+        summary['has_subtitled_magnet'] = summary['has_subtitled_magnet'] or has_subtitle
+        summary['max_magnet_seeders'] = max(summary['max_magnet_seeders'], seeders)
+        rank = QUALITY_RANK.get(quality, 0)
+        if rank > best_rank:
+            best_rank = rank
+            summary['best_magnet_quality'] = quality
+    return summary
+
+
+def refresh_movie_summary(movie_id):
+    """
+    重新计算一部影片的汇总。
+
+    先锁定影片行使同一影片的汇总更新串行执行，再用加锁读取磁力链接，
+    读到的是最新提交的数据而不是事务快照，并发写入不会互相覆盖。
+    """
+    with transaction.atomic():
+        if not Movie.objects.select_for_update().filter(pk=movie_id).exists():
+            return
+        rows = (
+            MagnetLink.objects.select_for_update()
+            .filter(movie_id=movie_id)
+            .values_list(*SUMMARY_SOURCE_COLUMNS)
+        )
+        Movie.objects.filter(pk=movie_id).update(
+            updated_at=timezone.now(), **summarize(rows)
+        )
+        # update() 不触发信号，提交后使依赖影片的响应缓存失效
+        transaction.on_commit(lambda: bump_generation('movies.Movie'))
+
+
+def rebuild_movie_summaries(movie_ids=None, batch_size=1000):
+    """按主键分批全量重算汇总（movie_ids 为空时处理全部影片），返回修正的影片数"""
+    queryset = Movie.objects.order_by('pk')
+    if movie_ids is not None:
+        queryset = queryset.filter(pk__in=movie_ids)
+
+    fixed = 0
+    last_pk = 0
+    while True:
+        movies = list(queryset.filter(pk__gt=last_pk).only('id', *SUMMARY_FIELDS)[:batch_size])
+        if not movies:
+            return fixed
+        last_pk = movies[-1].pk
+
+        rows_by_movie = {}
+        for movie_id, *row in (
+            MagnetLink.objects.filter(movie_id__in=[movie.pk for movie in movies])
+            .values_list('movie_id', *SUMMARY_SOURCE_COLUMNS)
+        ):
+            rows_by_movie.setdefault(movie_id, []).append(row)
+
+        changed = []
+        now = timezone.now()
+        for movie in movies:
+            summary = summarize(rows_by_movie.get(movie.pk, []))
+            if all(getattr(movie, name) == value for name, value in summary.items()):
+                continue
+            for name, value in summary.items():
+                setattr(movie, name, value)
+            movie.updated_at = now
+            changed.append(movie)
+
+        if changed:
+            Movie.objects.bulk_update(changed, SUMMARY_FIELDS + ['updated_at'])
+            transaction.on_commit(lambda: bump_generation('movies.Movie'))
+            fixed += len(changed)
@@ -11,6 +11,9 @@ from django.db.models import Q, Count, Avg
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.core.conditional import ConditionalResponseMixin
+from apps.core.response_cache import CachedResponseMixin
+
 from .models import MagnetLink, MagnetCategory, DownloadHistory
 from .serializers import (
     MagnetLinkSerializer, MagnetLinkDetailSerializer, 
@@ -18,9 +21,15 @@ from .serializers import (
 )
 
 
-class MagnetLinkViewSet(viewsets.ReadOnlyModelViewSet):
+class MagnetLinkViewSet(ConditionalResponseMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """磁力链接视图集"""
     
+    cache_dependencies = ('magnets.MagnetLink', 'magnets.MagnetCategory', 'movies.Movie')
+    # 详情还包含完整的影片信息和最近下载记录
+    detail_cache_dependencies = cache_dependencies + (
+        'movies.MovieTag', 'movies.MovieRating', 'actresses.Actress', 'magnets.DownloadHistory',
+    )
+    
     queryset = MagnetLink.objects.select_related('movie').prefetch_related('categories')
     serializer_class = MagnetLinkSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -37,6 +46,11 @@ class MagnetLinkViewSet(viewsets.ReadOnlyModelViewSet):
             return MagnetLinkDetailSerializer
         return MagnetLinkSerializer
     
+    def get_cache_dependencies(self):
+        if self.action == 'retrieve':
+            return self.detail_cache_dependencies
+        return self.cache_dependencies
+    
     def get_queryset(self):
         """获取查询集"""
         queryset = super().get_queryset()
@@ -145,9 +159,11 @@ class MagnetLinkViewSet(viewsets.ReadOnlyModelViewSet):
         return ip
 
 
-class MagnetCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class MagnetCategoryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """磁力分类视图集"""
     
+    cache_dependencies = ('magnets.MagnetCategory', 'magnets.MagnetLink')
+    
     queryset = MagnetCategory.objects.all()
     serializer_class = MagnetCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -2,14 +2,43 @@
 Django admin configuration for movies app.
 """
 
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import FilteredSelectMultiple
 from django.utils.html import format_html
+
+from apps.actresses.models import Actress
 from .models import Movie, MovieTag, MovieRating
 
 
+class MovieAdminForm(forms.ModelForm):
+    """
+    女友关联使用自定义关联表，admin 不能直接编辑该多对多字段；
+    通过表单字段选择，保存时调用 actresses.set() 以触发 m2m_changed 信号
+    """
+
+    linked_actresses = forms.ModelMultipleChoiceField(
+        queryset=Actress.objects.all(),
+        required=False,
+        widget=FilteredSelectMultiple('女友', is_stacked=False),
+        label='关联女友'
+    )
+
+    class Meta:
+        model = Movie
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['linked_actresses'].initial = self.instance.actresses.all()
+
+
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
     """Movie admin configuration"""
+
+    form = MovieAdminForm
     
     list_display = [
         'censored_id', 'movie_title', 'source', 'release_date', 
@@ -17,10 +46,8 @@ class MovieAdmin(admin.ModelAdmin):
     ]
     list_filter = ['source', 'release_date', 'created_at']
     search_fields = ['censored_id', 'movie_title', 'jav_idols', 'director', 'studio']
-    readonly_fields = ['code_36', 'view_count', 'download_count', 'created_at', 'updated_at', 'get_tags_display', 'get_tag_management_link', 'get_actresses_display', 'get_sample_images_preview']
+    readonly_fields = ['code_36', 'view_count', 'download_count', 'active_magnet_count', 'best_magnet_quality', 'magnet_quality_mask', 'has_subtitled_magnet', 'max_magnet_seeders', 'created_at', 'updated_at', 'get_tags_display', 'get_tag_management_link', 'get_actresses_display', 'get_sample_images_preview']
 
-    filter_horizontal = ['actresses']
-    
     fieldsets = (
         ('基本信息', {
             'fields': ('censored_id', 'movie_title', 'movie_pic_cover', 'source')
@@ -32,14 +59,17 @@ class MovieAdmin(admin.ModelAdmin):
             'fields': ('genre', 'jav_idols', 'movie_tags', 'get_tags_display', 'get_tag_management_link')
         }),
         ('女友关联', {
-            'fields': ('actresses', 'get_actresses_display')
+            'fields': ('linked_actresses', 'get_actresses_display')
         }),
         ('样例图片', {
             'fields': ('sample_images', 'get_sample_images_preview'),
             'classes': ('collapse',)
         }),
         ('统计信息', {
-            'fields': ('code_36', 'view_count', 'download_count'),
+            'fields': (
+                'code_36', 'view_count', 'download_count', 'active_magnet_count',
+                'best_magnet_quality', 'magnet_quality_mask', 'has_subtitled_magnet', 'max_magnet_seeders'
+            ),
             'classes': ('collapse',)
         }),
         ('时间信息', {
@@ -52,6 +82,10 @@ class MovieAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        form.instance.actresses.set(form.cleaned_data['linked_actresses'])
+
     def get_tags_display(self, obj):
         """显示影片的标签"""
         try:
@@ -123,15 +157,11 @@ class MovieAdmin(admin.ModelAdmin):
 class MovieTagAdmin(admin.ModelAdmin):
     """Movie tag admin configuration"""
     
-    list_display = ['name', 'slug', 'color', 'get_movie_count', 'created_at']
+    list_display = ['name', 'slug', 'color', 'movie_count', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
-    readonly_fields = ['created_at']
-    
-    def get_movie_count(self, obj):
-        return obj.movies.count()
-    get_movie_count.short_description = '影片数量'
+    readonly_fields = ['movie_count', 'created_at']
 
 
 @admin.register(MovieRating)
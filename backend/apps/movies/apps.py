@@ -5,3 +5,6 @@ class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.movies'
     verbose_name = '影片管理'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,165 @@
+"""
+Streaming catalog export.
+
+按主键分批读取影片（每批预加载演员和有效磁力链接），逐批编码为 NDJSON 或 CSV，
+可选 gzip 压缩。内存占用只与批大小有关，与目录总量无关。
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+EXPORT_MOVIE_FIELDS = [
+    'id', 'censored_id', 'movie_title', 'release_date', 'movie_length', 'director',
+    'studio', 'label', 'series', 'genre', 'jav_idols', 'source', 'cover_image',
+    'duration_minutes', 'created_at', 'updated_at',
+]
+
+EXPORT_MAGNET_FIELDS = [
+    'id', 'magnet_name', 'magnet_link', 'file_size', 'file_size_bytes', 'quality',
+    'has_subtitle', 'seeders', 'leechers',
+]
+
+# CSV 每部影片一行，演员和磁力链接用 | 连接
+CSV_COLUMNS = EXPORT_MOVIE_FIELDS + ['actresses', 'magnet_count', 'magnet_links']
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_movie_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    按主键顺序分批读取影片。
+
+    使用主键游标而不是 QuerySet.iterator()：mysqlclient 会把整个结果集读入内存，
+    每批单独查询才能保证内存恒定。
+    """
+    from apps.actresses.models import Actress
+    from apps.magnets.models import MagnetLink
+
+    queryset = (
+        queryset.order_by('pk')
+        .only(*EXPORT_MOVIE_FIELDS)
+        .prefetch_related(
+            Prefetch('actresses', queryset=Actress.objects.only('id', 'name').order_by('id')),
+            Prefetch(
+                'magnets',
+                queryset=(
+                    MagnetLink.objects.filter(is_active=True)
+                    .only('movie_id', *EXPORT_MAGNET_FIELDS)
+                    .order_by('-seeders', 'id')
+                ),
+                to_attr='active_magnets'
+            ),
+        )
+    )
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        # 关联表过滤可能产生重复行，按主键去重
+        movies = list({movie.pk: movie for movie in chunk[:chunk_size]}.values())
+        if not movies:
+            return
+        yield movies
+        last_pk = movies[-1].pk
+
+
+def movie_record(movie):
+    """影片的导出记录"""
+    record = {name: getattr(movie, name) for name in EXPORT_MOVIE_FIELDS}
+    record['actresses'] = [
+        {'id': actress.id, 'name': actress.name} for actress in movie.actresses.all()
+    ]
+    record['magnets'] = [
+        {name: getattr(magnet, name) for name in EXPORT_MAGNET_FIELDS}
+        for magnet in movie.active_magnets
+    ]
+    return record
+
+
+def to_text(value):
+    """CSV 单元格文本，日期时间使用 ISO 8601"""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class NDJSONFormat:
+    """每行一个 JSON 对象"""
+
+    content_type = 'application/x-ndjson'
+    extension = 'ndjson'
+
+    def header(self):
+        return b''
+
+    def encode(self, movies):
+        lines = [
+            json.dumps(movie_record(movie), cls=DjangoJSONEncoder, ensure_ascii=False)
+            for movie in movies
+        ]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class CSVFormat:
+    """CSV，首行为列名"""
+
+    content_type = 'text/csv; charset=utf-8'
+    extension = 'csv'
+
+    def header(self):
+        return self.write_rows([CSV_COLUMNS])
+
+    def encode(self, movies):
+        rows = []
+        for movie in movies:
+            record = movie_record(movie)
+            row = [to_text(record[name]) for name in EXPORT_MOVIE_FIELDS]
+            row.append('|'.join(actress['name'] for actress in record['actresses']))
+            row.append(len(record['magnets']))
+            row.append('|'.join(magnet['magnet_link'] for magnet in record['magnets']))
+            rows.append(row)
+        return self.write_rows(rows)
+
+    def write_rows(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+
+EXPORT_FORMATS = {
+    'ndjson': NDJSONFormat,
+    'csv': CSVFormat,
+}
+
+
+def stream_export(queryset, export_format='ndjson', compress=False,
+                  chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """
+    生成导出内容的字节块（每批影片一块）。
+
+    compress 为 True 时输出 gzip 流；on_chunk(count) 在每批编码后调用。
+    """
+    formatter = EXPORT_FORMATS[export_format]()
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    def emit(data):
+        if compressor is None:
+            return data
+        # 每批刷新一次，让客户端尽早收到数据
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    header = formatter.header()
+    if header:
+        yield emit(header)
+    for movies in iter_movie_chunks(queryset, chunk_size):
+        yield emit(formatter.encode(movies))
+        if on_chunk is not None:
+            on_chunk(len(movies))
+    if compressor is not None:
+        yield compressor.flush()
@@ -0,0 +1,144 @@
+"""
+Facet counts for the movie browser.
+
+在当前过滤条件下统计来源、发行年份、磁力质量、制作商和类型的影片数量：
+来源/年份/质量都是影片表的列，基数很小，合并为一次 GROUP BY；制作商和类型
+各一次 GROUP BY 取前若干项。所有查询共享一个时间预算，超时的分面不返回，
+响应标记为 partial。完整的结果按过滤参数缓存，缓存 key 包含影片库相关模型的代数，
+影片、标签、磁力链接写入后自动失效。
+"""
+
+import hashlib
+import logging
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+from apps.core.query_budget import QueryBudget, QueryBudgetExceeded
+from apps.core.response_cache import get_generations, normalize_query
+
+from .models import Movie, MovieGenre, qualities_in_mask
+
+logger = logging.getLogger(__name__)
+
+# 制作商、类型只返回数量最多的前若干项
+FACET_LIMIT = 50
+
+# 过滤条件可能涉及的模型，写入时缓存失效
+FACET_DEPENDENCIES = ('movies.Movie', 'movies.MovieTag', 'magnets.MagnetLink')
+
+CACHE_KEY_PREFIX = 'movies:facets'
+
+
+def as_buckets(counter):
+    items = sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+    return [{'value': value, 'count': count} for value, count in items]
+
+
+def column_facets(base):
+    """来源、发行年份、磁力质量（按质量掩码分组，一部影片计入它拥有的每种质量）：一次分组查询"""
+    rows = (
+        base.annotate(release_year=ExtractYear('release_date'))
+        .values('source', 'release_year', 'magnet_quality_mask')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    sources, years, qualities = Counter(), Counter(), Counter()
+    total = 0
+    for row in rows:
+        sources[row['source']] += row['count']
+        if row['release_year'] is not None:
+            years[row['release_year']] += row['count']
+        for quality in qualities_in_mask(row['magnet_quality_mask']):
+            qualities[quality] += row['count']
+        total += row['count']
+    return total, {
+        'source': as_buckets(sources),
+        'release_year': sorted(as_buckets(years), key=lambda item: -item['value']),
+        'quality': as_buckets(qualities),
+    }
+
+
+def studio_facet(base):
+    rows = (
+        base.exclude(studio='')
+        .values('studio')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'studio')[:FACET_LIMIT]
+    )
+    return [{'value': row['studio'], 'count': row['count']} for row in rows]
+
+
+def genre_facet(base):
+    rows = (
+        MovieGenre.objects.filter(movie__in=base)
+        .values('genre__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'genre__name')[:FACET_LIMIT]
+    )
+    return [{'value': row['genre__name'], 'count': row['count']} for row in rows]
+
+
+def compute_facets(base, budget_ms):
+    """在时间预算内计算分面，返回 (结果, 是否完整)"""
+    budget = QueryBudget(budget_ms)
+    result = {'total': None, 'facets': {}, 'missing': []}
+
+    try:
+        with budget.limit():
+            total, facets = column_facets(base)
+        result['total'] = total
+        result['facets'].update(facets)
+    except QueryBudgetExceeded:
+        result['missing'].extend(['source', 'release_year', 'quality'])
+
+    for name, compute in (('studio', studio_facet), ('genre', genre_facet)):
+        try:
+            with budget.limit():
+                result['facets'][name] = compute(base)
+        except QueryBudgetExceeded:
+            result['missing'].append(name)
+
+    return result, not result['missing']
+
+
+def get_facet_base(filterset):
+    """过滤后的影片集合；关联过滤可能产生重复行，改为按主键子查询去重"""
+    if not any(value not in (None, '') for value in filterset.form.cleaned_data.values()):
+        return Movie.objects.all()
+    return Movie.objects.filter(pk__in=filterset.qs.order_by().values('pk'))
+
+
+def get_facets(filterset, query_params):
+    """读取缓存或计算分面；只缓存完整的结果"""
+    budget_ms = getattr(settings, 'MOVIE_FACETS_TIME_BUDGET_MS', 800)
+    key = None
+    try:
+        generations = get_generations(FACET_DEPENDENCIES)
+        raw = '|'.join([
+            normalize_query(query_params),
+            ','.join(str(generation) for generation in generations),
+        ])
+        key = f'{CACHE_KEY_PREFIX}:{hashlib.md5(raw.encode("utf-8")).hexdigest()}'
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning('Facet cache unavailable: %s', e)
+        cached = None
+    if cached is not None:
+        return dict(cached, cached=True)
+
+    started = time.perf_counter()
+    result, complete = compute_facets(get_facet_base(filterset), budget_ms)
+    result['took_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    result['partial'] = not complete
+
+    if complete and key is not None:
+        try:
+            cache.set(key, result, getattr(settings, 'MOVIE_FACETS_CACHE_TIMEOUT', 300))
+        except Exception as e:
+            logger.warning('Failed to store facets: %s', e)
+    return dict(result, cached=False)
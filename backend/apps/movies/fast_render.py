@@ -0,0 +1,145 @@
+"""
+Row builders for the fast movie list path.
+
+输出与 MovieSerializer 完全一致；关联数据（标签、评分、演员、类型、出演）
+按本页影片主键各用一次 values() 查询批量读取。
+"""
+
+from collections import defaultdict
+
+from apps.core.fast_render import RowBuilder, split_commas, split_lines
+
+from .models import MovieGenre, MovieIdol, MovieRating, MovieTag, split_dimension_names
+from .serializers import (
+    ACTRESS_SUMMARY_FIELDS, MovieRatingSerializer, MovieSerializer, MovieTagSerializer,
+)
+
+
+class MovieTagRowBuilder(RowBuilder):
+    """嵌套的标签"""
+
+    serializer_class = MovieTagSerializer
+
+
+class MovieRatingRowBuilder(RowBuilder):
+    """嵌套的评分，影片编号和标题取自影片行"""
+
+    serializer_class = MovieRatingSerializer
+    always_columns = ('id', 'movie_id')
+
+    def __init__(self, context=None):
+        self.movies = {}
+        super().__init__(context)
+
+    def build_movie_title(self, row):
+        return self.movies[row['movie_id']]['movie_title']
+
+    def build_movie_censored_id(self, row):
+        return self.movies[row['movie_id']]['censored_id']
+
+
+class MovieRowBuilder(RowBuilder):
+    """影片列表"""
+
+    serializer_class = MovieSerializer
+    # 游标分页需要读取排序字段
+    always_columns = ('id', 'created_at', 'release_date', 'view_count', 'download_count')
+    computed_columns = {
+        'genre_list': ['genre'],
+        'idol_list': ['jav_idols'],
+        'sample_images_list': ['sample_images'],
+        'sample_images_local_list': ['sample_images_local'],
+        'movie_tags_list': ['movie_tags'],
+        'rating': ['movie_title', 'censored_id'],
+    }
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.tag_builder = MovieTagRowBuilder() if self.wants('tags') else None
+        self.rating_builder = MovieRatingRowBuilder() if self.wants('rating') else None
+
+    def prepare(self, rows):
+        ids = [row['id'] for row in rows]
+        self.tags = defaultdict(list)
+        self.ratings = {}
+        self.actresses = defaultdict(list)
+        self.genres = defaultdict(list)
+        self.idols = defaultdict(list)
+        if not ids:
+            return
+
+        if self.tag_builder is not None:
+            tag_rows = list(
+                MovieTag.objects.filter(movies__in=ids)
+                .values('movies', *self.tag_builder.columns)
+            )
+            for row, item in zip(tag_rows, self.tag_builder.build(tag_rows)):
+                self.tags[row['movies']].append(item)
+
+        if self.rating_builder is not None:
+            self.rating_builder.movies = {row['id']: row for row in rows}
+            rating_rows = list(
+                MovieRating.objects.filter(movie_id__in=ids).values(*self.rating_builder.columns)
+            )
+            for row, item in zip(rating_rows, self.rating_builder.build(rating_rows)):
+                self.ratings[row['movie_id']] = item
+
+        if self.wants('actresses'):
+            from apps.actresses.models import Actress
+            actress_rows = (
+                Actress.objects.filter(movies__in=ids)
+                .values('movies', *ACTRESS_SUMMARY_FIELDS)
+            )
+            for row in actress_rows:
+                self.actresses[row['movies']].append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'profile_image': row['profile_image'],
+                    'profile_image_local': row['profile_image_local'],
+                    'cup_size': row['cup_size'],
+                    'height': row['height'],
+                    'birth_date': row['birth_date'],
+                })
+
+        if self.wants('genre_list'):
+            for movie_id, name in (
+                MovieGenre.objects.filter(movie_id__in=ids).values_list('movie_id', 'genre__name')
+            ):
+                self.genres[movie_id].append(name)
+
+        if self.wants('idol_list'):
+            for movie_id, name in (
+                MovieIdol.objects.filter(movie_id__in=ids).values_list('movie_id', 'name')
+            ):
+                self.idols[movie_id].append(name)
+
+    def build_tags(self, row):
+        return self.tags.get(row['id'], [])
+
+    def build_rating(self, row):
+        return self.ratings.get(row['id'])
+
+    def build_actresses(self, row):
+        return self.actresses.get(row['id'], [])
+
+    def build_genre_list(self, row):
+        # 与 Movie.genre_list 一致：关联表为空时退回到解析文本
+        names = self.genres.get(row['id'])
+        if names or not row['genre']:
+            return names or []
+        return split_dimension_names(row['genre'])
+
+    def build_idol_list(self, row):
+        names = self.idols.get(row['id'])
+        if names or not row['jav_idols']:
+            return names or []
+        return split_dimension_names(row['jav_idols'])
+
+    def build_sample_images_list(self, row):
+        return split_lines(row['sample_images'])
+
+    def build_sample_images_local_list(self, row):
+        return split_lines(row['sample_images_local'])
+
+    def build_movie_tags_list(self, row):
+        return split_commas(row['movie_tags'])
@@ -4,7 +4,18 @@ Movie filters for API.
 
 import django_filters
 from django.db.models import Q
-from .models import Movie, MovieSource
+from rest_framework import filters
+from .models import Movie, MovieSource, masks_with_quality
+from .search import get_search_backend
+
+
+class MovieOrderingFilter(filters.OrderingFilter):
+    """影片排序过滤器，搜索时若未指定排序则保留相关度排序"""
+
+    def get_default_ordering(self, view):
+        if view.request.query_params.get('search'):
+            return None
+        return super().get_default_ordering(view)
 
 
 class MovieFilter(django_filters.FilterSet):
@@ -53,18 +64,10 @@ class MovieFilter(django_filters.FilterSet):
         ]
     
     def filter_search(self, queryset, name, value):
-        """全文搜索"""
+        """全文搜索（按相关度排序，编号完全匹配优先）"""
         if not value:
             return queryset
-        
-        return queryset.filter(
-            Q(censored_id__icontains=value) |
-            Q(movie_title__icontains=value) |
-            Q(jav_idols__icontains=value) |
-            Q(director__icontains=value) |
-            Q(studio__icontains=value) |
-            Q(genre__icontains=value)
-        )
+        return get_search_backend().search(queryset, value)
     
     def filter_has_tags(self, queryset, name, value):
         """是否有标签"""
@@ -78,36 +81,30 @@ class MovieFilter(django_filters.FilterSet):
         """演员过滤"""
         if not value:
             return queryset
-        return queryset.filter(jav_idols__icontains=value)
+        return queryset.filter(idol_credits__name=value.strip())
     
     def filter_genre(self, queryset, name, value):
         """类型过滤"""
         if not value:
             return queryset
-        return queryset.filter(genre__icontains=value)
+        return queryset.filter(genre_links__genre__name=value.strip())
     
     def filter_has_magnets(self, queryset, name, value):
-        """是否有磁力链接"""
+        """是否有有效磁力链接（读取影片表的汇总列）"""
         if value is True:
-            return queryset.filter(magnets__isnull=False, magnets__is_active=True).distinct()
+            return queryset.filter(active_magnet_count__gt=0)
         elif value is False:
-            return queryset.filter(
-                Q(magnets__isnull=True) | 
-                Q(magnets__is_active=False)
-            ).distinct()
+            return queryset.filter(active_magnet_count=0)
         return queryset
     
     def filter_quality(self, queryset, name, value):
-        """视频质量过滤"""
+        """视频质量过滤：有该质量的有效磁力链接（读取影片表的质量掩码列）"""
         if not value:
             return queryset
-        return queryset.filter(magnets__quality=value, magnets__is_active=True).distinct()
+        return queryset.filter(magnet_quality_mask__in=masks_with_quality(value.strip()))
     
     def filter_has_subtitle(self, queryset, name, value):
-        """是否有字幕"""
+        """是否有带字幕的有效磁力链接"""
         if value is not None:
-            return queryset.filter(
-                magnets__has_subtitle=value, 
-                magnets__is_active=True
-            ).distinct()
+            return queryset.filter(has_subtitled_magnet=value)
         return queryset
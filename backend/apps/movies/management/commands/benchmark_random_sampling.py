@@ -0,0 +1,88 @@
+"""
+Django management command to benchmark random movie sampling.
+
+对比 order_by('?') 与 RandomSampler 在不同数据量下的耗时。
+合成数据在事务中写入，结束后回滚，不会留在数据库中。
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.movies.models import Movie
+from apps.movies.sampling import RandomSampler
+
+
+class RollbackBenchmark(Exception):
+    """用于回滚合成数据"""
+
+
+class Command(BaseCommand):
+    help = "Benchmark RandomSampler against order_by('?')"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[100000, 1000000],
+            help='Table sizes to benchmark'
+        )
+        parser.add_argument('--count', type=int, default=10, help='Movies per sample')
+        parser.add_argument('--repeat', type=int, default=20, help='Samples per method')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Insert batch size')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                for rows in sorted(options['rows']):
+                    self.fill_to(rows, options['batch_size'])
+                    self.run(rows, options['count'], options['repeat'])
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            self.stdout.write('Synthetic rows rolled back')
+
+    def fill_to(self, rows, batch_size):
+        """补充合成影片直到表中有 rows 行"""
+        existing = Movie.objects.count()
+        sources = ['avmoo', 'javbus', 'javlibrary']
+        next_id = existing
+        while existing < rows:
+            size = min(batch_size, rows - existing)
+            Movie.objects.bulk_create([
+                Movie(
+                    censored_id=f'BENCH-{next_id + i}',
+                    movie_title=f'Benchmark movie {next_id + i}',
+                    source=sources[(next_id + i) % 3],
+                    code_36='bench',
+                )
+                for i in range(size)
+            ])
+            existing += size
+            next_id += size
+
+    def run(self, rows, count, repeat):
+        queryset = Movie.objects.all()
+        filtered = Movie.objects.filter(source='javlibrary')
+        sampler = RandomSampler()
+
+        cases = [
+            ("order_by('?')", lambda: list(queryset.order_by('?')[:count])),
+            ('RandomSampler', lambda: sampler.sample(queryset, count)),
+            ("order_by('?') source=javlibrary", lambda: list(filtered.order_by('?')[:count])),
+            ('RandomSampler source=javlibrary', lambda: sampler.sample(filtered, count)),
+        ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{rows} rows, {count} per sample'))
+        for name, func in cases:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f'  {name:<36} median {statistics.median(timings):8.2f} ms  '
+                f'max {max(timings):8.2f} ms'
+            )
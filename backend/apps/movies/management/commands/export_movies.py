@@ -0,0 +1,87 @@
+"""
+Django management command to export the movie catalog as NDJSON or CSV.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from apps.movies.export import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, stream_export
+from apps.movies.filters import MovieFilter
+from apps.movies.models import Movie
+
+
+class Command(BaseCommand):
+    help = 'Stream movies with their actresses and active magnets to a file or stdout'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=sorted(EXPORT_FORMATS),
+            default='ndjson',
+            help='Output format'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='-',
+            help='Output file path, "-" for stdout'
+        )
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Movies per query batch'
+        )
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            metavar='NAME=VALUE',
+            help='MovieFilter parameter, e.g. --filter source=javbus (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        params = QueryDict(mutable=True)
+        for item in options['filter']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Invalid filter "{item}", expected NAME=VALUE')
+            params.appendlist(name.strip(), value)
+
+        filterset = MovieFilter(params, queryset=Movie.objects.all())
+        if not filterset.is_valid():
+            raise CommandError(f'Invalid filters: {dict(filterset.errors)}')
+
+        exported = 0
+
+        def on_chunk(count):
+            nonlocal exported
+            exported += count
+            self.stderr.write(f'Exported {exported} movies')
+
+        chunks = stream_export(
+            filterset.qs,
+            options['format'],
+            compress=options['gzip'],
+            chunk_size=options['chunk_size'],
+            on_chunk=on_chunk,
+        )
+
+        if options['output'] == '-':
+            self.write_chunks(sys.stdout.buffer, chunks)
+            sys.stdout.buffer.flush()
+        else:
+            try:
+                with open(options['output'], 'wb') as f:
+                    self.write_chunks(f, chunks)
+            except OSError as e:
+                raise CommandError(f'Cannot write {options["output"]}: {e}')
+
+        self.stderr.write(self.style.SUCCESS(f'Successfully exported {exported} movies'))
+
+    def write_chunks(self, stream, chunks):
+        for chunk in chunks:
+            stream.write(chunk)
@@ -12,6 +12,7 @@ from datetime import datetime
 
 from apps.movies.models import Movie, MovieTag, MovieRating
 from apps.magnets.models import MagnetLink, MagnetCategory
+from apps.magnets.summary import rebuild_movie_summaries
 
 
 class Command(BaseCommand):
@@ -125,6 +126,7 @@ class Command(BaseCommand):
         """批量导入影片"""
         created_count = 0
         movies_batch = []
+        imported_ids = []
         
         for movie_data in movies_data:
             try:
@@ -156,6 +158,7 @@ class Command(BaseCommand):
                 )
                 
                 movies_batch.append(movie_obj)
+                imported_ids.append(censored_id)
                 
                 if len(movies_batch) >= batch_size:
                     Movie.objects.bulk_create(movies_batch, ignore_conflicts=True)
@@ -173,12 +176,21 @@ class Command(BaseCommand):
             Movie.objects.bulk_create(movies_batch, ignore_conflicts=True)
             created_count += len(movies_batch)
         
+        # bulk_create 不会触发 save()，需要补同步类型/演员关联表
+        for start in range(0, len(imported_ids), batch_size):
+            Movie.sync_dimensions_bulk(
+                Movie.objects.filter(
+                    censored_id__in=imported_ids[start:start + batch_size]
+                ).only('id', 'genre', 'jav_idols')
+            )
+        
         return created_count
     
     def import_magnets(self, magnets_data, batch_size):
         """批量导入磁力链接"""
         created_count = 0
         magnets_batch = []
+        movie_ids = set()
         
         for magnet_data in magnets_data:
             try:
@@ -222,6 +234,7 @@ class Command(BaseCommand):
                 )
                 
                 magnets_batch.append(magnet_obj)
+                movie_ids.add(movie.id)
                 
                 if len(magnets_batch) >= batch_size:
                     MagnetLink.objects.bulk_create(magnets_batch, ignore_conflicts=True)
@@ -238,6 +251,10 @@ class Command(BaseCommand):
         if magnets_batch:
             MagnetLink.objects.bulk_create(magnets_batch, ignore_conflicts=True)
             created_count += len(magnets_batch)
+
+        # bulk_create 不触发信号，批量修正影片的磁力汇总
+        if movie_ids:
+            rebuild_movie_summaries(movie_ids)
         
         return created_count
     
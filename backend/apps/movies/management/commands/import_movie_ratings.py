@@ -0,0 +1,70 @@
+"""
+Django management command to bulk import movie rating votes.
+"""
+
+import csv
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.movies.models import Movie, MovieRating
+
+
+class Command(BaseCommand):
+    help = 'Import rating votes from a CSV file (censored_id,rating[,count])'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', type=str, help='CSV file path')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of movies per batch'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8') as f:
+                votes_by_code, skipped = self.read_votes(csv.reader(f))
+        except OSError as e:
+            raise CommandError(f'Cannot read {options["csv_file"]}: {e}')
+
+        codes = list(votes_by_code)
+        batch_size = options['batch_size']
+        imported = 0
+        missing = 0
+
+        for start in range(0, len(codes), batch_size):
+            batch = codes[start:start + batch_size]
+            ids = dict(
+                Movie.objects.filter(censored_id__in=batch).values_list('censored_id', 'id')
+            )
+            missing += len(batch) - len(ids)
+            MovieRating.add_votes_bulk({
+                ids[code]: votes_by_code[code] for code in batch if code in ids
+            })
+            imported += len(ids)
+            self.stdout.write(f'Imported votes for {imported} movies')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully imported votes for {imported} movies '
+            f'({missing} unknown movies, {skipped} invalid rows)'
+        ))
+
+    def read_votes(self, reader):
+        """汇总为 {编号: {星级: 票数}}，跳过表头和无效行"""
+        votes_by_code = defaultdict(lambda: defaultdict(int))
+        skipped = 0
+        for row in reader:
+            try:
+                code = row[0].strip().upper()
+                star = int(row[1])
+                count = int(row[2]) if len(row) > 2 and row[2].strip() else 1
+            except (IndexError, ValueError):
+                skipped += 1
+                continue
+            if not code or not 1 <= star <= 5 or count <= 0:
+                skipped += 1
+                continue
+            votes_by_code[code][star] += count
+        return votes_by_code, skipped
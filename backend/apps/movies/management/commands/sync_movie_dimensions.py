@@ -0,0 +1,46 @@
+"""
+Django management command to rebuild movie genre/idol join tables.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.movies.models import Movie
+
+
+class Command(BaseCommand):
+    help = 'Rebuild genre and idol join tables from Movie.genre / Movie.jav_idols'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of movies per chunk'
+        )
+        parser.add_argument(
+            '--since-id',
+            type=int,
+            default=0,
+            help='Only sync movies with id greater than this value'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = options['since_id']
+        synced = 0
+
+        # 按主键分块处理，内存占用与影片总数无关
+        while True:
+            movies = list(
+                Movie.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .only('id', 'genre', 'jav_idols')[:batch_size]
+            )
+            if not movies:
+                break
+            Movie.sync_dimensions_bulk(movies)
+            last_id = movies[-1].pk
+            synced += len(movies)
+            self.stdout.write(f'Synced {synced} movies (last id {last_id})')
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully synced {synced} movies'))
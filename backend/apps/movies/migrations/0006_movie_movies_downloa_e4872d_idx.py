@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0005_movie_cover_image_local_movie_sample_images_local"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["download_count"], name="movies_downloa_e4872d_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0006_movie_movies_downloa_e4872d_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total_movies",
+                    models.BigIntegerField(default=0, verbose_name="影片总数"),
+                ),
+                (
+                    "total_magnets",
+                    models.BigIntegerField(default=0, verbose_name="磁力链接总数"),
+                ),
+                (
+                    "recent_movies",
+                    models.BigIntegerField(default=0, verbose_name="近7天新增影片"),
+                ),
+                (
+                    "sources",
+                    models.JSONField(
+                        default=dict, help_text="{来源: 影片数}", verbose_name="来源分布"
+                    ),
+                ),
+                (
+                    "top_genres",
+                    models.JSONField(
+                        default=list, help_text="[[类型, 影片数], ...]", verbose_name="热门类型"
+                    ),
+                ),
+                (
+                    "top_idols",
+                    models.JSONField(
+                        default=list, help_text="[[演员, 影片数], ...]", verbose_name="热门演员"
+                    ),
+                ),
+                (
+                    "rebuilt_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="全量重建时间"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="更新时间"),
+                ),
+            ],
+            options={
+                "verbose_name": "影片库统计",
+                "verbose_name_plural": "影片库统计",
+                "db_table": "catalog_stats",
+            },
+        ),
+    ]
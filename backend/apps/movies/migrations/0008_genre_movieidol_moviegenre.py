@@ -0,0 +1,149 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0007_catalogstats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Genre",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=100, unique=True, verbose_name="类型名称"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="创建时间"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "类型",
+                "verbose_name_plural": "类型",
+                "db_table": "genres",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="MovieGenre",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="顺序"),
+                ),
+                (
+                    "genre",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="movie_links",
+                        to="movies.genre",
+                        verbose_name="类型",
+                    ),
+                ),
+                (
+                    "movie",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="genre_links",
+                        to="movies.movie",
+                        verbose_name="影片",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "影片类型",
+                "verbose_name_plural": "影片类型",
+                "db_table": "movie_genres",
+                "ordering": ["position"],
+            },
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="genres",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="movies",
+                through="movies.MovieGenre",
+                to="movies.genre",
+                verbose_name="类型",
+            ),
+        ),
+        migrations.CreateModel(
+            name="MovieIdol",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, verbose_name="演员名称")),
+                (
+                    "position",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="顺序"),
+                ),
+                (
+                    "movie",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="idol_credits",
+                        to="movies.movie",
+                        verbose_name="影片",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "影片演员",
+                "verbose_name_plural": "影片演员",
+                "db_table": "movie_idols",
+                "ordering": ["position"],
+                "indexes": [
+                    models.Index(
+                        fields=["name", "movie"], name="movie_idols_name_4e02e4_idx"
+                    )
+                ],
+                "unique_together": {("movie", "name")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="moviegenre",
+            index=models.Index(
+                fields=["genre", "movie"], name="movie_genre_genre_i_1b07de_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="moviegenre",
+            unique_together={("movie", "genre")},
+        ),
+    ]
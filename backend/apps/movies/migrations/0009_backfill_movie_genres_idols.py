@@ -0,0 +1,81 @@
+# 按主键分块回填影片类型/演员关联表
+
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+NAME_MAX_LENGTH = 100
+
+
+def split_names(text):
+    names = []
+    seen = set()
+    for name in (text or "").split(","):
+        name = name.strip()[:NAME_MAX_LENGTH]
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def backfill(apps, schema_editor):
+    Movie = apps.get_model("movies", "Movie")
+    Genre = apps.get_model("movies", "Genre")
+    MovieGenre = apps.get_model("movies", "MovieGenre")
+    MovieIdol = apps.get_model("movies", "MovieIdol")
+
+    genre_ids = {}
+    last_id = 0
+    while True:
+        rows = list(
+            Movie.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", "genre", "jav_idols")[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        new_names = {
+            name
+            for _, genre, _ in rows
+            for name in split_names(genre)
+            if name.lower() not in genre_ids
+        }
+        if new_names:
+            Genre.objects.bulk_create(
+                [Genre(name=name) for name in new_names], ignore_conflicts=True
+            )
+            for name, pk in Genre.objects.filter(name__in=new_names).values_list(
+                "name", "id"
+            ):
+                genre_ids[name.lower()] = pk
+
+        genre_links = []
+        idol_credits = []
+        for movie_id, genre, jav_idols in rows:
+            for position, name in enumerate(split_names(genre)):
+                genre_id = genre_ids.get(name.lower())
+                if genre_id is not None:
+                    genre_links.append(
+                        MovieGenre(
+                            movie_id=movie_id, genre_id=genre_id, position=position
+                        )
+                    )
+            for position, name in enumerate(split_names(jav_idols)):
+                idol_credits.append(
+                    MovieIdol(movie_id=movie_id, name=name, position=position)
+                )
+
+        MovieGenre.objects.bulk_create(genre_links, ignore_conflicts=True)
+        MovieIdol.objects.bulk_create(idol_credits, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0008_genre_movieidol_moviegenre"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# 影片全文检索索引：MySQL 使用 ngram FULLTEXT 索引，SQLite 使用 FTS5 虚拟表
+
+from django.db import migrations
+
+from apps.movies.search import install_sqlite_fts_triggers
+
+COLUMNS = ["censored_id", "movie_title", "jav_idols", "director", "studio", "genre"]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        columns = ", ".join(f"`{column}`" for column in COLUMNS)
+        schema_editor.execute(
+            f"ALTER TABLE `movies` ADD FULLTEXT INDEX `movies_search_ft` ({columns}) "
+            f"WITH PARSER ngram"
+        )
+    elif vendor == "sqlite":
+        columns = ", ".join(COLUMNS)
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE movies_fts USING fts5({columns}, "
+            f"content='movies', content_rowid='id', tokenize='trigram')"
+        )
+        install_sqlite_fts_triggers(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        schema_editor.execute("ALTER TABLE `movies` DROP INDEX `movies_search_ft`")
+    elif vendor == "sqlite":
+        for trigger in ("movies_fts_ai", "movies_fts_ad", "movies_fts_au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        schema_editor.execute("DROP TABLE IF EXISTS movies_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0009_backfill_movie_genres_idols"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
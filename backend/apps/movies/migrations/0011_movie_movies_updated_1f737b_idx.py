@@ -0,0 +1,16 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0010_movie_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(fields=["updated_at"], name="movies_updated_1f737b_idx"),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:42
+
+from django.db import migrations, models
+
+from apps.movies.search import install_sqlite_fts_triggers
+
+
+def reinstall_fts_triggers(apps, schema_editor):
+    # SQLite 上 AddField 重建了 movies 表，FTS5 同步触发器随旧表一起被删除
+    install_sqlite_fts_triggers(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0011_movie_movies_updated_1f737b_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="movie",
+            name="active_magnet_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="有效磁力数"),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="best_magnet_quality",
+            field=models.CharField(
+                blank=True,
+                help_text="有效磁力链接中的最高质量，没有磁力时为空",
+                max_length=10,
+                verbose_name="最佳磁力质量",
+            ),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="has_subtitled_magnet",
+            field=models.BooleanField(default=False, verbose_name="有字幕磁力"),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="max_magnet_seeders",
+            field=models.PositiveIntegerField(default=0, verbose_name="最大做种数"),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["active_magnet_count"], name="movies_active__25b9dc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["best_magnet_quality"], name="movies_best_ma_2d5df1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["has_subtitled_magnet"], name="movies_has_sub_2a2587_idx"
+            ),
+        ),
+        migrations.RunPython(reinstall_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# 按主键分块回填影片的磁力汇总列
+
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+
+# 质量从低到高
+QUALITY_RANK = {"unknown": 0, "sd": 1, "hd": 2, "fhd": 3, "uhd": 4}
+
+
+def backfill(apps, schema_editor):
+    Movie = apps.get_model("movies", "Movie")
+    MagnetLink = apps.get_model("magnets", "MagnetLink")
+
+    last_id = 0
+    while True:
+        ids = list(
+            Movie.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:CHUNK_SIZE]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        summaries = {}
+        for movie_id, quality, has_subtitle, seeders in MagnetLink.objects.filter(
+            movie_id__in=ids, is_active=True
+        ).values_list("movie_id", "quality", "has_subtitle", "seeders"):
+            summary = summaries.setdefault(
+                movie_id,
+                Movie(
+                    pk=movie_id,
+                    active_magnet_count=0,
+                    best_magnet_quality="",
+                    has_subtitled_magnet=False,
+                    max_magnet_seeders=0,
+                ),
+            )
+            summary.active_magnet_count += 1
+            summary.has_subtitled_magnet = summary.has_subtitled_magnet or has_subtitle
+            summary.max_magnet_seeders = max(summary.max_magnet_seeders, seeders)
+            if not summary.best_magnet_quality or QUALITY_RANK.get(
+                quality, 0
+            ) > QUALITY_RANK.get(summary.best_magnet_quality, 0):
+                summary.best_magnet_quality = quality
+
+        Movie.objects.bulk_update(
+            summaries.values(),
+            [
+                "active_magnet_count",
+                "best_magnet_quality",
+                "has_subtitled_magnet",
+                "max_magnet_seeders",
+            ],
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0012_movie_magnet_summary"),
+        ("magnets", "0004_magnetlink_magnet_link_updated_1ec444_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:45
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill(apps, schema_editor):
+    MovieTag = apps.get_model("movies", "MovieTag")
+    rows = MovieTag.movies.through.objects.values("movietag_id").annotate(
+        count=Count("id")
+    )
+    for row in rows:
+        MovieTag.objects.filter(pk=row["movietag_id"]).update(movie_count=row["count"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0013_backfill_movie_magnet_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="movietag",
+            name="movie_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="影片数量"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
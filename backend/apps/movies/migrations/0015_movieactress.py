@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:50
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    Movie = apps.get_model("movies", "Movie")
+    MovieActress = apps.get_model("movies", "MovieActress")
+    MovieActress.objects.update(
+        release_date=Subquery(
+            Movie.objects.filter(pk=OuterRef("movie_id")).values("release_date")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actresses", "0008_actress_photo_flags"),
+        ("movies", "0014_movietag_movie_count"),
+    ]
+
+    operations = [
+        # 已有的 movies_actresses 表保持不变，只在模型状态中改为显式关联表
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="MovieActress",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "actress",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                to="actresses.actress",
+                                verbose_name="女友",
+                            ),
+                        ),
+                        (
+                            "movie",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                to="movies.movie",
+                                verbose_name="影片",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "verbose_name": "影片女友",
+                        "verbose_name_plural": "影片女友",
+                        "db_table": "movies_actresses",
+                        "unique_together": {("movie", "actress")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="movie",
+                    name="actresses",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        help_text="参演此影片的女友",
+                        related_name="movies",
+                        through="movies.MovieActress",
+                        to="actresses.actress",
+                        verbose_name="关联女友",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="movieactress",
+            name="release_date",
+            field=models.DateField(blank=True, null=True, verbose_name="发行日期"),
+        ),
+        migrations.AddIndex(
+            model_name="movieactress",
+            index=models.Index(
+                fields=["actress", "release_date", "movie"],
+                name="movies_actr_actress_10a6b2_idx",
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# 已经执行过旧版 0012 的 SQLite 数据库缺少 FTS5 同步触发器，在此补装并重建索引
+
+from django.db import migrations
+
+from apps.movies.search import install_sqlite_fts_triggers
+
+
+def reinstall_fts_triggers(apps, schema_editor):
+    install_sqlite_fts_triggers(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0015_movieactress"),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:21
+
+from django.db import migrations, models
+
+from apps.movies.search import install_sqlite_fts_triggers
+
+CHUNK_SIZE = 2000
+
+# 与 apps.movies.models.MAGNET_QUALITY_BITS 一致
+QUALITY_BITS = {"sd": 1, "hd": 2, "fhd": 4, "uhd": 8, "unknown": 16}
+
+
+def backfill(apps, schema_editor):
+    """按主键分块回填有效磁力链接的质量掩码"""
+    Movie = apps.get_model("movies", "Movie")
+    MagnetLink = apps.get_model("magnets", "MagnetLink")
+
+    last_id = 0
+    while True:
+        ids = list(
+            Movie.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:CHUNK_SIZE]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        masks = {}
+        for movie_id, quality in MagnetLink.objects.filter(
+            movie_id__in=ids, is_active=True
+        ).values_list("movie_id", "quality"):
+            masks[movie_id] = masks.get(movie_id, 0) | QUALITY_BITS.get(quality, 0)
+
+        Movie.objects.bulk_update(
+            [
+                Movie(pk=movie_id, magnet_quality_mask=mask)
+                for movie_id, mask in masks.items()
+            ],
+            ["magnet_quality_mask"],
+        )
+
+
+def reinstall_fts_triggers(apps, schema_editor):
+    # SQLite 上 AddField 重建了 movies 表，FTS5 同步触发器随旧表一起被删除
+    install_sqlite_fts_triggers(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0016_reinstall_fts_triggers"),
+        ("magnets", "0005_magnetcategory_magnet_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="movie",
+            name="magnet_quality_mask",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="有效磁力链接中出现过的质量，按 MAGNET_QUALITY_BITS 取位",
+                verbose_name="磁力质量掩码",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["magnet_quality_mask"], name="movies_magnet__454ced_idx"
+            ),
+        ),
+        migrations.RunPython(reinstall_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,64 @@
 """
 Movie models for AVBook application.
 """
-from django.db import models
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Greatest, Round
 from django.utils import timezone
 from django.core.validators import RegexValidator
 from django.urls import reverse
 
+from apps.core.relation_counters import CounterFieldsMixin
+from apps.core.response_cache import bump_generation
+
+
+DIMENSION_NAME_MAX_LENGTH = 100
+
+# 同步到类型/演员关联表的文本列
+DIMENSION_TEXT_FIELDS = ('genre', 'jav_idols')
+
+# 加载时被延迟（defer/only）的列在快照中的占位值
+UNLOADED = object()
+
+
+def split_dimension_names(text):
+    """拆分逗号分隔的类型/演员文本，去除空白和重复项并保持原顺序"""
+    names = []
+    seen = set()
+    for name in (text or '').split(','):
+        name = name.strip()[:DIMENSION_NAME_MAX_LENGTH]
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+# 有效磁力链接的质量在 Movie.magnet_quality_mask 中对应的位（与 MagnetQuality 的取值一致）
+MAGNET_QUALITY_BITS = {'sd': 1, 'hd': 2, 'fhd': 4, 'uhd': 8, 'unknown': 16}
+
+
+def magnet_quality_mask(qualities):
+    """质量集合 -> 位掩码"""
+    mask = 0
+    for quality in qualities:
+        mask |= MAGNET_QUALITY_BITS.get(quality, 0)
+    return mask
+
+
+def masks_with_quality(quality):
+    """包含该质量的全部掩码，用于 IN 查询（可以使用掩码列上的索引）；未知的质量返回空列表"""
+    bit = MAGNET_QUALITY_BITS.get(quality)
+    if bit is None:
+        return []
+    return [mask for mask in range(1 << len(MAGNET_QUALITY_BITS)) if mask & bit]
+
+
+def qualities_in_mask(mask):
+    return [quality for quality, bit in MAGNET_QUALITY_BITS.items() if mask & bit]
+
 
 class MovieSource(models.TextChoices):
     """影片来源选择"""
@@ -129,12 +182,22 @@ class Movie(models.Model):
     # 女友关联 (多对多关系)
     actresses = models.ManyToManyField(
         'actresses.Actress',
+        through='MovieActress',
         related_name='movies',
         blank=True,
         verbose_name='关联女友',
         help_text='参演此影片的女友'
     )
 
+    # 类型维度表关联（由 genre 文本同步）
+    genres = models.ManyToManyField(
+        'Genre',
+        through='MovieGenre',
+        related_name='movies',
+        blank=True,
+        verbose_name='类型'
+    )
+
     # 新增字段：影片样例图片
     sample_images = models.TextField(
         blank=True,
@@ -174,6 +237,35 @@ class Movie(models.Model):
         default=0,
         verbose_name='下载次数'
     )
+
+    # 有效磁力链接汇总（由 apps.magnets.summary 维护）
+    active_magnet_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='有效磁力数'
+    )
+
+    best_magnet_quality = models.CharField(
+        max_length=10,
+        blank=True,
+        verbose_name='最佳磁力质量',
+        help_text='有效磁力链接中的最高质量，没有磁力时为空'
+    )
+
+    magnet_quality_mask = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='磁力质量掩码',
+        help_text='有效磁力链接中出现过的质量，按 MAGNET_QUALITY_BITS 取位'
+    )
+
+    has_subtitled_magnet = models.BooleanField(
+        default=False,
+        verbose_name='有字幕磁力'
+    )
+
+    max_magnet_seeders = models.PositiveIntegerField(
+        default=0,
+        verbose_name='最大做种数'
+    )
     
     # 时间戳
     created_at = models.DateTimeField(
@@ -197,6 +289,13 @@ class Movie(models.Model):
             models.Index(fields=['release_date']),
             models.Index(fields=['created_at']),
             models.Index(fields=['view_count']),
+            # InnoDB 二级索引隐含主键，可直接支撑 (字段, id) 游标分页
+            models.Index(fields=['download_count']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['active_magnet_count']),
+            models.Index(fields=['best_magnet_quality']),
+            models.Index(fields=['magnet_quality_mask']),
+            models.Index(fields=['has_subtitled_magnet']),
         ]
     
     def __str__(self):
@@ -205,26 +304,113 @@ class Movie(models.Model):
     def get_absolute_url(self):
         return reverse('movie-detail', kwargs={'pk': self.pk})
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 记录加载时的类型/演员文本，保存时据此判断是否需要同步维度表；延迟加载的列记为 UNLOADED
+        deferred = instance.get_deferred_fields()
+        instance._dimension_snapshot = {
+            name: UNLOADED if name in deferred else instance.__dict__.get(name)
+            for name in DIMENSION_TEXT_FIELDS
+        }
+        return instance
+
     def save(self, *args, **kwargs):
         # 自动生成code_36
         if not self.code_36 and self.censored_id:
             import hashlib
             self.code_36 = hashlib.md5(self.censored_id.encode()).hexdigest()[:6]
         super().save(*args, **kwargs)
-    
+
+        if self.dimensions_changed(kwargs.get('update_fields')):
+            self.sync_dimensions()
+
+    def dimensions_changed(self, update_fields=None):
+        """
+        类型/演员文本是否相对加载时发生变化。
+
+        从未加载（仍是延迟字段）的列不参与比较，避免访问时触发额外查询；
+        加载时延迟、之后被赋值的列视为已变化。新建的影片视为从空文本开始。
+        """
+        snapshot = getattr(self, '_dimension_snapshot', None) or {}
+        deferred = self.get_deferred_fields()
+        for name in DIMENSION_TEXT_FIELDS:
+            if update_fields is not None and name not in update_fields:
+                continue
+            if name in deferred:
+                continue
+            before = snapshot.get(name, '')
+            if before is UNLOADED or before != getattr(self, name):
+                return True
+        return False
+
+    def sync_dimensions(self):
+        """根据 genre / jav_idols 文本同步类型和演员关联表"""
+        Movie.sync_dimensions_bulk([self])
+        self._dimension_snapshot = {name: getattr(self, name) for name in DIMENSION_TEXT_FIELDS}
+
+    @classmethod
+    def sync_dimensions_bulk(cls, movies):
+        """批量同步多部影片的类型和演员关联表"""
+        movies = [movie for movie in movies if movie.pk]
+        if not movies:
+            return
+
+        genre_names = {
+            name: None for movie in movies for name in split_dimension_names(movie.genre)
+        }
+        with transaction.atomic():
+            Genre.objects.bulk_create(
+                [Genre(name=name) for name in genre_names], ignore_conflicts=True
+            )
+            genre_ids = {
+                name.lower(): pk
+                for name, pk in Genre.objects.filter(name__in=list(genre_names)).values_list('name', 'id')
+            }
+
+            movie_ids = [movie.pk for movie in movies]
+            MovieGenre.objects.filter(movie_id__in=movie_ids).delete()
+            MovieIdol.objects.filter(movie_id__in=movie_ids).delete()
+
+            genre_links = []
+            idol_credits = []
+            for movie in movies:
+                for position, name in enumerate(split_dimension_names(movie.genre)):
+                    genre_id = genre_ids.get(name.lower())
+                    if genre_id is not None:
+                        genre_links.append(
+                            MovieGenre(movie_id=movie.pk, genre_id=genre_id, position=position)
+                        )
+                for position, name in enumerate(split_dimension_names(movie.jav_idols)):
+                    idol_credits.append(MovieIdol(movie_id=movie.pk, name=name, position=position))
+
+            MovieGenre.objects.bulk_create(genre_links, ignore_conflicts=True)
+            MovieIdol.objects.bulk_create(idol_credits, ignore_conflicts=True)
+
+    def _is_prefetched(self, relation):
+        return relation in getattr(self, '_prefetched_objects_cache', {})
+
     @property
     def genre_list(self):
-        """返回类型列表"""
-        if self.genre:
-            return [g.strip() for g in self.genre.split(',') if g.strip()]
-        return []
+        """返回类型列表（读取类型关联表）"""
+        if self.pk:
+            if self._is_prefetched('genre_links'):
+                links = self.genre_links.all()
+            else:
+                links = self.genre_links.select_related('genre')
+            names = [link.genre.name for link in links]
+            if names or not self.genre:
+                return names
+        return split_dimension_names(self.genre)
     
     @property
     def idol_list(self):
-        """返回演员列表"""
-        if self.jav_idols:
-            return [idol.strip() for idol in self.jav_idols.split(',') if idol.strip()]
-        return []
+        """返回演员列表（读取演员关联表）"""
+        if self.pk:
+            names = [credit.name for credit in self.idol_credits.all()]
+            if names or not self.jav_idols:
+                return names
+        return split_dimension_names(self.jav_idols)
 
     @property
     def sample_images_list(self):
@@ -245,28 +431,182 @@ class Movie(models.Model):
         return [actress.name for actress in self.actresses.all()]
 
     def add_actress_by_name(self, actress_name):
-        """根据姓名添加女友关联"""
-        from apps.actresses.models import Actress
-        try:
-            actress = Actress.objects.get(name=actress_name)
-            self.actresses.add(actress)
-            return True
-        except Actress.DoesNotExist:
+        """根据姓名、英文名或别名添加女友关联"""
+        from apps.actresses.resolver import resolve_actress_id
+        # 写入关联只接受精确匹配，并确认女友仍然存在
+        actress_id = resolve_actress_id(actress_name)
+        if actress_id is None:
             return False
+        self.actresses.add(actress_id)
+        return True
     
     def increment_view_count(self):
-        """增加浏览次数"""
+        """增加浏览次数（缓冲后批量写回）"""
         self.view_count += 1
-        self.save(update_fields=['view_count'])
+        Movie.record_view(self.pk)
+
+    @classmethod
+    def record_view(cls, pk):
+        """按主键记录一次浏览，无需加载影片"""
+        from apps.core.counters import counter_buffer
+        from .trending import EVENT_VIEW, record_event
+        counter_buffer.incr(cls, pk, 'view_count')
+        record_event(pk, EVENT_VIEW)
     
     def increment_download_count(self):
-        """增加下载次数"""
+        """增加下载次数（缓冲后批量写回）"""
+        from apps.core.counters import counter_buffer
+        from .trending import EVENT_DOWNLOAD, record_event
         self.download_count += 1
-        self.save(update_fields=['download_count'])
+        counter_buffer.incr(Movie, self.pk, 'download_count')
+        record_event(self.pk, EVENT_DOWNLOAD)
+
+
+class Genre(models.Model):
+    """影片类型"""
+
+    name = models.CharField(
+        max_length=DIMENSION_NAME_MAX_LENGTH,
+        unique=True,
+        verbose_name='类型名称'
+    )
+
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='创建时间'
+    )
+
+    class Meta:
+        db_table = 'genres'
+        verbose_name = '类型'
+        verbose_name_plural = '类型'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
 
+class MovieGenre(models.Model):
+    """影片-类型关联"""
+
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='genre_links',
+        verbose_name='影片'
+    )
+
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        related_name='movie_links',
+        db_index=False,
+        verbose_name='类型'
+    )
+
+    position = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='顺序'
+    )
+
+    class Meta:
+        db_table = 'movie_genres'
+        verbose_name = '影片类型'
+        verbose_name_plural = '影片类型'
+        ordering = ['position']
+        unique_together = ['movie', 'genre']
+        indexes = [
+            # 按类型筛选影片时走覆盖索引
+            models.Index(fields=['genre', 'movie']),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} - {self.genre_id}"
+
+
+class MovieIdol(models.Model):
+    """影片署名演员（由 jav_idols 文本同步）"""
+
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='idol_credits',
+        db_index=False,
+        verbose_name='影片'
+    )
 
-class MovieTag(models.Model):
+    name = models.CharField(
+        max_length=DIMENSION_NAME_MAX_LENGTH,
+        verbose_name='演员名称'
+    )
+
+    position = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='顺序'
+    )
+
+    class Meta:
+        db_table = 'movie_idols'
+        verbose_name = '影片演员'
+        verbose_name_plural = '影片演员'
+        ordering = ['position']
+        unique_together = ['movie', 'name']
+        indexes = [
+            # 按演员名筛选影片时走覆盖索引
+            models.Index(fields=['name', 'movie']),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} - {self.name}"
+
+
+class MovieActress(models.Model):
+    """影片-女友关联，冗余影片的发行日期用于按女友分页读取作品"""
+
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        verbose_name='影片'
+    )
+
+    actress = models.ForeignKey(
+        'actresses.Actress',
+        on_delete=models.CASCADE,
+        verbose_name='女友'
+    )
+
+    # 与 Movie.release_date 保持一致（由信号同步）
+    release_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='发行日期'
+    )
+
+    class Meta:
+        db_table = 'movies_actresses'
+        verbose_name = '影片女友'
+        verbose_name_plural = '影片女友'
+        unique_together = ['movie', 'actress']
+        indexes = [
+            # 女友作品按 (发行日期, 影片) 键集分页，只读索引
+            models.Index(fields=['actress', 'release_date', 'movie']),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} - {self.actress_id}"
+
+    @classmethod
+    def sync_release_dates(cls, **filters):
+        """把影片的发行日期复制到匹配的关联行"""
+        return cls.objects.filter(**filters).update(release_date=Subquery(
+            Movie.objects.filter(pk=OuterRef('movie_id')).values('release_date')[:1]
+        ))
+
+
+class MovieTag(CounterFieldsMixin, models.Model):
     """影片标签"""
+
+    counter_fields = ('movie_count',)
     
     name = models.CharField(
         max_length=50,
@@ -298,6 +638,12 @@ class MovieTag(models.Model):
         blank=True,
         verbose_name='关联影片'
     )
+
+    # 由 m2m_changed 信号增量维护
+    movie_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='影片数量'
+    )
     
     created_at = models.DateTimeField(
         default=timezone.now,
@@ -314,6 +660,15 @@ class MovieTag(models.Model):
         return self.name
 
 
+RATING_STAR_FIELDS = {
+    5: 'five_star',
+    4: 'four_star',
+    3: 'three_star',
+    2: 'two_star',
+    1: 'one_star',
+}
+
+
 class MovieRating(models.Model):
     """影片评分"""
     
@@ -376,3 +731,232 @@ class MovieRating(models.Model):
             self.average_rating = 0.00
         
         self.save()
+
+    @classmethod
+    def vote_updates(cls, votes):
+        """
+        构造一次投票（或一批投票）的 UPDATE 赋值。
+
+        votes 为 {星级: 票数}。平均分用更新前的各星级票数加上本次增量计算，
+        并放在第一个赋值：MySQL 按顺序执行 SET，后面的赋值会读到新值。
+        """
+        added_points = sum(star * count for star, count in votes.items())
+        added_votes = sum(votes.values())
+
+        points = Value(added_points)
+        total = Value(added_votes)
+        for star, field in RATING_STAR_FIELDS.items():
+            points = points + F(field) * star
+            total = total + F(field)
+
+        updates = {
+            'average_rating': Round(
+                Cast(points, FloatField()) / total, 2, output_field=FloatField()
+            ),
+        }
+        for star, count in votes.items():
+            if count:
+                field = RATING_STAR_FIELDS[star]
+                updates[field] = F(field) + count
+        updates['total_votes'] = F('total_votes') + added_votes
+        updates['updated_at'] = timezone.now()
+        return updates
+
+    @classmethod
+    def bump_generation_on_commit(cls):
+        """queryset update() 不触发信号，提交后使依赖评分的响应缓存和 ETag 失效"""
+        label = cls._meta.label
+        transaction.on_commit(lambda: bump_generation(label))
+
+    @classmethod
+    def add_votes(cls, movie_id, votes):
+        """
+        原子地累加投票，评分行不存在时创建。
+
+        只执行一条 UPDATE，不读取旧值，并发投票不会互相覆盖。
+        """
+        votes = {star: count for star, count in votes.items() if count}
+        if not votes:
+            return
+        updates = cls.vote_updates(votes)
+        cls.bump_generation_on_commit()
+        if cls.objects.filter(movie_id=movie_id).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(movie_id=movie_id)
+        except IntegrityError:
+            # 并发请求已经创建了评分行
+            pass
+        cls.objects.filter(movie_id=movie_id).update(**updates)
+
+    @classmethod
+    def add_votes_bulk(cls, votes_by_movie):
+        """
+        批量导入投票，votes_by_movie 为 {movie_id: {星级: 票数}}。
+
+        先一次性补齐缺失的评分行，再在一个事务中执行 UPDATE；
+        票数分布相同的影片合并为一条语句。返回执行的 UPDATE 数量。
+        """
+        groups = {}
+        for movie_id, votes in votes_by_movie.items():
+            key = tuple(sorted((star, count) for star, count in votes.items() if count))
+            if key:
+                groups.setdefault(key, []).append(movie_id)
+        if not groups:
+            return 0
+
+        movie_ids = [movie_id for ids in groups.values() for movie_id in ids]
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [cls(movie_id=movie_id) for movie_id in movie_ids],
+                ignore_conflicts=True,
+                batch_size=1000,
+            )
+            for key, ids in groups.items():
+                cls.objects.filter(movie_id__in=ids).update(**cls.vote_updates(dict(key)))
+            cls.bump_generation_on_commit()
+        return len(groups)
+
+
+class CatalogStats(models.Model):
+    """
+    影片库统计（读模型）
+
+    只有一行。影片和磁力链接写入时通过信号增量更新总数：同一事务内的增量先在内存中合并，
+    提交后执行一条不加锁的 UPDATE ... SET total = total + n。
+    近期新增数、来源分布、热门类型/演员只由定时任务全量重建，批量写入造成的偏差同样由重建修正。
+    """
+
+    SINGLETON_ID = 1
+    RECENT_DAYS = 7
+    TOP_LIMIT = 10
+
+    total_movies = models.BigIntegerField(default=0, verbose_name='影片总数')
+    total_magnets = models.BigIntegerField(default=0, verbose_name='磁力链接总数')
+    recent_movies = models.BigIntegerField(default=0, verbose_name='近7天新增影片')
+
+    sources = models.JSONField(
+        default=dict,
+        verbose_name='来源分布',
+        help_text='{来源: 影片数}'
+    )
+
+    top_genres = models.JSONField(
+        default=list,
+        verbose_name='热门类型',
+        help_text='[[类型, 影片数], ...]'
+    )
+
+    top_idols = models.JSONField(
+        default=list,
+        verbose_name='热门演员',
+        help_text='[[演员, 影片数], ...]'
+    )
+
+    rebuilt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='全量重建时间'
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='更新时间'
+    )
+
+    class Meta:
+        db_table = 'catalog_stats'
+        verbose_name = '影片库统计'
+        verbose_name_plural = '影片库统计'
+
+    def __str__(self):
+        return f"影片 {self.total_movies} / 磁力 {self.total_magnets}"
+
+    @classmethod
+    def apply_delta(cls, movies=0, magnets=0):
+        """一条 UPDATE 增量更新总数，不读取也不锁定统计行；统计行尚未建立时不更新（由全量重建生成）"""
+        updates = {}
+        if movies:
+            updates['total_movies'] = Greatest(F('total_movies') + movies, Value(0))
+        if magnets:
+            updates['total_magnets'] = Greatest(F('total_magnets') + magnets, Value(0))
+        if updates:
+            cls.objects.filter(pk=cls.SINGLETON_ID).update(updated_at=timezone.now(), **updates)
+
+    @classmethod
+    def record_delta(cls, movies=0, magnets=0):
+        """
+        记录一次增量，在当前事务提交后写回。
+
+        同一事务中的增量合并为一次 apply_delta（如删除带 N 个磁力链接的影片只执行一条 UPDATE），
+        回滚的事务不会写回；不在事务中时立即写回。
+        """
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            cls.apply_delta(movies=movies, magnets=magnets)
+            return
+        for entry in connection.run_on_commit:
+            if isinstance(entry[1], CatalogStatsDelta):
+                delta = entry[1]
+                break
+        else:
+            delta = CatalogStatsDelta()
+            transaction.on_commit(delta)
+        delta.movies += movies
+        delta.magnets += magnets
+
+    @classmethod
+    def rebuild(cls):
+        """全量重建统计（包括只由重建维护的近期新增数和来源分布）"""
+        from apps.magnets.models import MagnetLink
+
+        top_genres = (
+            MovieGenre.objects.values('genre__name')
+            .annotate(count=Count('id'))
+            .order_by('-count')[:cls.TOP_LIMIT]
+        )
+        top_idols = (
+            MovieIdol.objects.values('name')
+            .annotate(count=Count('id'))
+            .order_by('-count')[:cls.TOP_LIMIT]
+        )
+
+        sources = {
+            row['source']: row['count']
+            for row in Movie.objects.order_by().values('source').annotate(count=Count('id'))
+        }
+        recent_since = timezone.now() - timedelta(days=cls.RECENT_DAYS)
+
+        stats, _ = cls.objects.update_or_create(
+            pk=cls.SINGLETON_ID,
+            defaults={
+                'total_movies': sum(sources.values()),
+                'total_magnets': MagnetLink.objects.count(),
+                'recent_movies': Movie.objects.filter(created_at__gte=recent_since).count(),
+                'sources': sources,
+                'top_genres': [[row['genre__name'], row['count']] for row in top_genres],
+                'top_idols': [[row['name'], row['count']] for row in top_idols],
+                'rebuilt_at': timezone.now(),
+            }
+        )
+        return stats
+
+    @classmethod
+    def get_current(cls):
+        """获取统计行，不存在时立即重建一次"""
+        stats = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if stats is None:
+            stats = cls.rebuild()
+        return stats
+
+
+class CatalogStatsDelta:
+    """一个事务中累计的影片库统计增量，提交时写回"""
+
+    def __init__(self):
+        self.movies = 0
+        self.magnets = 0
+
+    def __call__(self):
+        CatalogStats.apply_delta(movies=self.movies, magnets=self.magnets)
@@ -2,17 +2,28 @@
 Custom pagination for movies API.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class MoviePagination(PageNumberPagination):
     """Movie pagination class"""
-    
+
     page_size = 12
     page_size_query_param = 'page_size'
     max_page_size = 100
-    
+
     def get_paginated_response(self, data):
         return Response({
             'count': self.page.paginator.count,
@@ -23,3 +34,225 @@ class MoviePagination(PageNumberPagination):
             'page_size': self.page_size,
             'results': data
         })
+
+
+class MovieCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination for movies.
+
+    按 (排序字段, id) 做键集分页，不执行 COUNT(*) 也不使用 OFFSET，
+    每页的代价与翻到第几页无关。NULL 值视为最小值。
+    """
+
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    total_query_param = 'include_total'
+    page_size = 12
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    ordering_fields = ('created_at', 'release_date', 'view_count', 'download_count')
+    default_ordering = '-created_at'
+
+    # 排序值相同时用于确定顺序的唯一列
+    tiebreaker = 'id'
+
+    # 近似总数的缓存时间（秒）
+    total_cache_timeout = 300
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.field = self.ordering.lstrip('-')
+        self.descending = self.ordering.startswith('-')
+
+        cursor = self.decode_cursor(request)
+        self.reverse = cursor['r'] if cursor else False
+
+        base_queryset = queryset
+        if cursor:
+            queryset = queryset.filter(self.get_keyset_filter(cursor))
+        queryset = queryset.order_by(*self.get_order_by(self.reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.first = results[0] if results else None
+        self.last = results[-1] if results else None
+        self.total = self.get_approximate_total(base_queryset) if self.wants_total(request) else None
+        return results
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('next_cursor', self.get_next_cursor()),
+            ('previous_cursor', self.get_previous_cursor()),
+            ('ordering', self.ordering),
+            ('page_size', self.page_size),
+        ])
+        if self.total is not None:
+            payload['count'] = self.total
+        payload['results'] = data
+        return Response(payload)
+
+    def get_page_size(self, request):
+        """获取每页数量"""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """获取排序字段，只允许有索引支撑的字段"""
+        ordering = request.query_params.get(self.ordering_query_param, '')
+        ordering = ordering.split(',')[0].strip()
+        if ordering.lstrip('-') in self.ordering_fields:
+            return ordering
+        return self.default_ordering
+
+    def get_order_by(self, reverse=False):
+        """构造 (字段, id) 排序，NULL 值排在最小的一端"""
+        descending = self.descending != reverse
+        if descending:
+            return [F(self.field).desc(nulls_last=True), f'-{self.tiebreaker}']
+        return [F(self.field).asc(nulls_first=True), self.tiebreaker]
+
+    def get_keyset_filter(self, cursor):
+        """构造游标位置之后的过滤条件"""
+        value, pk = cursor['v'], cursor['id']
+        descending = self.descending != cursor['r']
+        field, tiebreaker = self.field, self.tiebreaker
+
+        if descending:
+            if value is None:
+                return Q(**{f'{field}__isnull': True, f'{tiebreaker}__lt': pk})
+            return (
+                Q(**{f'{field}__lt': value}) |
+                Q(**{field: value, f'{tiebreaker}__lt': pk}) |
+                Q(**{f'{field}__isnull': True})
+            )
+
+        if value is None:
+            return (
+                Q(**{f'{field}__isnull': True, f'{tiebreaker}__gt': pk}) |
+                Q(**{f'{field}__isnull': False})
+            )
+        return Q(**{f'{field}__gt': value}) | Q(**{field: value, f'{tiebreaker}__gt': pk})
+
+    def encode_cursor(self, instance, reverse):
+        """把游标编码为不透明字符串（instance 也可以是 values() 行）"""
+        if isinstance(instance, dict):
+            value, pk = instance[self.field], instance[self.tiebreaker]
+        else:
+            value, pk = getattr(instance, self.field), getattr(instance, self.tiebreaker)
+        if value is not None and hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        data = {'o': self.ordering, 'v': value, 'id': pk, 'r': reverse}
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        """解析游标，游标与当前排序不一致时视为无效"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if data['o'] != self.ordering:
+                raise ValueError('cursor ordering mismatch')
+            value = data['v']
+            if value is not None:
+                value = self.model._meta.get_field(self.field).to_python(value)
+            return {'v': value, 'id': int(data['id']), 'r': bool(data.get('r', False))}
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound('无效的游标')
+
+    def get_next_cursor(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_cursor(self):
+        if not self.has_previous or self.first is None:
+            return None
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        cursor = self.get_previous_cursor()
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def wants_total(self, request):
+        return request.query_params.get(self.total_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_approximate_total(self, queryset):
+        """
+        获取近似总数。
+
+        未过滤时在 MySQL 上读取 information_schema 的行数估计；
+        过滤时执行一次 COUNT 并按查询语句缓存一段时间。
+        """
+        if not queryset.query.where and connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                    'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] is not None:
+                return int(row[0])
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.md5(f'{sql}|{params}'.encode('utf-8')).hexdigest()
+        cache_key = f'movies:approx_total:{digest}'
+        total = cache.get(cache_key)
+        if total is None:
+            total = queryset.order_by().count()
+            cache.set(cache_key, total, self.total_cache_timeout)
+        return total
+
+    def to_html(self):
+        return ''
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': '分页游标',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': '每页数量',
+                'schema': {'type': 'integer'},
+            },
+        ]
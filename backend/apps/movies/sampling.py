@@ -0,0 +1,164 @@
+"""
+Random sampling of movies without ORDER BY RAND().
+
+从主键范围（或 Redis 中定期刷新的主键池）随机抽取候选主键，
+用一次 IN 查询取回满足当前过滤条件的影片，不足时继续补抽；
+仍然不足时从随机主键起按主键顺序取有限数量的结果再抽样。
+"""
+
+import logging
+import random
+
+from django.db.models import Max, Min
+
+from apps.core.redis_client import get_redis_client, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+ID_POOL_KEY = 'movies:id_pool'
+
+
+class RandomSampler:
+    """随机抽样器"""
+
+    max_rounds = 5
+    # 单轮最多抽取的候选主键数量
+    max_candidates = 5000
+    # 命中率的下限估计，避免命中率很低时候选数量爆炸
+    min_hit_rate = 0.01
+    # 兜底时每个缺额最多读取的主键数量
+    fallback_factor = 20
+
+    def __init__(self, pool_key=ID_POOL_KEY, rng=None):
+        self.pool_key = pool_key
+        self.rng = rng or random.SystemRandom()
+
+    def sample_ids(self, queryset, count):
+        """返回最多 count 个随机主键（保持随机顺序）"""
+        if count <= 0:
+            return []
+
+        draw = self.get_drawer(queryset)
+        picked = []
+        seen = set()
+        hit_rate = 0.5
+
+        for _ in range(self.max_rounds):
+            need = count - len(picked)
+            if need <= 0 or draw is None:
+                break
+            size = min(int(need / max(hit_rate, self.min_hit_rate)) + 1, self.max_candidates)
+            candidates = set(draw(size)) - seen
+            if not candidates:
+                break
+            seen |= candidates
+
+            found = list(
+                queryset.filter(pk__in=candidates).order_by().values_list('pk', flat=True)
+            )
+            hit_rate = len(found) / len(candidates)
+            self.rng.shuffle(found)
+            picked.extend(found[:need])
+
+        if len(picked) < count:
+            # 过滤后结果很少时命中率太低，直接在结果集的一段主键中抽样
+            need = count - len(picked)
+            rest = self.fallback_ids(queryset.exclude(pk__in=picked), need * self.fallback_factor)
+            picked.extend(self.rng.sample(rest, min(need, len(rest))))
+
+        return picked
+
+    def fallback_ids(self, queryset, limit):
+        """从随机主键起按主键顺序取最多 limit 个主键，到末尾后从头补足"""
+        bounds = queryset.model.objects.order_by().aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            return []
+        pivot = self.rng.randint(bounds['low'], bounds['high'])
+        ids = list(
+            queryset.filter(pk__gte=pivot).order_by('pk').values_list('pk', flat=True)[:limit]
+        )
+        if len(ids) < limit:
+            ids.extend(
+                queryset.filter(pk__lt=pivot).order_by('pk')
+                .values_list('pk', flat=True)[:limit - len(ids)]
+            )
+        return ids
+
+    def sample(self, queryset, count):
+        """返回随机影片列表"""
+        ids = self.sample_ids(queryset, count)
+        objects = queryset.filter(pk__in=ids).order_by().in_bulk()
+        return [objects[pk] for pk in ids if pk in objects]
+
+    def get_drawer(self, queryset):
+        """优先使用 Redis 主键池，否则按主键范围抽取"""
+        drawer = self.pool_drawer()
+        if drawer is not None:
+            return drawer
+        return self.range_drawer(queryset)
+
+    def pool_drawer(self):
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            if not client.exists(self.pool_key):
+                return None
+        except Exception as e:
+            logger.warning('Redis id pool unavailable: %s', e)
+            mark_redis_failed()
+            return None
+
+        def draw(size):
+            try:
+                return [int(pk) for pk in client.srandmember(self.pool_key, size)]
+            except Exception as e:
+                logger.warning('Redis id pool unavailable: %s', e)
+                mark_redis_failed()
+                return []
+
+        return draw
+
+    def range_drawer(self, queryset):
+        bounds = queryset.model.objects.order_by().aggregate(low=Min('pk'), high=Max('pk'))
+        low, high = bounds['low'], bounds['high']
+        if low is None:
+            return None
+
+        def draw(size):
+            size = min(size, high - low + 1)
+            return self.rng.sample(range(low, high + 1), size)
+
+        return draw
+
+
+def refresh_id_pool(model, pool_key=ID_POOL_KEY, chunk_size=5000):
+    """
+    重建 Redis 主键池。
+
+    写入临时 key 后 RENAME，读取方始终看到完整的主键池。
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    tmp_key = f'{pool_key}:building'
+    client.delete(tmp_key)
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        client.sadd(tmp_key, *ids)
+        total += len(ids)
+        last_id = ids[-1]
+
+    if total:
+        client.rename(tmp_key, pool_key)
+    else:
+        client.delete(pool_key)
+    return total
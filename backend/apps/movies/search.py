@@ -0,0 +1,169 @@
+"""
+Movie search backends.
+
+根据数据库选择全文检索实现：MySQL 使用 ngram 解析器的 FULLTEXT 索引，
+SQLite（测试/本地开发）使用 FTS5 trigram 虚拟表，其他数据库退回到 LIKE 查询。
+可以通过 MOVIE_SEARCH_BACKEND 配置指定后端类的导入路径。
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, Case, FloatField, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+
+# 参与全文检索的列
+SEARCH_COLUMNS = ['censored_id', 'movie_title', 'jav_idols', 'director', 'studio', 'genre']
+
+# 全文索引/虚拟表名称
+FULLTEXT_INDEX_NAME = 'movies_search_ft'
+FTS_TABLE_NAME = 'movies_fts'
+FTS_TRIGGER_NAMES = ('movies_fts_ai', 'movies_fts_ad', 'movies_fts_au')
+
+
+def install_sqlite_fts_triggers(schema_editor):
+    """
+    （重新）创建 SQLite FTS5 同步触发器并重建索引。
+
+    SQLite 上的 AddField/AlterField 等操作会重建 movies 表，表上的触发器随之丢失；
+    之后重建 movies 表的迁移需要在末尾调用本函数。其他数据库不做任何操作。
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+    for trigger in FTS_TRIGGER_NAMES:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    schema_editor.execute(
+        f'CREATE TRIGGER movies_fts_ai AFTER INSERT ON movies BEGIN '
+        f'INSERT INTO {FTS_TABLE_NAME}(rowid, {columns}) VALUES (new.id, {new_values}); END'
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER movies_fts_ad AFTER DELETE ON movies BEGIN '
+        f'INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {columns}) '
+        f"VALUES ('delete', old.id, {old_values}); END"
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER movies_fts_au AFTER UPDATE ON movies BEGIN '
+        f'INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {columns}) '
+        f"VALUES ('delete', old.id, {old_values}); "
+        f'INSERT INTO {FTS_TABLE_NAME}(rowid, {columns}) VALUES (new.id, {new_values}); END'
+    )
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')")
+
+
+class BaseSearchBackend:
+    """搜索后端基类"""
+
+    def search(self, queryset, query):
+        """
+        返回按相关度排序的查询集。
+
+        编号完全匹配的影片始终排在最前，其次按 search_rank 降序。
+        """
+        query = query.strip()
+        if not query:
+            return queryset
+        queryset = self.filter(queryset, query)
+        return queryset.annotate(
+            exact_match=Case(
+                When(censored_id=query.upper(), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        ).order_by('-exact_match', '-search_rank', '-id')
+
+    def filter(self, queryset, query):
+        """过滤并添加 search_rank 注解，由子类实现"""
+        raise NotImplementedError
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """LIKE 查询后端，没有全文索引时使用"""
+
+    def filter(self, queryset, query):
+        condition = Q()
+        for column in SEARCH_COLUMNS:
+            condition |= Q(**{f'{column}__icontains': query})
+        return queryset.filter(condition).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+
+class MySQLFulltextSearchBackend(BaseSearchBackend):
+    """
+    MySQL FULLTEXT（ngram 解析器）后端
+
+    自然语言模式会把查询拆成的各个 ngram 取并集（'ABC-123' 匹配所有含 'AB' 或 '12' 的行），
+    这里使用布尔模式的短语查询，要求 ngram 连续出现，与 icontains 的子串语义一致。
+    """
+
+    # 短于 ngram_token_size（默认 2）的查询无法用全文索引匹配
+    min_query_length = 2
+
+    def match_sql(self):
+        columns = ', '.join(f'`{column}`' for column in SEARCH_COLUMNS)
+        return f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)'
+
+    def boolean_query(self, query):
+        """把用户输入转为布尔模式的短语查询；短语内无法转义双引号，替换为空格"""
+        return '"{}"'.format(query.replace('"', ' '))
+
+    def filter(self, queryset, query):
+        if len(query) < self.min_query_length:
+            return IContainsSearchBackend().filter(queryset, query)
+
+        sql = self.match_sql()
+        phrase = self.boolean_query(query)
+        # WHERE 与 SELECT 中相同的 MATCH 表达式只计算一次，相关度仍用于排序
+        return queryset.filter(
+            RawSQL(sql, [phrase], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(sql, [phrase], output_field=FloatField())
+        )
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """SQLite FTS5（trigram 分词）后端"""
+
+    # trigram 分词器无法匹配少于 3 个字符的查询
+    min_query_length = 3
+
+    def fts_query(self, query):
+        """把用户输入转为 FTS5 短语查询，避免语法字符被解释"""
+        return '"{}"'.format(query.replace('"', '""'))
+
+    def filter(self, queryset, query):
+        if len(query) < self.min_query_length:
+            return IContainsSearchBackend().filter(queryset, query)
+
+        match = self.fts_query(query)
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH %s', [match]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'(SELECT -bm25({FTS_TABLE_NAME}) FROM {FTS_TABLE_NAME} '
+                f'WHERE {FTS_TABLE_NAME} MATCH %s AND rowid = "{table}"."id")',
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+
+VENDOR_BACKENDS = {
+    'mysql': MySQLFulltextSearchBackend,
+    'sqlite': SQLiteFTS5SearchBackend,
+}
+
+
+def get_search_backend():
+    """获取当前配置的搜索后端"""
+    backend_path = getattr(settings, 'MOVIE_SEARCH_BACKEND', '')
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, IContainsSearchBackend)()
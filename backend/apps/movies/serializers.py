@@ -2,22 +2,41 @@
 Movie serializers for AVBook API.
 """
 
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import Movie, MovieTag, MovieRating
+
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
+from .models import Movie, MovieTag, MovieRating, MovieGenre
+
+
+# 列表中演员信息只输出这些字段
+ACTRESS_SUMMARY_FIELDS = [
+    'id', 'name', 'profile_image', 'profile_image_local', 'cup_size', 'height', 'birth_date'
+]
+
+# 卡片（网格列表）只需要的字段
+MOVIE_CARD_FIELDS = [
+    'id', 'censored_id', 'movie_title', 'cover_image', 'cover_image_local',
+    'release_date', 'studio', 'duration_minutes',
+]
+
+# 计算字段依赖的模型列，用于 defer 不需要的 TextField
+MOVIE_FIELD_SOURCES = {
+    'genre_list': ['genre'],
+    'idol_list': ['jav_idols'],
+    'sample_images_list': ['sample_images'],
+    'sample_images_local_list': ['sample_images_local'],
+    'movie_tags_list': ['movie_tags'],
+}
 
 
 class MovieTagSerializer(serializers.ModelSerializer):
     """影片标签序列化器"""
     
-    movie_count = serializers.SerializerMethodField()
-    
     class Meta:
         model = MovieTag
         fields = ['id', 'name', 'slug', 'description', 'color', 'movie_count', 'created_at']
-    
-    def get_movie_count(self, obj):
-        """获取标签下的影片数量"""
-        return obj.movies.count()
+        read_only_fields = ['movie_count']
 
 
 class MovieRatingSerializer(serializers.ModelSerializer):
@@ -34,12 +53,12 @@ class MovieRatingSerializer(serializers.ModelSerializer):
         ]
 
 
-class MovieSerializer(serializers.ModelSerializer):
+class MovieSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """影片序列化器（列表视图）"""
 
     tags = MovieTagSerializer(many=True, read_only=True)
     rating = MovieRatingSerializer(read_only=True)
-    magnet_count = serializers.SerializerMethodField()
+    magnet_count = serializers.IntegerField(source='active_magnet_count', read_only=True)
     genre_list = serializers.ReadOnlyField()
     idol_list = serializers.ReadOnlyField()
     actresses = serializers.SerializerMethodField()
@@ -57,10 +76,36 @@ class MovieSerializer(serializers.ModelSerializer):
             'sample_images_local_list', 'movie_tags_list', 'tags', 'rating',
             'magnet_count', 'genre_list', 'idol_list', 'created_at', 'updated_at'
         ]
-    
-    def get_magnet_count(self, obj):
-        """获取磁力链接数量"""
-        return obj.magnets.filter(is_active=True).count()
+        field_presets = {'card': MOVIE_CARD_FIELDS}
+        field_sources = MOVIE_FIELD_SOURCES
+
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        """
+        预加载序列化所需的关联数据，使整页的查询数量保持恒定。
+
+        fields 为请求选择的输出字段（None 表示全部），只加载这些字段用到的关联数据。
+        """
+        from apps.actresses.models import Actress
+
+        def wants(name):
+            return fields is None or name in fields
+
+        if wants('rating'):
+            queryset = queryset.select_related('rating')
+        if wants('tags'):
+            queryset = queryset.prefetch_related('tags')
+        if wants('idol_list'):
+            queryset = queryset.prefetch_related('idol_credits')
+        if wants('genre_list'):
+            queryset = queryset.prefetch_related(
+                Prefetch('genre_links', queryset=MovieGenre.objects.select_related('genre'))
+            )
+        if wants('actresses'):
+            queryset = queryset.prefetch_related(
+                Prefetch('actresses', queryset=Actress.objects.only(*ACTRESS_SUMMARY_FIELDS))
+            )
+        return queryset
 
     def get_actresses(self, obj):
         """获取演员信息"""
@@ -93,7 +138,7 @@ class MovieSerializer(serializers.ModelSerializer):
         return []
 
 
-class MovieDetailSerializer(serializers.ModelSerializer):
+class MovieDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """影片详情序列化器"""
 
     tags = MovieTagSerializer(many=True, read_only=True)
@@ -117,11 +162,18 @@ class MovieDetailSerializer(serializers.ModelSerializer):
             'actresses', 'sample_images_list', 'sample_images_local_list', 'movie_tags_list',
             'created_at', 'updated_at'
         ]
-    
+        field_presets = {'card': MOVIE_CARD_FIELDS}
+        field_sources = MOVIE_FIELD_SOURCES
+
     def get_magnets(self, obj):
         """获取磁力链接信息"""
         from apps.magnets.serializers import MagnetLinkSerializer
-        magnets = obj.magnets.filter(is_active=True).order_by('-seeders', '-created_at')[:10]
+        magnets = (
+            obj.magnets.filter(is_active=True)
+            .select_related('movie')
+            .prefetch_related('categories')
+            .order_by('-seeders', '-created_at')[:10]
+        )
         return MagnetLinkSerializer(magnets, many=True).data
 
     def get_actresses(self, obj):
@@ -164,6 +216,8 @@ class MovieStatsSerializer(serializers.Serializer):
     recent_movies = serializers.IntegerField()
     top_genres = serializers.ListField()
     top_idols = serializers.ListField()
+    updated_at = serializers.DateTimeField()
+    rebuilt_at = serializers.DateTimeField(allow_null=True)
 
 
 class MovieCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,47 @@
+"""
+Signal handlers for movies app.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CatalogStats, Movie, MovieActress
+
+
+@receiver(post_save, sender=Movie)
+def movie_saved(sender, instance, created, raw=False, **kwargs):
+    """新增影片时增量更新统计"""
+    if raw or not created:
+        return
+    CatalogStats.record_delta(movies=1)
+
+
+@receiver(post_delete, sender=Movie)
+def movie_deleted(sender, instance, **kwargs):
+    """删除影片时增量更新统计"""
+    CatalogStats.record_delta(movies=-1)
+
+
+@receiver(post_save, sender=Movie)
+def movie_release_date_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """发行日期变化时同步女友关联行上的冗余日期"""
+    if raw or created:
+        return
+    if update_fields is not None and 'release_date' not in update_fields:
+        return
+    MovieActress.objects.filter(movie_id=instance.pk).exclude(
+        release_date=instance.release_date
+    ).update(release_date=instance.release_date)
+
+
+@receiver(m2m_changed, sender=MovieActress)
+def movie_actresses_added(sender, instance, action, reverse, pk_set, **kwargs):
+    """新增的女友关联行写入影片的发行日期"""
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        MovieActress.sync_release_dates(actress_id=instance.pk, movie_id__in=pk_set)
+    else:
+        MovieActress.objects.filter(movie_id=instance.pk, actress_id__in=pk_set).update(
+            release_date=instance.release_date
+        )
@@ -0,0 +1,41 @@
+from celery import shared_task
+
+from .models import CatalogStats, Movie
+from .sampling import refresh_id_pool
+from .trending import rebuild_trending as merge_trending_buckets
+
+
+@shared_task
+def rebuild_catalog_stats():
+    """
+    全量重建影片库统计
+    """
+    stats = CatalogStats.rebuild()
+    return {
+        'status': 'success',
+        'total_movies': stats.total_movies,
+        'total_magnets': stats.total_magnets,
+        'rebuilt_at': stats.rebuilt_at.isoformat(),
+    }
+
+
+@shared_task
+def refresh_movie_id_pool():
+    """
+    重建随机抽样使用的 Redis 主键池
+    """
+    total = refresh_id_pool(Movie)
+    if total is None:
+        return {'status': 'skipped', 'message': 'Redis unavailable'}
+    return {'status': 'success', 'total': total}
+
+
+@shared_task
+def rebuild_trending():
+    """
+    按时间衰减合并热度分桶
+    """
+    total = merge_trending_buckets()
+    if total is None:
+        return {'status': 'skipped', 'message': 'Redis unavailable'}
+    return {'status': 'success', 'total': total}
@@ -0,0 +1,45 @@
+"""
+保存影片时只在类型/演员文本变化时同步关联表，延迟加载的列不会被重新读取或同步。
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.movies.models import Movie, MovieGenre
+
+
+class MovieDimensionSyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.movie = Movie.objects.create(
+            censored_id='ABC-001', movie_title='标题', genre='剧情, 巨乳', jav_idols='演员'
+        )
+
+    def save_sql(self, movie, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            movie.save(**kwargs)
+        return [query['sql'] for query in queries]
+
+    def test_deferred_fields_are_not_refreshed_or_resynced(self):
+        movie = Movie.objects.defer('genre', 'jav_idols').get(pk=self.movie.pk)
+        movie.view_count += 1
+        sql = self.save_sql(movie)
+
+        self.assertFalse(any('movie_genres' in statement for statement in sql))
+        self.assertFalse(any('"genre"' in statement for statement in sql))
+        self.assertEqual(movie.get_deferred_fields(), {'genre', 'jav_idols'})
+
+    def test_assigned_deferred_field_is_synced(self):
+        movie = Movie.objects.defer('genre').get(pk=self.movie.pk)
+        movie.genre = '剧情'
+        movie.save()
+
+        self.assertEqual(MovieGenre.objects.filter(movie=movie).count(), 1)
+
+    def test_unchanged_loaded_fields_are_not_resynced(self):
+        movie = Movie.objects.get(pk=self.movie.pk)
+        sql = self.save_sql(movie, update_fields=['genre', 'view_count'])
+
+        self.assertFalse(any('movie_genres' in statement for statement in sql))
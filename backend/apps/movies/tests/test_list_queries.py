@@ -0,0 +1,67 @@
+"""
+影片列表的查询数量不随每页条数增长（关联数据批量预加载，没有 N+1 查询）。
+"""
+
+import datetime
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.actresses.models import Actress
+from apps.magnets.models import MagnetLink
+from apps.movies.models import Movie, MovieTag
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, ALLOWED_HOSTS=['*'])
+class MovieListQueryCountTests(TestCase):
+    """每页 3 条和 40 条的列表请求执行相同数量的查询"""
+
+    @classmethod
+    def setUpTestData(cls):
+        actresses = [Actress.objects.create(name=f'演员{i}') for i in range(5)]
+        tags = [MovieTag.objects.create(name=f'tag{i}', slug=f'tag{i}') for i in range(3)]
+        for i in range(45):
+            movie = Movie.objects.create(
+                censored_id=f'ABC-{i:03d}',
+                movie_title=f'标题 {i}',
+                studio=f'S{i % 4}',
+                genre='剧情, 巨乳',
+                jav_idols=f'演员{i % 5}, 演员{(i + 1) % 5}',
+                release_date=datetime.date(2020, 1 + i % 12, 1),
+            )
+            movie.actresses.add(actresses[i % 5], actresses[(i + 1) % 5])
+            tags[i % 3].movies.add(movie)
+            for j in range(i % 3):
+                MagnetLink.objects.create(
+                    movie=movie,
+                    magnet_name=f'{movie.censored_id} 1080p',
+                    magnet_link='magnet:?xt=urn:btih:' + 'a' * 40,
+                    seeders=j,
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def assert_flat(self, url):
+        small, small_data = self.count_queries(f'{url}page_size=3')
+        large, large_data = self.count_queries(f'{url}page_size=40')
+        self.assertEqual(len(small_data['results']), 3)
+        self.assertEqual(len(large_data['results']), 40)
+        self.assertEqual(small, large)
+
+    def test_page_number_list(self):
+        self.assert_flat('/api/movies/?')
+
+    def test_cursor_list(self):
+        self.assert_flat('/api/movies/?pagination=cursor&')
+
+    def test_ordered_list(self):
+        self.assert_flat('/api/movies/?ordering=-release_date&')
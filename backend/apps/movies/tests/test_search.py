@@ -0,0 +1,53 @@
+"""
+全文搜索后端的匹配语义与 icontains 一致：查询作为子串（短语）匹配，不按分词取并集。
+"""
+
+from django.test import TestCase
+
+from apps.movies.models import Movie
+from apps.movies.search import (
+    IContainsSearchBackend, MySQLFulltextSearchBackend, get_search_backend,
+)
+
+
+class SearchMatchSemanticsTests(TestCase):
+    """当前数据库的搜索后端与 icontains 后端返回相同的影片集合"""
+
+    QUERIES = ['ABC-123', 'abc-123', 'ABC', 'C-12', '123', '相沢みなみ', '巨乳', 'XYZ-999']
+
+    @classmethod
+    def setUpTestData(cls):
+        rows = [
+            ('ABC-123', '相沢みなみ 初主演', '相沢みなみ', '剧情, 巨乳'),
+            ('ABC-124', '新人デビュー', '演员A', '剧情'),
+            ('ABD-312', 'タイトル 123', '演员B', '巨乳'),
+            ('XBC-231', 'タイトル', '演员C', '剧情'),
+            ('CAB-012', 'ABCD コレクション', '相沢みなと', '剧情'),
+        ]
+        for censored_id, title, idols, genre in rows:
+            Movie.objects.create(
+                censored_id=censored_id, movie_title=title, jav_idols=idols,
+                genre=genre, studio='S1', director='D1',
+            )
+
+    def ids(self, backend, query):
+        return set(
+            backend.search(Movie.objects.all(), query).values_list('censored_id', flat=True)
+        )
+
+    def test_matches_icontains(self):
+        backend = get_search_backend()
+        reference = IContainsSearchBackend()
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(self.ids(backend, query), self.ids(reference, query))
+
+    def test_no_partial_token_matches(self):
+        # 只共享部分 ngram（'AB'、'12'）的影片不应匹配
+        self.assertEqual(self.ids(get_search_backend(), 'ABC-123'), {'ABC-123'})
+
+    def test_mysql_uses_boolean_phrase_query(self):
+        backend = MySQLFulltextSearchBackend()
+        self.assertIn('IN BOOLEAN MODE', backend.match_sql())
+        self.assertEqual(backend.boolean_query('ABC-123'), '"ABC-123"')
+        self.assertEqual(backend.boolean_query('a "b" c'), '"a  b  c"')
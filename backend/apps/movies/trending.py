@@ -0,0 +1,149 @@
+"""
+Trending movies backed by Redis sorted sets.
+
+浏览、下载事件按小时写入分桶的有序集合，定期用 ZUNIONSTORE 按指数衰减
+权重合并为一个有序集合，读取热门榜只需一次 ZREVRANGE。
+Redis 不可用时退回到数据库按累计浏览量排序。
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+from apps.core.redis_client import get_redis_client, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY_PREFIX = 'movies:trending:bucket'
+MERGED_KEY = 'movies:trending:merged'
+
+EVENT_VIEW = 'view'
+EVENT_DOWNLOAD = 'download'
+# 下载比浏览更能代表兴趣
+EVENT_WEIGHTS = {
+    EVENT_VIEW: 1.0,
+    EVENT_DOWNLOAD: 5.0,
+}
+
+BUCKET_SECONDS = 3600
+
+
+def get_half_life_hours():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24)
+
+
+def get_window_hours():
+    return getattr(settings, 'TRENDING_WINDOW_HOURS', 24 * 7)
+
+
+def current_bucket(now=None):
+    """当前小时桶编号（Unix 时间的小时数）"""
+    return int((now if now is not None else time.time()) // BUCKET_SECONDS)
+
+
+def bucket_key(bucket):
+    return f'{BUCKET_KEY_PREFIX}:{bucket}'
+
+
+def record_event(movie_id, event=EVENT_VIEW):
+    """记录一次事件，Redis 不可用时静默忽略"""
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    key = bucket_key(current_bucket())
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.zincrby(key, EVENT_WEIGHTS[event], movie_id)
+        # 超出统计窗口的桶自动过期
+        pipe.expire(key, (get_window_hours() + 1) * BUCKET_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning('Failed to record trending event: %s', e)
+        mark_redis_failed()
+        return False
+    return True
+
+
+def rebuild_trending(now=None):
+    """
+    按衰减权重合并窗口内的小时桶。
+
+    桶的权重为 0.5 ** (桶龄 / 半衰期)，写入临时 key 后 RENAME，
+    返回合并后的影片数量；Redis 不可用时返回 None。
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    now = now if now is not None else time.time()
+    newest = current_bucket(now)
+    half_life = float(get_half_life_hours())
+
+    try:
+        keys = [bucket_key(bucket) for bucket in range(newest - get_window_hours(), newest + 1)]
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        existing = [key for key, found in zip(keys, pipe.execute()) if found]
+
+        if not existing:
+            client.delete(MERGED_KEY)
+            return 0
+
+        weights = {}
+        for key in existing:
+            bucket = int(key.rsplit(':', 1)[1])
+            # 以桶的中点计算桶龄
+            age_hours = (now - (bucket + 0.5) * BUCKET_SECONDS) / BUCKET_SECONDS
+            weights[key] = 0.5 ** (max(age_hours, 0.0) / half_life)
+
+        tmp_key = f'{MERGED_KEY}:building'
+        total = client.zunionstore(tmp_key, weights)
+        client.rename(tmp_key, MERGED_KEY)
+        return total
+    except Exception as e:
+        logger.warning('Failed to rebuild trending set: %s', e)
+        mark_redis_failed()
+        return None
+
+
+def get_trending_ids(limit):
+    """
+    获取热门影片主键（按热度降序）。
+
+    合并结果不存在时现场合并一次；Redis 不可用时返回 None。
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        if not client.exists(MERGED_KEY) and rebuild_trending() is None:
+            return None
+        return [int(pk) for pk in client.zrevrange(MERGED_KEY, 0, limit - 1)]
+    except Exception as e:
+        logger.warning('Failed to read trending set: %s', e)
+        mark_redis_failed()
+        return None
+
+
+def get_trending_movies(queryset, limit=20):
+    """
+    获取热门影片列表。
+
+    Redis 不可用时退回到按累计浏览量排序（有索引），热度榜不足时用它补齐。
+    """
+    movies = []
+    # 多取一些，跳过已删除或被过滤掉的影片
+    ids = get_trending_ids(limit * 2)
+    if ids:
+        objects = queryset.filter(pk__in=ids).order_by().in_bulk()
+        movies = [objects[pk] for pk in ids if pk in objects][:limit]
+    if len(movies) < limit:
+        movies.extend(
+            queryset.exclude(pk__in=[movie.pk for movie in movies])
+            .order_by('-view_count', '-id')[:limit - len(movies)]
+        )
+    return movies
@@ -7,54 +7,141 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Avg
-from django.utils import timezone
-from datetime import timedelta
+from django.db.models import Q, Count, Avg, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 
-from .models import Movie, MovieTag, MovieRating
+from apps.core.bulk import BulkLookupMixin
+from apps.core.conditional import ConditionalResponseMixin
+from apps.core.fast_render import FastListMixin
+from apps.core.fieldsets import defer_unused_columns, get_requested_fields
+from apps.core.response_cache import CachedResponseMixin
+
+from .models import Movie, MovieTag, MovieRating, CatalogStats
 from .serializers import (
     MovieSerializer, MovieDetailSerializer, MovieTagSerializer,
     MovieRatingSerializer
 )
-from .filters import MovieFilter
-from .pagination import MoviePagination
-
-
-class MovieViewSet(viewsets.ReadOnlyModelViewSet):
+from .export import EXPORT_FORMATS, stream_export
+from .facets import get_facets
+from .fast_render import MovieRowBuilder
+from .filters import MovieFilter, MovieOrderingFilter
+from .pagination import MoviePagination, MovieCursorPagination
+from .sampling import RandomSampler
+from .trending import get_trending_movies
+
+
+class MovieViewSet(
+    ConditionalResponseMixin, CachedResponseMixin, FastListMixin, BulkLookupMixin,
+    viewsets.ReadOnlyModelViewSet
+):
     """影片视图集"""
 
-    queryset = Movie.objects.select_related('rating').prefetch_related('tags', 'magnets')
+    cache_dependencies = (
+        'movies.Movie', 'movies.MovieTag', 'movies.MovieRating',
+        'actresses.Actress', 'magnets.MagnetLink',
+    )
+    fast_row_builder_class = MovieRowBuilder
+    bulk_lookup_fields = {'ids': 'id', 'censored_ids': 'censored_id'}
+    bulk_key_normalizers = {'censored_id': lambda value: str(value).strip().upper()}
+    bulk_includes = ('magnets', 'actresses')
+
+    queryset = Movie.objects.all()
     serializer_class = MovieSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = MoviePagination
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # search 参数由 MovieFilter 交给全文检索后端处理
+    filter_backends = [DjangoFilterBackend, MovieOrderingFilter]
     filterset_class = MovieFilter
-    search_fields = ['censored_id', 'movie_title', 'jav_idols', 'director', 'studio']
     ordering_fields = ['created_at', 'release_date', 'view_count', 'download_count']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        """获取查询集，只加载所选输出字段用到的列和关联数据"""
+        serializer_class = self.get_serializer_class()
+        fields = get_requested_fields(serializer_class, self.request.query_params)
+        queryset = MovieSerializer.setup_eager_loading(super().get_queryset(), fields=fields)
+        return defer_unused_columns(queryset, serializer_class, fields)
+
     def get_serializer_class(self):
         """根据动作选择序列化器"""
         if self.action == 'retrieve':
             return MovieDetailSerializer
         return MovieSerializer
 
+    @property
+    def paginator(self):
+        """根据 pagination 参数选择分页方式，pagination=cursor 时使用游标分页"""
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = MovieCursorPagination()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def retrieve(self, request, *args, **kwargs):
         """获取单个影片详情"""
-        instance = self.get_object()
-
-        # 增加浏览次数
-        instance.increment_view_count()
-
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        response = super().retrieve(request, *args, **kwargs)
+
+        # 增加浏览次数（命中缓存或返回 304 时同样计数）
+        if response.status_code in (200, 304):
+            Movie.record_view(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        return response
+
+    def get_bulk_fields(self, includes):
+        """批量查询的输出字段：演员只在 include=actresses 时输出"""
+        fields = get_requested_fields(MovieSerializer, self.request.query_params)
+        if fields is None:
+            fields = set(MovieSerializer.Meta.fields)
+        if 'actresses' not in includes:
+            fields.discard('actresses')
+        return fields
+
+    def get_bulk_queryset(self, includes):
+        """批量查询只预加载所选字段和 include 用到的关联数据"""
+        fields = self.get_bulk_fields(includes)
+        queryset = MovieSerializer.setup_eager_loading(Movie.objects.all(), fields=fields)
+        queryset = defer_unused_columns(queryset, MovieSerializer, fields)
+        if 'magnets' in includes:
+            from apps.magnets.models import MagnetLink
+            queryset = queryset.prefetch_related(Prefetch(
+                'magnets',
+                queryset=(
+                    MagnetLink.objects.filter(is_active=True)
+                    .select_related('movie')
+                    .prefetch_related('categories')
+                    .order_by('-seeders', '-created_at')
+                ),
+                to_attr='active_magnets'
+            ))
+        return queryset
+
+    def get_bulk_data(self, objects, includes):
+        serializer = MovieSerializer(objects, many=True, context=self.get_serializer_context())
+        fields = self.get_bulk_fields(includes)
+        for name in set(serializer.child.fields) - fields:
+            serializer.child.fields.pop(name)
+        data = serializer.data
+
+        if 'magnets' in includes:
+            from apps.magnets.serializers import MagnetLinkSerializer
+            for movie, item in zip(objects, data):
+                item['magnets'] = MagnetLinkSerializer(movie.active_magnets, many=True).data
+        return data
 
     @action(detail=True, methods=['get'])
     def magnets(self, request, pk=None):
         """获取影片的磁力链接"""
         movie = self.get_object()
-        magnets = movie.magnets.filter(is_active=True).order_by('-seeders', '-created_at')
+        magnets = (
+            movie.magnets.filter(is_active=True)
+            .select_related('movie')
+            .prefetch_related('categories')
+            .order_by('-seeders', '-created_at')
+        )
 
         from apps.magnets.serializers import MagnetLinkSerializer
         serializer = MagnetLinkSerializer(magnets, many=True)
@@ -64,21 +151,20 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
     def rate(self, request, pk=None):
         """为影片评分"""
         movie = self.get_object()
-        rating_value = request.data.get('rating')
+        try:
+            rating_value = int(request.data.get('rating'))
+        except (TypeError, ValueError):
+            rating_value = 0
 
-        if not rating_value or not (1 <= int(rating_value) <= 5):
+        if not (1 <= rating_value <= 5):
             return Response(
                 {'error': '评分必须在1-5之间'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 获取或创建评分记录
-        rating, created = MovieRating.objects.get_or_create(movie=movie)
-
-        # 更新评分
-        rating_field = f"{['one', 'two', 'three', 'four', 'five'][int(rating_value) - 1]}_star"
-        setattr(rating, rating_field, getattr(rating, rating_field) + 1)
-        rating.calculate_average()
+        # 单条 UPDATE 原子累加，并发投票不会互相覆盖
+        MovieRating.add_votes(movie.pk, {rating_value: 1})
+        rating = MovieRating.objects.select_related('movie').get(movie_id=movie.pk)
 
         serializer = MovieRatingSerializer(rating)
         return Response(serializer.data)
@@ -86,13 +172,9 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def popular(self, request):
         """获取热门影片"""
-        # 最近30天浏览量最高的影片
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        queryset = self.get_queryset().filter(
-            created_at__gte=thirty_days_ago
-        ).order_by('-view_count')[:20]
-
-        serializer = self.get_serializer(queryset, many=True)
+        # 按近期浏览、下载热度（时间衰减）排序
+        movies = get_trending_movies(self.get_queryset(), limit=20)
+        serializer = self.get_serializer(movies, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -108,50 +190,71 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
         count = int(request.query_params.get('count', 10))
         count = min(count, 50)  # 限制最大数量
 
-        queryset = self.get_queryset().order_by('?')[:count]
-        serializer = self.get_serializer(queryset, many=True)
+        # 按随机主键抽样，避免 ORDER BY RAND() 对整表排序
+        queryset = self.filter_queryset(self.get_queryset())
+        movies = RandomSampler().sample(queryset, count)
+        serializer = self.get_serializer(movies, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
-    def stats(self, request):
-        """获取影片统计信息"""
-        queryset = self.get_queryset()
-
-        stats = {
-            'total_movies': queryset.count(),
-            'total_magnets': sum(movie.magnets.count() for movie in queryset),
-            'sources': list(queryset.values('source').annotate(count=Count('id'))),
-            'recent_movies': queryset.filter(
-                created_at__gte=timezone.now() - timedelta(days=7)
-            ).count(),
-            'top_genres': self._get_top_genres(queryset),
-            'top_idols': self._get_top_idols(queryset),
-        }
-
-        return Response(stats)
-
-    def _get_top_genres(self, queryset, limit=10):
-        """获取热门类型"""
-        genre_counts = {}
-        for movie in queryset:
-            for genre in movie.genre_list:
-                genre_counts[genre] = genre_counts.get(genre, 0) + 1
-
-        return sorted(genre_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-
-    def _get_top_idols(self, queryset, limit=10):
-        """获取热门演员"""
-        idol_counts = {}
-        for movie in queryset:
-            for idol in movie.idol_list:
-                idol_counts[idol] = idol_counts.get(idol, 0) + 1
+    def export(self, request):
+        """流式导出影片（含演员和有效磁力链接），output=ndjson|csv，支持列表的过滤参数"""
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f'output 只能是 {", ".join(EXPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        return sorted(idol_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+        filterset = MovieFilter(request.query_params, queryset=Movie.objects.all(), request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        formatter = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            stream_export(filterset.qs, export_format, compress=compress),
+            content_type=formatter.content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="movies.{formatter.extension}"'
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
 
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """按列表的过滤参数统计各分面的影片数量，超出时间预算时返回部分结果"""
+        filterset = MovieFilter(request.query_params, queryset=Movie.objects.all(), request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(get_facets(filterset, request.query_params))
 
-class MovieTagViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """获取影片统计信息"""
+        stats = CatalogStats.get_current()
+
+        return Response({
+            'total_movies': stats.total_movies,
+            'total_magnets': stats.total_magnets,
+            'sources': [
+                {'source': source, 'count': count}
+                for source, count in stats.sources.items()
+            ],
+            'recent_movies': stats.recent_movies,
+            'top_genres': stats.top_genres,
+            'top_idols': stats.top_idols,
+            'updated_at': stats.updated_at,
+            'rebuilt_at': stats.rebuilt_at,
+        })
+
+
+class MovieTagViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """影片标签视图集"""
 
+    cache_dependencies = ('movies.MovieTag', 'movies.Movie')
+
     queryset = MovieTag.objects.all()
     serializer_class = MovieTagSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -165,7 +268,7 @@ class MovieTagViewSet(viewsets.ReadOnlyModelViewSet):
     def movies(self, request, pk=None):
         """获取标签下的影片"""
         tag = self.get_object()
-        movies = tag.movies.all().order_by('-created_at')
+        movies = MovieSerializer.setup_eager_loading(tag.movies.all()).order_by('-created_at')
 
         # 分页
         page = self.paginate_queryset(movies)
@@ -177,9 +280,11 @@ class MovieTagViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class MovieRatingViewSet(viewsets.ReadOnlyModelViewSet):
+class MovieRatingViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """影片评分视图集"""
 
+    cache_dependencies = ('movies.MovieRating', 'movies.Movie')
+
     queryset = MovieRating.objects.select_related('movie')
     serializer_class = MovieRatingSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
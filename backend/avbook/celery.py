@@ -34,6 +34,36 @@ app.conf.beat_schedule = {
         'schedule': 60.0 * 60.0 * 24 * 7,  # Weekly
         'options': {'queue': 'crawler'}
     },
+    'rebuild-catalog-stats-hourly': {
+        'task': 'apps.movies.tasks.rebuild_catalog_stats',
+        'schedule': 60.0 * 60.0,  # Hourly
+        'options': {'queue': 'maintenance'}
+    },
+    'refresh-movie-id-pool': {
+        'task': 'apps.movies.tasks.refresh_movie_id_pool',
+        'schedule': 60.0 * 10,  # Every 10 minutes
+        'options': {'queue': 'maintenance'}
+    },
+    'rebuild-trending': {
+        'task': 'apps.movies.tasks.rebuild_trending',
+        'schedule': 60.0 * 5,  # Every 5 minutes
+        'options': {'queue': 'maintenance'}
+    },
+    'flush-counters': {
+        'task': 'apps.core.tasks.flush_counters',
+        'schedule': 30.0,  # Every 30 seconds
+        'options': {'queue': 'maintenance'}
+    },
+    'rebuild-suggest-snapshot-hourly': {
+        'task': 'apps.core.tasks.rebuild_suggest_snapshot',
+        'schedule': 60.0 * 60.0,  # Hourly
+        'options': {'queue': 'maintenance'}
+    },
+    'prune-change-log-daily': {
+        'task': 'apps.core.tasks.prune_change_log',
+        'schedule': 60.0 * 60.0 * 24,  # Daily
+        'options': {'queue': 'maintenance'}
+    },
     'cleanup-old-logs': {
         'task': 'apps.core.tasks.cleanup_old_logs',
         'schedule': 60.0 * 60.0 * 24 * 7,  # Weekly
@@ -44,6 +74,7 @@ app.conf.beat_schedule = {
 app.conf.task_routes = {
     'apps.crawler.tasks.*': {'queue': 'crawler'},
     'apps.core.tasks.*': {'queue': 'maintenance'},
+    'apps.movies.tasks.*': {'queue': 'maintenance'},
 }
 
 @app.task(bind=True)
@@ -113,6 +113,58 @@ CACHES = {
     }
 }
 
+# Response cache
+# DRF 视图集响应缓存：开关、过期时间（秒）、压缩阈值（字节，0 表示不压缩）
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+RESPONSE_CACHE_GZIP_MIN_BYTES = config('RESPONSE_CACHE_GZIP_MIN_BYTES', default=1024, cast=int)
+
+# Fast list rendering
+# 列表接口使用 values() 行构造器代替序列化器（输出一致）
+FAST_LIST_RENDERING = config('FAST_LIST_RENDERING', default=True, cast=bool)
+
+# Bulk lookup
+# POST /api/movies/bulk/ 等批量查询接口单次允许的最大键数量
+BULK_LOOKUP_MAX_KEYS = config('BULK_LOOKUP_MAX_KEYS', default=5000, cast=int)
+
+# Change feed
+# /api/changes/ 变更日志保留天数；主键空洞超过 GAP_TIMEOUT 秒仍未提交时视为回滚而跳过
+# （需大于最长的写事务耗时，更久才提交的事务的变更会被错过）
+CHANGE_FEED_RETENTION_DAYS = config('CHANGE_FEED_RETENTION_DAYS', default=30, cast=int)
+CHANGE_FEED_GAP_TIMEOUT = config('CHANGE_FEED_GAP_TIMEOUT', default=300, cast=int)
+
+# Movie facets
+# /api/movies/facets/ 单次请求的查询时间预算（毫秒，超时的分面不返回）和完整结果的缓存时间（秒）
+MOVIE_FACETS_TIME_BUDGET_MS = config('MOVIE_FACETS_TIME_BUDGET_MS', default=800, cast=int)
+MOVIE_FACETS_CACHE_TIMEOUT = config('MOVIE_FACETS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Actress name resolver
+# 进程内姓名解析器的重新加载间隔（秒）和模糊匹配允许的最大编辑距离（0 表示关闭模糊匹配）
+# 模糊匹配只用于人工核对的候选提示，写入关联时始终精确匹配
+ACTRESS_NAME_RESOLVER_TTL = config('ACTRESS_NAME_RESOLVER_TTL', default=300, cast=int)
+ACTRESS_NAME_MAX_DISTANCE = config('ACTRESS_NAME_MAX_DISTANCE', default=1, cast=int)
+
+# Search
+# 影片搜索后端导入路径，留空时按数据库自动选择（MySQL FULLTEXT / SQLite FTS5）
+MOVIE_SEARCH_BACKEND = config('MOVIE_SEARCH_BACKEND', default='')
+
+# Typeahead
+# 输入联想索引快照路径、增量刷新间隔和全量构建锁的过期时间（秒）
+SUGGEST_SNAPSHOT_PATH = config('SUGGEST_SNAPSHOT_PATH', default=str(BASE_DIR / 'var' / 'suggest_index.pickle'))
+SUGGEST_REFRESH_INTERVAL = config('SUGGEST_REFRESH_INTERVAL', default=60, cast=int)
+SUGGEST_BUILD_LOCK_TIMEOUT = config('SUGGEST_BUILD_LOCK_TIMEOUT', default=600, cast=int)
+
+# Counters
+# 进程内计数缓冲（Redis 不可用时）的写回间隔（秒）
+COUNTER_FLUSH_INTERVAL = config('COUNTER_FLUSH_INTERVAL', default=10, cast=int)
+# Redis 缓冲写回锁的过期时间（秒），需大于一次写回的耗时
+COUNTER_FLUSH_LOCK_TIMEOUT = config('COUNTER_FLUSH_LOCK_TIMEOUT', default=60, cast=int)
+
+# Trending
+# 热门榜的衰减半衰期与统计窗口（小时）
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=24, cast=int)
+TRENDING_WINDOW_HOURS = config('TRENDING_WINDOW_HOURS', default=168, cast=int)
+
 # Celery Configuration
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
@@ -162,6 +214,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_FILTER_BACKENDS': [
@@ -25,6 +25,8 @@ urlpatterns = [
     path('actresses/', include('apps.actresses.frontend_urls')),
 
     # API Routes
+    # 磁力链接路由注册在 api/ 根路径下，core 路由需排在其前面
+    path('api/', include('apps.core.api_urls')),
     path('api/', include('apps.movies.urls')),
     path('api/', include('apps.actresses.urls')),
     path('api/', include('apps.magnets.urls')),
@@ -608,15 +608,9 @@ class ActressCompleteDjangoPipeline:
         actress_name = adapter.get('related_actress')
 
         if actress_name:
-            try:
-                actress = Actress.objects.get(name=actress_name)
-
-                # 检查是否已经关联
-                if not movie.actresses.filter(id=actress.id).exists():
-                    movie.actresses.add(actress)
-                    spider.logger.info(f"Linked actress {actress_name} to movie {movie.censored_id}")
-
-            except Actress.DoesNotExist:
+            if movie.add_actress_by_name(actress_name):
+                spider.logger.info(f"Linked actress {actress_name} to movie {movie.censored_id}")
+            else:
                 spider.logger.warning(f"Actress {actress_name} not found for movie {movie.censored_id}")
 
     def parse_date(self, date_str):